@@ -0,0 +1 @@
+"""Offline micro-benchmarks for the core hot paths (run from the project root)."""
@@ -0,0 +1,54 @@
+"""Scaling of the sharded multi-process VLSM planner versus the serial one.
+
+Usage::
+
+    python -m benchmarks.bench_parallel_vlsm [--requests 300000] [--workers 1 2 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import os
+import random
+import time
+
+from core.parallel_plan import calculate_subnets_by_devices_parallel
+from core.subnet_calc import calculate_subnets_by_devices
+
+
+def _timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def run(num_requests, workers_list, network, seed):
+    base_network = ipaddress.IPv4Network(network)
+    rng = random.Random(seed)
+    devices = [rng.randint(1, 60) for _ in range(num_requests)]
+
+    serial, serial_s = _timed(calculate_subnets_by_devices, base_network, devices)
+    expected = [dict(result) for result in serial]
+    print(f"Red base {base_network}, {num_requests} requisitos, {os.cpu_count()} CPU")
+    print(f"{'procesos':<10}{'tiempo (s)':>12}{'vs serie':>10}{'identico':>10}")
+    print(f"{'serie':<10}{serial_s:>12.2f}{1:>10.2f}{'-':>10}")
+
+    for workers in workers_list:
+        results, elapsed = _timed(calculate_subnets_by_devices_parallel, base_network, devices, workers=workers)
+        identical = [dict(result) for result in results] == expected
+        print(f"{workers:<10}{elapsed:>12.2f}{serial_s / elapsed:>10.2f}{'si' if identical else 'NO':>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300_000, help="Numero de requisitos de dispositivos")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Procesos a medir")
+    parser.add_argument("--network", default="10.0.0.0/8", help="Red base")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de los requisitos aleatorios")
+    args = parser.parse_args(argv)
+    run(args.requests, args.workers, args.network, args.seed)
+
+
+if __name__ == "__main__":
+    main()
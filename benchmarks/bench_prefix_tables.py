@@ -0,0 +1,104 @@
+"""Per-call cost of the prefix lookup tables versus on-the-fly computation.
+
+Usage::
+
+    python -m benchmarks.bench_prefix_tables [--number 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import timeit
+
+from core import ip_tools, network_calc
+from core.prefix_tables import PREFIX_TABLE
+
+
+def _legacy_netmask_octets(prefix):
+    mask_int = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF if prefix > 0 else 0
+    return [(mask_int >> 24) & 0xFF, (mask_int >> 16) & 0xFF, (mask_int >> 8) & 0xFF, mask_int & 0xFF]
+
+
+def _legacy_usable_hosts(prefix):
+    if prefix >= 31:
+        return 0
+    return (2 ** (32 - prefix)) - 2
+
+
+def _legacy_align(address, prefix):
+    block_size = 2 ** (32 - prefix)
+    address_int = int(address)
+    remainder = address_int % block_size
+    if remainder == 0:
+        return address
+    return ipaddress.IPv4Address(address_int + (block_size - remainder))
+
+
+def _legacy_mask_binary(prefix):
+    mask_int = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    return ".".join(format((mask_int >> (24 - idx * 8)) & 0xFF, "08b") for idx in range(4))
+
+
+def _legacy_details(ip_input):
+    ip_part, cidr_part = ip_input.split("/", 1)
+    cidr = int(cidr_part)
+    ip_obj = ipaddress.IPv4Address(ip_part)
+    network = ipaddress.IPv4Network(ip_input, strict=False)
+    mask_octets = _legacy_netmask_octets(cidr)
+    mask_str = ".".join(str(octet) for octet in mask_octets)
+    mask_int = int(network.netmask)
+    network_int = int(ip_obj) & mask_int
+    broadcast_int = network_int | int(network.hostmask)
+    determining_octet = next((idx for idx in range(3, -1, -1) if mask_octets[idx] != 255), -1)
+    block_size = 256 - mask_octets[determining_octet] if determining_octet >= 0 else 256
+    mask_binary = _legacy_mask_binary(cidr)
+    wildcard = ".".join(str(255 - octet) for octet in mask_octets)
+    return (
+        mask_str,
+        mask_binary,
+        str(ipaddress.IPv4Address(network_int)),
+        str(ipaddress.IPv4Address(broadcast_int)),
+        wildcard,
+        block_size,
+        determining_octet,
+        _legacy_usable_hosts(cidr),
+        ip_tools.host_range(network),
+    )
+
+
+def _table_mask_binary(prefix):
+    return PREFIX_TABLE[prefix].mask_binary
+
+
+CASES = (
+    ("netmask_octets", _legacy_netmask_octets, ip_tools.netmask_octets, 26),
+    ("usable_hosts_for_prefix", _legacy_usable_hosts, ip_tools.usable_hosts_for_prefix, 26),
+    ("mask_binary", _legacy_mask_binary, _table_mask_binary, 26),
+    (
+        "align_address_to_prefix",
+        lambda prefix: _legacy_align(ipaddress.IPv4Address("10.0.0.77"), prefix),
+        lambda prefix: ip_tools.align_address_to_prefix(ipaddress.IPv4Address("10.0.0.77"), prefix),
+        26,
+    ),
+    ("calculate_network_details", _legacy_details, network_calc.calculate_network_details, "192.168.10.99/26"),
+)
+
+
+def run(number):
+    print(f"{'caso':<28}{'antes (ns)':>12}{'tablas (ns)':>13}{'ahorro':>9}")
+    for name, legacy, current, argument in CASES:
+        legacy_ns = min(timeit.repeat(lambda: legacy(argument), number=number, repeat=3)) / number * 1e9
+        table_ns = min(timeit.repeat(lambda: current(argument), number=number, repeat=3)) / number * 1e9
+        print(f"{name:<28}{legacy_ns:>12.0f}{table_ns:>13.0f}{1 - table_ns / legacy_ns:>9.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="Llamadas por medicion")
+    args = parser.parse_args(argv)
+    run(args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cold-start time of the app (source or frozen build) against a target.
+
+Each run launches the app with ``--measure-startup``, which exits as soon as
+the first tab is built, and times the whole process (spawn to exit)::
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --exe dist/ip-calculator/ip-calculator --target 1.0
+
+The first run is reported separately: it is the coldest (disk cache, and
+for ``--onefile`` builds the unpacking). Exits with status 1 when the
+median run exceeds ``--target`` seconds. Needs a display.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TARGET = 1.5
+
+
+def time_launch(command):
+    """Return ``(wall_seconds, in_app_seconds or None)`` for one launch."""
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+
+    in_app = None
+    for line in result.stdout.splitlines():
+        if line.startswith("Inicio:"):
+            in_app = float(line.split()[1])
+    return wall, in_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exe", help="Ejecutable congelado a medir (por defecto: python main.py)")
+    parser.add_argument("--runs", type=int, default=5, help="Numero de arranques")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET, help="Objetivo de arranque (s, mediana)")
+    args = parser.parse_args(argv)
+
+    command = [args.exe] if args.exe else [sys.executable, "main.py"]
+    command.append("--measure-startup")
+
+    try:
+        runs = [time_launch(command) for _ in range(args.runs)]
+    except subprocess.CalledProcessError as error:
+        details = error.stderr.strip().splitlines()
+        print(f"La aplicacion termino con error: {details[-1] if details else error}", file=sys.stderr)
+        return 2
+    walls = [wall for wall, _ in runs]
+    in_app = [seconds for _, seconds in runs if seconds is not None]
+
+    print(f"Comando: {' '.join(command)}")
+    print(f"Primera ejecucion: {walls[0]:.3f} s")
+    print(f"Mediana: {statistics.median(walls):.3f} s (min {min(walls):.3f} s, max {max(walls):.3f} s)")
+    if in_app:
+        print(f"Medido por la app (hasta la primera pestana): mediana {statistics.median(in_app):.3f} s")
+
+    if statistics.median(walls) > args.target:
+        print(f"Objetivo NO alcanzado ({args.target:.2f} s)", file=sys.stderr)
+        return 1
+    print(f"Objetivo alcanzado ({args.target:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
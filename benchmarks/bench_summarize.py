@@ -0,0 +1,57 @@
+"""Route summarization (``core.summarize``) versus ``ipaddress.collapse_addresses``.
+
+Usage::
+
+    python -m benchmarks.bench_summarize [--inputs 1000000] [--min-prefix 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import random
+import time
+
+from core.summarize import collapse_blocks, collapse_networks
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = list(func(*args))
+    return result, time.perf_counter() - started
+
+
+def run(num_inputs, min_prefix, seed):
+    rng = random.Random(seed)
+    networks = []
+    for _ in range(num_inputs):
+        prefix = rng.randint(min_prefix, 32)
+        host_bits = 32 - prefix
+        networks.append(ipaddress.IPv4Network(((rng.getrandbits(32) >> host_bits) << host_bits, prefix)))
+    blocks = [(int(network.network_address), network.prefixlen) for network in networks]
+
+    reference, reference_s = _timed(ipaddress.collapse_addresses, networks)
+    print(f"{num_inputs} redes de /{min_prefix} a /32 -> {len(reference)} bloques")
+    print(f"{'metodo':<30}{'tiempo (s)':>12}{'vs stdlib':>11}{'identico':>10}")
+    print(f"{'ipaddress.collapse_addresses':<30}{reference_s:>12.2f}{1:>11.2f}{'-':>10}")
+
+    collapsed, elapsed = _timed(collapse_networks, networks)
+    identical = collapsed == reference
+    print(f"{'collapse_networks':<30}{elapsed:>12.2f}{reference_s / elapsed:>11.2f}{'si' if identical else 'NO':>10}")
+
+    collapsed, elapsed = _timed(collapse_blocks, blocks)
+    identical = collapsed == [(int(network.network_address), network.prefixlen) for network in reference]
+    print(f"{'collapse_blocks (enteros)':<30}{elapsed:>12.2f}{reference_s / elapsed:>11.2f}{'si' if identical else 'NO':>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inputs", type=int, default=1_000_000, help="Numero de redes de entrada")
+    parser.add_argument("--min-prefix", type=int, default=16, help="Prefijo mas corto de las redes aleatorias")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de las redes aleatorias")
+    args = parser.parse_args(argv)
+    run(args.inputs, args.min_prefix, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Utilization report (``core.utilization``) on very large VLSM plans.
+
+Usage::
+
+    python -m benchmarks.bench_utilization [--subnets 1000000] [--max-devices 12]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import random
+import time
+
+from core.subnet_calc import calculate_subnets_by_devices
+from core.utilization import analyze_utilization
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def run(num_subnets, max_devices, seed):
+    rng = random.Random(seed)
+    base_network = ipaddress.IPv4Network("10.0.0.0/8")
+    devices = [rng.randint(1, max_devices) for _ in range(num_subnets)]
+    plan, plan_s = _timed(calculate_subnets_by_devices, base_network, devices)
+    print(f"{num_subnets} subredes de 1 a {max_devices} dispositivos en {base_network} ({plan_s:.2f} s)")
+
+    report, elapsed = _timed(analyze_utilization, base_network, plan)
+    networks = [result["subnet"] for result in plan if "error" not in result]
+    reference, reference_s = _timed(
+        lambda: sum(network.num_addresses for network in ipaddress.collapse_addresses(networks))
+    )
+    print(f"{'metodo':<34}{'tiempo (s)':>12}")
+    print(f"{'analyze_utilization':<34}{elapsed:>12.2f}")
+    print(f"{'collapse_addresses (solo ocupado)':<34}{reference_s:>12.2f}")
+    print(
+        f"ocupado {report['allocated_addresses']} ({report['utilization']:.1%}), "
+        f"libre {report['free_addresses']} en {report['free_blocks']} bloques, "
+        f"mayor {report['largest_free_block']}, fragmentacion {report['fragmentation']:.3f}, "
+        f"identico: {'si' if reference == report['allocated_addresses'] else 'NO'}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=1_000_000, help="Numero de subredes del plan")
+    parser.add_argument("--max-devices", type=int, default=12, help="Dispositivos maximos por subred")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de los tamanos aleatorios")
+    args = parser.parse_args(argv)
+    run(args.subnets, args.max_devices, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Benchmark suite for the core hot paths with regression tracking.
+
+Measures throughput (ops/sec) and peak traced memory of each case and
+compares them with a JSON baseline::
+
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.25
+
+With ``--baseline`` the exit status is 1 when any case is slower, or uses
+more peak memory, than the baseline by more than ``--threshold`` (a
+fraction). Everything runs offline with the standard library only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from core import cpt_advanced_generator, cpt_generator, export, network_calc, subnet_calc
+from core.conflicts import check_plan
+from core.plan_index import PlanIndex
+from core.utilization import analyze_utilization
+
+DEFAULT_MIN_TIME = 0.5
+
+
+def _consume(sequence):
+    for _ in sequence:
+        pass
+
+
+def _devices(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.randint(1, 250) for _ in range(count)]
+
+
+def _build_cases():
+    """Return ``{name: callable}``; inputs are prepared outside the timed call."""
+    small_network = ipaddress.IPv4Network("192.168.1.0/24")
+    large_network = ipaddress.IPv4Network("10.0.0.0/8")
+    cpt_network = ipaddress.IPv4Network("172.16.0.0/16")
+    v6_network = ipaddress.IPv6Network("2001:db8::/32")
+    devices_10 = _devices(10)
+    devices_1k = _devices(1_000)
+    devices_100k = _devices(100_000)
+    cpt_devices = _devices(20)
+    plan_1k = subnet_calc.calculate_subnets_by_devices(large_network, devices_1k)
+    plan_index = PlanIndex.from_plan(plan_1k)
+    rng = random.Random(11)
+    lookup_addresses = [rng.randrange(1 << 24) + int(large_network.network_address) for _ in range(10_000)]
+    inventory_10k = [
+        ipaddress.IPv4Network((int(large_network.network_address) + (rng.randrange(1 << 16) << 8), 24))
+        for _ in range(10_000)
+    ]
+    advanced_configs = [{"routers": 2, "switches": 2, "hosts": hosts} for hosts in _devices(12)]
+
+    return {
+        "network_details": lambda: network_calc.calculate_network_details("192.168.10.99/26"),
+        "subnets_small": lambda: _consume(subnet_calc.calculate_subnets(small_network, 8)[0]["subnets"]),
+        "subnets_slash8": lambda: _consume(subnet_calc.calculate_subnets(large_network, 65_536)[0]["subnets"]),
+        "devices_10": lambda: subnet_calc.calculate_subnets_by_devices(large_network, devices_10),
+        "devices_1k": lambda: subnet_calc.calculate_subnets_by_devices(large_network, devices_1k),
+        "devices_100k": lambda: subnet_calc.calculate_subnets_by_devices(large_network, devices_100k),
+        "devices_v6_1k": lambda: subnet_calc.calculate_subnets_by_devices(v6_network, devices_1k),
+        "devices_1k_excl10k": lambda: subnet_calc.calculate_subnets_by_devices(
+            large_network, devices_1k, excluded=inventory_10k
+        ),
+        "plan_index_10k": lambda: plan_index.find_many(lookup_addresses, use_numpy=False),
+        "conflicts_10k": lambda: check_plan(plan_1k, inventory_10k, large_network),
+        "utilization_1k": lambda: analyze_utilization(large_network, plan_1k),
+        "export_vlsm_1k": lambda: _consume(export.iter_rows(export.vlsm_rows(plan_1k), export.VLSM_FIELDS, "json")),
+        "cpt_topology": lambda: cpt_generator.generate_cpt_topology(cpt_network, 20, 4, 4, cpt_devices),
+        "cpt_advanced": lambda: cpt_advanced_generator.generate_advanced_cpt(cpt_network, advanced_configs, "ospf"),
+    }
+
+
+CASE_NAMES = (
+    "network_details",
+    "subnets_small",
+    "subnets_slash8",
+    "devices_10",
+    "devices_1k",
+    "devices_100k",
+    "devices_v6_1k",
+    "devices_1k_excl10k",
+    "plan_index_10k",
+    "conflicts_10k",
+    "utilization_1k",
+    "export_vlsm_1k",
+    "cpt_topology",
+    "cpt_advanced",
+)
+
+
+def measure(func, min_time=DEFAULT_MIN_TIME):
+    """Return ``{"ops_per_sec", "peak_bytes"}`` for ``func``.
+
+    Throughput is the best of several timed batches totalling at least
+    ``min_time`` seconds; peak memory comes from one separate traced call.
+    """
+    batch_time = min_time / 5
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= batch_time:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(4):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ops_per_sec": number / best, "peak_bytes": peak}
+
+
+def run_suite(names=None, min_time=DEFAULT_MIN_TIME, log=None):
+    """Measure the selected cases (all by default) and return a results document."""
+    cases = _build_cases()
+    selected = names or list(cases)
+    unknown = sorted(set(selected) - set(cases))
+    if unknown:
+        raise ValueError(f"Casos desconocidos: {', '.join(unknown)}")
+
+    results = {}
+    for name in selected:
+        results[name] = measure(cases[name], min_time)
+        if log is not None:
+            log(f"{name:<18}{results[name]['ops_per_sec']:>14,.1f}{results[name]['peak_bytes'] / 1024:>14,.1f}")
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return a list of regression messages of ``current`` against ``baseline``.
+
+    A case regresses when its throughput falls below ``1 - threshold`` of
+    the baseline, or its peak memory exceeds ``1 + threshold`` of it. Cases
+    missing from either document are ignored.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+
+        if result["ops_per_sec"] < reference["ops_per_sec"] * (1 - threshold):
+            change = result["ops_per_sec"] / reference["ops_per_sec"] - 1
+            regressions.append(
+                f"{name}: ops/s {change:+.0%} ({reference['ops_per_sec']:,.1f} -> {result['ops_per_sec']:,.1f})"
+            )
+        if result["peak_bytes"] > reference["peak_bytes"] * (1 + threshold):
+            change = result["peak_bytes"] / max(reference["peak_bytes"], 1) - 1
+            regressions.append(
+                f"{name}: memoria pico {change:+.0%} ({reference['peak_bytes']} -> {result['peak_bytes']} B)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "cases", nargs="*", metavar="caso", help=f"Casos a ejecutar (por defecto todos): {', '.join(CASE_NAMES)}"
+    )
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Segundos minimos de medicion por caso")
+    parser.add_argument("--baseline", help="JSON de referencia con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Regresion tolerada (fraccion, 0.25 = 25%%)")
+    parser.add_argument("--save-baseline", metavar="RUTA", help="Guardar los resultados como nueva referencia")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.cases) - set(CASE_NAMES))
+    if unknown:
+        parser.error(f"casos desconocidos: {', '.join(unknown)}")
+
+    print(f"{'caso':<18}{'ops/s':>14}{'pico (KiB)':>14}")
+    current = run_suite(args.cases or None, args.min_time, log=print)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"Referencia guardada en {args.save_baseline}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print("REGRESIONES:", file=sys.stderr)
+        for message in regressions:
+            print(f"  {message}", file=sys.stderr)
+        return 1
+
+    print(f"Sin regresiones (umbral {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
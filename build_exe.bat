@@ -2,15 +2,41 @@
 setlocal
 cd /d "%~dp0"
 
-python -m PyInstaller --noconfirm --clean --windowed --onefile --name ip-calculator main.py
+rem Modos:
+rem   onedir  (por defecto) carpeta dist\ip-calculator\, arranca sin descomprimir nada.
+rem   lite    onedir + bytecode optimizado (-OO) y biblioteca estandar recortada.
+rem   onefile un solo .exe; se descomprime en una carpeta temporal en cada arranque.
+set "MODE=%~1"
+if "%MODE%"=="" set "MODE=onedir"
+
+rem Las pestanas se importan bajo demanda: se incluyen explicitamente con --collect-submodules.
+set "COMMON=--noconfirm --clean --windowed --name ip-calculator --collect-submodules gui --exclude-module tests --exclude-module benchmarks"
+set "TRIM=--optimize 2 --exclude-module numpy --exclude-module unittest --exclude-module doctest --exclude-module pydoc --exclude-module pdb --exclude-module email --exclude-module http --exclude-module xml --exclude-module xmlrpc --exclude-module sqlite3 --exclude-module asyncio"
+
+if /i "%MODE%"=="onedir" (
+  set "OPTIONS=%COMMON% --onedir"
+  set "RESULT=dist\ip-calculator\ip-calculator.exe"
+) else if /i "%MODE%"=="lite" (
+  set "OPTIONS=%COMMON% --onedir %TRIM%"
+  set "RESULT=dist\ip-calculator\ip-calculator.exe"
+) else if /i "%MODE%"=="onefile" (
+  set "OPTIONS=%COMMON% --onefile"
+  set "RESULT=dist\ip-calculator.exe"
+) else (
+  echo Modo desconocido: %MODE%. Usa onedir, lite u onefile.
+  exit /b 1
+)
+
+python -m PyInstaller %OPTIONS% main.py
 if errorlevel 1 (
   echo.
   echo No se pudo generar el ejecutable.
-  echo Instala PyInstaller con: python -m pip install pyinstaller
+  echo Instala PyInstaller con: python -m pip install -r requirements-dev.txt
   pause
   exit /b 1
 )
 
 echo.
-echo Ejecutable generado en: dist\ip-calculator.exe
+echo Ejecutable generado en: %RESULT%
+echo Tiempo de arranque: python -m benchmarks.bench_startup --exe %RESULT%
 pause
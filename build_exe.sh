@@ -0,0 +1,25 @@
+#!/usr/bin/env sh
+# Linux build of the frozen app, mainly to benchmark startup locally.
+#   ./build_exe.sh [onedir|lite|onefile]   (same modes as build_exe.bat)
+set -eu
+cd "$(dirname "$0")"
+
+MODE="${1:-onedir}"
+
+# Tabs are imported on demand, so they are collected explicitly.
+COMMON="--noconfirm --clean --windowed --name ip-calculator --collect-submodules gui --exclude-module tests --exclude-module benchmarks"
+TRIM="--optimize 2 --exclude-module numpy --exclude-module unittest --exclude-module doctest --exclude-module pydoc --exclude-module pdb --exclude-module email --exclude-module http --exclude-module xml --exclude-module xmlrpc --exclude-module sqlite3 --exclude-module asyncio"
+
+case "$MODE" in
+  onedir)  OPTIONS="$COMMON --onedir";       RESULT="dist/ip-calculator/ip-calculator" ;;
+  lite)    OPTIONS="$COMMON --onedir $TRIM"; RESULT="dist/ip-calculator/ip-calculator" ;;
+  onefile) OPTIONS="$COMMON --onefile";      RESULT="dist/ip-calculator" ;;
+  *) echo "Modo desconocido: $MODE. Usa onedir, lite u onefile." >&2; exit 1 ;;
+esac
+
+# shellcheck disable=SC2086
+python3 -m PyInstaller $OPTIONS main.py
+
+echo
+echo "Ejecutable generado en: $RESULT"
+echo "Tiempo de arranque: python3 -m benchmarks.bench_startup --exe $RESULT"
@@ -1,6 +1,12 @@
-"""Core package exports."""
+"""Core package exports.
 
-from . import cpt_advanced_generator, cpt_generator, network_calc, subnet_calc
+Submodules are imported on first access (``core.subnet_calc``...) so that
+importing one of them does not pull in the others.
+"""
+
+from __future__ import annotations
+
+import importlib
 
 __all__ = [
     "network_calc",
@@ -8,3 +14,9 @@ __all__ = [
     "cpt_generator",
     "cpt_advanced_generator",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,7 @@
+"""Allow ``python -m core`` to run the command-line mode."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,210 @@
+"""Buddy-system free-space tracker used by the VLSM allocators."""
+
+from __future__ import annotations
+
+import heapq
+import ipaddress
+
+from .ip_tools import network_bounds
+from .summarize import merge_ranges, range_to_blocks
+
+
+class BuddyAllocator:
+    """Track free aligned blocks of a base network with per-prefix free lists.
+
+    ``allocate`` takes the smallest free block that fits (best fit), lowest
+    address first, and splits it down to the requested prefix; ``free``
+    merges a block back with its buddy. Both are ``O(log n)`` per level, so
+    holes left behind by alignment or released subnets are reused instead of
+    only ever allocating forward. Requests sorted from largest to smallest
+    produce exactly the same layout as a forward-only cursor.
+
+    Excluded space (management ranges, blocks already in use...) is taken out
+    of the free lists with :meth:`exclude` / :meth:`reserve` before
+    allocating; allocations then simply never see it.
+    """
+
+    def __init__(self, base_int: int, base_prefix: int, max_prefixlen: int = 32):
+        self.base_int = base_int
+        self.base_prefix = base_prefix
+        self.max_prefixlen = max_prefixlen
+        self.free_addresses = 1 << (max_prefixlen - base_prefix)
+        self.reserved_addresses = 0
+        self._free = {prefix: set() for prefix in range(base_prefix, max_prefixlen + 1)}
+        self._heaps = {prefix: [] for prefix in range(base_prefix, max_prefixlen + 1)}
+        self._add_free(base_int, base_prefix)
+
+    @classmethod
+    def for_network(cls, network, excluded=None):
+        """Create an allocator whose whole ``network`` is free, minus ``excluded``."""
+        allocator = cls(int(network.network_address), network.prefixlen, network.max_prefixlen)
+        if excluded:
+            allocator.exclude(excluded)
+        return allocator
+
+    @property
+    def total_addresses(self) -> int:
+        return self._block_size(self.base_prefix)
+
+    def allocate(self, prefix: int):
+        """Allocate a ``/prefix`` block and return its network int, or ``None``."""
+        if not self.base_prefix <= prefix <= self.max_prefixlen:
+            return None
+
+        for candidate in range(prefix, self.base_prefix - 1, -1):
+            start = self._pop_lowest(candidate)
+            if start is not None:
+                break
+        else:
+            return None
+
+        while candidate < prefix:
+            candidate += 1
+            self._add_free(start + self._block_size(candidate), candidate)
+
+        self.free_addresses -= self._block_size(prefix)
+        return start
+
+    def free(self, start: int, prefix: int):
+        """Return a previously allocated block, merging it with free buddies."""
+        self.free_addresses += self._block_size(prefix)
+        while prefix > self.base_prefix:
+            buddy = ((start - self.base_int) ^ self._block_size(prefix)) + self.base_int
+            free_blocks = self._free[prefix]
+            if buddy not in free_blocks:
+                break
+            free_blocks.discard(buddy)
+            start = min(start, buddy)
+            prefix -= 1
+        self._add_free(start, prefix)
+
+    def reserve(self, start: int, prefix: int) -> int:
+        """Take the aligned ``/prefix`` block at ``start`` out of the free space.
+
+        Returns how many of its addresses were free and are now reserved;
+        parts already allocated or reserved are left alone. A block inside
+        one free block costs one lookup per level; only blocks overlapping
+        allocated space need to scan the smaller free lists.
+        """
+        if not self.base_prefix <= prefix <= self.max_prefixlen:
+            return 0
+        if not 0 <= start - self.base_int < self.total_addresses:
+            return 0
+
+        for candidate in range(prefix, self.base_prefix - 1, -1):
+            block_start = self._align(start, candidate)
+            if block_start in self._free[candidate]:
+                break
+        else:
+            return self._reserve_fragments(start, prefix)
+
+        self._free[candidate].discard(block_start)
+        while candidate < prefix:
+            candidate += 1
+            half = self._block_size(candidate)
+            if start >= block_start + half:
+                self._add_free(block_start, candidate)
+                block_start += half
+            else:
+                self._add_free(block_start + half, candidate)
+
+        reserved = self._block_size(prefix)
+        self.free_addresses -= reserved
+        self.reserved_addresses += reserved
+        return reserved
+
+    def reserve_range(self, first: int, last: int) -> int:
+        """Reserve every free address of ``first..last`` (clipped to the base network)."""
+        first = max(first, self.base_int)
+        last = min(last, self.base_int + self.total_addresses - 1)
+        return sum(self.reserve(start, prefix) for start, prefix in range_to_blocks(first, last, self.max_prefixlen))
+
+    def exclude(self, networks) -> int:
+        """Reserve every network of ``networks`` (strings, ``ipaddress`` networks or records).
+
+        Overlapping and adjacent exclusions are merged first, so each merged
+        range is split into the fewest aligned blocks. Networks of the other
+        IP version or outside the base network are ignored. Returns the
+        number of addresses reserved.
+        """
+        ranges = []
+        for network in networks:
+            start, prefix, max_prefixlen = network_bounds(network)
+            if max_prefixlen == self.max_prefixlen:
+                ranges.append((start, start + (1 << (max_prefixlen - prefix)) - 1))
+        ranges.sort()
+        return sum(self.reserve_range(first, last) for first, last in merge_ranges(ranges))
+
+    def free_blocks(self):
+        """Yield ``(start, prefix)`` for every free block, largest blocks first."""
+        for prefix in range(self.base_prefix, self.max_prefixlen + 1):
+            for start in sorted(self._free[prefix]):
+                yield start, prefix
+
+    def stats(self) -> dict:
+        """Summarize free space and fragmentation.
+
+        Reserved (excluded) space counts neither as allocated nor as free.
+        ``fragmentation`` is ``1 - largest_free / free`` (0 when all free
+        space is one block or nothing is free).
+        """
+        by_prefix = {prefix: len(blocks) for prefix, blocks in self._free.items() if blocks}
+        largest_prefix = min(by_prefix, default=None)
+        largest_block = None
+        fragmentation = 0.0
+
+        if largest_prefix is not None:
+            start = min(self._free[largest_prefix])
+            network_class = ipaddress.IPv4Network if self.max_prefixlen == 32 else ipaddress.IPv6Network
+            largest_block = network_class((start, largest_prefix))
+            fragmentation = 1 - self._block_size(largest_prefix) / self.free_addresses
+
+        return {
+            "total_addresses": self.total_addresses,
+            "allocated_addresses": self.total_addresses - self.free_addresses - self.reserved_addresses,
+            "reserved_addresses": self.reserved_addresses,
+            "free_addresses": self.free_addresses,
+            "free_blocks": sum(by_prefix.values()),
+            "free_blocks_by_prefix": by_prefix,
+            "largest_free_block": largest_block,
+            "fragmentation": fragmentation,
+        }
+
+    def _block_size(self, prefix: int) -> int:
+        return 1 << (self.max_prefixlen - prefix)
+
+    def _align(self, address: int, prefix: int) -> int:
+        host_bits = self.max_prefixlen - prefix
+        return self.base_int + (((address - self.base_int) >> host_bits) << host_bits)
+
+    def _reserve_fragments(self, start: int, prefix: int) -> int:
+        """Reserve the free blocks lying inside a partly allocated ``/prefix`` block."""
+        end = start + self._block_size(prefix) - 1
+        reserved = 0
+        for level in range(prefix + 1, self.max_prefixlen + 1):
+            free_blocks = self._free[level]
+            if len(free_blocks) <= 1 << (level - prefix):
+                inside = [block for block in free_blocks if start <= block <= end]
+            else:
+                inside = [block for block in range(start, end + 1, self._block_size(level)) if block in free_blocks]
+            for block in inside:
+                free_blocks.discard(block)
+            reserved += len(inside) * self._block_size(level)
+
+        self.free_addresses -= reserved
+        self.reserved_addresses += reserved
+        return reserved
+
+    def _add_free(self, start: int, prefix: int):
+        self._free[prefix].add(start)
+        heapq.heappush(self._heaps[prefix], start)
+
+    def _pop_lowest(self, prefix: int):
+        heap = self._heaps[prefix]
+        free_blocks = self._free[prefix]
+        while heap:
+            start = heapq.heappop(heap)
+            if start in free_blocks:
+                free_blocks.discard(start)
+                return start
+        return None
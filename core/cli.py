@@ -0,0 +1,214 @@
+"""Headless command-line mode for bulk IP/CIDR analysis.
+
+Reads one input per line from files or stdin and writes CSV, JSON Lines or
+JSON (see ``core.export``) incrementally, so arbitrarily large address
+lists are processed with bounded memory::
+
+    python -m core details addresses.txt --format csv
+    cat plans.txt | python -m core vlsm --format jsonl
+    python -m core summarize routes.txt
+
+``vlsm`` lines have the form ``IP/CIDR dispositivos`` where the devices are
+a comma-separated list (``192.168.1.0/24 60,30,12``); the base network may
+be IPv6. ``summarize`` collapses
+all the input networks (IPv4 and IPv6) into the fewest covering blocks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import ipaddress
+import itertools
+import sys
+
+from utils.validators import parse_int_list, validate_ip_cidr
+
+from . import export, memo
+from .network_calc import calculate_network_details
+from .subnet_calc import calculate_subnets_by_devices
+from .summarize import collapse_networks
+
+DETAILS_FIELDS = ("input",) + export.DETAILS_FIELDS + ("error",)
+
+VLSM_FIELDS = ("input",) + export.VLSM_FIELDS
+
+SUMMARIZE_FIELDS = (
+    "network",
+    "prefix",
+    "last",
+    "num_addresses",
+    "input",
+    "error",
+)
+
+
+def iter_input_lines(streams):
+    """Yield stripped, non-empty, non-comment lines from ``streams``."""
+    for stream in streams:
+        for raw in stream:
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def _parse_network(text, allow_ipv6=False):
+    if allow_ipv6 and ":" in text:
+        if "/" not in text:
+            raise ValueError("Formato invalido. Usa IP/CIDR (ej: 2001:db8::/48).")
+        try:
+            return ipaddress.IPv6Network(text, strict=False)
+        except ValueError as error:
+            raise ValueError(f"IP o mascara invalida: {error}") from error
+
+    valid, network, error = validate_ip_cidr(text)
+    if not valid:
+        raise ValueError(error)
+    return network
+
+
+def details_rows(lines, calculate=calculate_network_details):
+    """Yield one ``DETAILS_FIELDS`` row per ``IP/CIDR`` line."""
+    for line in lines:
+        try:
+            network = _parse_network(line)
+        except ValueError as error:
+            yield {"input": line, "error": str(error)}
+            continue
+
+        # Netmask notation (``IP/255.255.255.0``) is valid input; calculate from the prefix length.
+        ip_part = line.split("/", 1)[0].strip()
+        yield {"input": line, **export.details_row(calculate(f"{ip_part}/{network.prefixlen}"))}
+
+
+def _parse_vlsm_line(line):
+    network_part, _, devices_part = line.replace(";", " ").partition(" ")
+    network = _parse_network(network_part.strip(), allow_ipv6=True)
+    try:
+        devices = parse_int_list(devices_part)
+    except ValueError as error:
+        raise ValueError("La lista de dispositivos debe contener solo enteros.") from error
+    if not devices:
+        raise ValueError("Debes indicar al menos un valor de dispositivos.")
+    return network, devices
+
+
+def vlsm_rows(lines):
+    """Yield one ``VLSM_FIELDS`` row per allocated subnet of each plan line."""
+    for line in lines:
+        try:
+            network, devices = _parse_vlsm_line(line)
+        except ValueError as error:
+            yield {"input": line, "error": str(error)}
+            continue
+
+        for row in export.vlsm_rows(calculate_subnets_by_devices(network, devices)):
+            yield {"input": line, **row}
+
+
+def summarize_rows(lines):
+    """Yield one ``SUMMARIZE_FIELDS`` row per collapsed block of all the lines.
+
+    Summarizing needs the whole input, so rows start once it has been read;
+    invalid lines are reported first.
+    """
+    errors = []
+
+    def networks():
+        for line in lines:
+            try:
+                yield ipaddress.ip_network(line, strict=False)
+            except ValueError as error:
+                errors.append({"input": line, "error": f"IP o mascara invalida: {error}"})
+
+    blocks = collapse_networks(networks())
+    first = next(blocks, None)
+    yield from errors
+    if first is None:
+        return
+
+    for network in itertools.chain((first,), blocks):
+        yield {
+            "network": str(network.network_address),
+            "prefix": network.prefixlen,
+            "last": str(network.broadcast_address),
+            "num_addresses": network.num_addresses,
+        }
+
+
+COMMANDS = {
+    "details": (details_rows, DETAILS_FIELDS),
+    "vlsm": (vlsm_rows, VLSM_FIELDS),
+    "summarize": (summarize_rows, SUMMARIZE_FIELDS),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="Calculadora de red IP en modo linea de comandos (procesamiento por lotes).",
+    )
+    parser.add_argument(
+        "command",
+        choices=sorted(COMMANDS),
+        help="details: IP/CIDR por linea; vlsm: IP/CIDR + dispositivos; summarize: resume todas las redes",
+    )
+    parser.add_argument("inputs", nargs="*", help="Ficheros de entrada (por defecto stdin; '-' tambien es stdin)")
+    parser.add_argument("-f", "--format", choices=export.FORMATS, default="csv", help="Formato de salida")
+    parser.add_argument("-o", "--output", help="Fichero de salida (por defecto stdout)")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Memoriza hasta N resultados de 'details' para entradas repetidas (0 = desactivado)",
+    )
+    return parser
+
+
+def _open_inputs(paths):
+    if not paths:
+        yield sys.stdin
+        return
+    for path in paths:
+        if path == "-":
+            yield sys.stdin
+            continue
+        with open(path, encoding="utf-8") as stream:
+            yield stream
+
+
+def run(command, streams, output, output_format="csv", cache_size=0):
+    """Process ``streams`` with ``command`` and write rows to ``output``.
+
+    With ``cache_size`` > 0 the ``details`` command goes through the
+    memoized ``core.memo`` entry point.
+    """
+    row_factory, fields = COMMANDS[command]
+    if cache_size > 0 and command == "details":
+        memo.calculate_network_details.resize(cache_size)
+        row_factory = functools.partial(row_factory, calculate=memo.calculate_network_details)
+    rows = row_factory(iter_input_lines(streams))
+    export.write_rows(rows, fields, output, output_format)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.cache_size < 0:
+        parser.error("--cache-size no puede ser negativo")
+
+    try:
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as output:
+                run(args.command, _open_inputs(args.inputs), output, args.format, args.cache_size)
+        else:
+            run(args.command, _open_inputs(args.inputs), sys.stdout, args.format, args.cache_size)
+    except BrokenPipeError:
+        # Downstream consumer (e.g. ``head``) closed the pipe; stop quietly.
+        sys.stderr.close()
+        return 0
+    except OSError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,141 @@
+"""Overlap and free-space checks between a proposed plan and existing allocations.
+
+Both sides are turned into integer intervals, sorted together once and swept
+left to right; each side keeps a heap of its open intervals ordered by end.
+A new interval overlaps exactly the intervals still open on the other side,
+so the whole check is ``O((n + m) log(n + m) + k)`` for ``k`` conflicts::
+
+    from core.conflicts import check_plan
+
+    plan = calculate_subnets_by_devices(base_network, devices)
+    report = check_plan(plan, ipam_export_lines, base_network)
+    if report["conflicts"]:
+        ...  # do not commit the plan
+
+Items may be strings, ``ipaddress`` networks or subnet records; the error
+entries of a plan (dicts with ``"error"``) are skipped. IPv4 and IPv6 items
+never conflict with each other.
+"""
+
+from __future__ import annotations
+
+import heapq
+import ipaddress
+from typing import NamedTuple
+
+from . import tracing
+from .ip_tools import network_bounds
+from .summarize import merge_ranges, range_to_blocks
+
+_PROPOSED = 0
+_EXISTING = 1
+
+_ADDRESS_CLASSES = {32: ipaddress.IPv4Address, 128: ipaddress.IPv6Address}
+_NETWORK_CLASSES = {32: ipaddress.IPv4Network, 128: ipaddress.IPv6Network}
+
+
+class Conflict(NamedTuple):
+    """One proposed item overlapping one existing item over ``first..last``."""
+
+    proposed: object
+    existing: object
+    first: ipaddress.IPv4Address | ipaddress.IPv6Address
+    last: ipaddress.IPv4Address | ipaddress.IPv6Address
+
+
+def find_conflicts(proposed, existing):
+    """Yield a :class:`Conflict` for every overlapping (proposed, existing) pair.
+
+    Conflicts come in address order of the start of each overlap.
+    """
+    intervals = {32: [], 128: []}
+    _add_intervals(intervals, proposed, _PROPOSED)
+    _add_intervals(intervals, existing, _EXISTING)
+
+    for max_prefixlen, events in intervals.items():
+        if events:
+            yield from _sweep(events, _ADDRESS_CLASSES[max_prefixlen])
+
+
+def free_blocks(base_network, *used):
+    """Yield the CIDR blocks of ``base_network`` not covered by any of the ``used`` iterables.
+
+    Items outside ``base_network`` (or of the other IP version) are ignored.
+    """
+    max_prefixlen = base_network.max_prefixlen
+    base_start = int(base_network.network_address)
+    base_end = int(base_network.broadcast_address)
+
+    ranges = []
+    for items in used:
+        for item in items:
+            if _is_error(item):
+                continue
+            start, prefix, bits = network_bounds(item)
+            end = start + (1 << (bits - prefix)) - 1
+            if bits == max_prefixlen and start <= base_end and end >= base_start:
+                ranges.append((max(start, base_start), min(end, base_end)))
+    ranges.sort()
+
+    network_class = _NETWORK_CLASSES[max_prefixlen]
+    cursor = base_start
+    for start, end in merge_ranges(ranges):
+        if start > cursor:
+            for network_int, prefix in range_to_blocks(cursor, start - 1, max_prefixlen):
+                yield network_class((network_int, prefix))
+        cursor = end + 1
+    if cursor <= base_end:
+        for network_int, prefix in range_to_blocks(cursor, base_end, max_prefixlen):
+            yield network_class((network_int, prefix))
+
+
+@tracing.traced("conflicts.check_plan")
+def check_plan(results, existing, base_network=None) -> dict:
+    """Pre-check a plan against existing allocations before committing it.
+
+    Returns ``{"ok", "conflicts", "free_blocks"}``: ``ok`` is ``True`` when
+    nothing overlaps; ``free_blocks`` (only with ``base_network``) lists the
+    space of the base network left free by both the plan and the existing
+    allocations. ``existing`` may be any iterable; it is read once.
+    """
+    results = list(results)
+    existing = list(existing)
+    conflicts = list(find_conflicts(results, existing))
+    tracing.count("conflicts.found", len(conflicts))
+    return {
+        "ok": not conflicts,
+        "conflicts": conflicts,
+        "free_blocks": [] if base_network is None else list(free_blocks(base_network, results, existing)),
+    }
+
+
+def _is_error(item) -> bool:
+    return isinstance(item, dict) and "error" in item
+
+
+def _add_intervals(intervals, items, side):
+    for order, item in enumerate(items):
+        if _is_error(item):
+            continue
+        start, prefix, max_prefixlen = network_bounds(item)
+        end = start + (1 << (max_prefixlen - prefix)) - 1
+        intervals[max_prefixlen].append((start, end, side, order, item))
+
+
+def _sweep(events, address_class):
+    events.sort()
+    open_intervals = ([], [])
+    for start, end, side, order, item in events:
+        other = open_intervals[1 - side]
+        while other and other[0][0] < start:
+            heapq.heappop(other)
+
+        for other_end, _, other_item in other:
+            first = address_class(start)
+            last = address_class(min(end, other_end))
+            if side == _PROPOSED:
+                yield Conflict(item, other_item, first, last)
+            else:
+                yield Conflict(other_item, item, first, last)
+
+        heapq.heappush(open_intervals[side], (end, order, item))
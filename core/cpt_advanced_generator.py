@@ -1,26 +1,66 @@
-"""Advanced Cisco Packet Tracer topology generator."""
+"""Advanced Cisco Packet Tracer topology generator.
+
+IPv6 base networks get one /64 per subnet and RIPng / OSPFv3 / static
+``ipv6 route`` instructions instead of the IPv4 ones.
+"""
 
 from __future__ import annotations
 
-import ipaddress
-import math
+from . import tracing
+from .ip_tools import IPV6_LAN_PREFIX, align_int_to_prefix, usable_hosts_for_prefix
+from .records import AdvancedCPTSubnetRecord, record_class_for
+from .streaming import join_lines
 
-from .ip_tools import align_address_to_prefix
+# Bump whenever the generated text changes (invalidates cached schemas).
+GENERATOR_VERSION = 1
 
 VALID_ROUTING_TYPES = {"estatico", "rip", "ospf"}
 
 
 def generate_advanced_cpt(base_network, subnet_configs, routing_type):
     """Generate a detailed CPT scheme with per-subnet configuration."""
+    allocated_subnets, error = plan_advanced_cpt(base_network, subnet_configs, routing_type)
+    if error:
+        return None, error
+
+    with tracing.span("cpt_advanced_generator.render", subnets=len(allocated_subnets)):
+        sections = _sections(base_network, allocated_subnets, normalize_routing_type(routing_type))
+        return "".join("\n".join(lines) for lines in sections), None
+
+
+def stream_advanced_cpt(base_network, subnet_configs, routing_type):
+    """Like ``generate_advanced_cpt`` but return ``(chunks, error)`` with a lazy report."""
+    allocated_subnets, error = plan_advanced_cpt(base_network, subnet_configs, routing_type)
+    if error:
+        return None, error
+    return iter_advanced_cpt(base_network, allocated_subnets, routing_type), None
+
+
+def iter_advanced_cpt(base_network, allocated_subnets, routing_type):
+    """Yield the report for already allocated subnets as chunks (see ``core.streaming``)."""
+    for lines in _sections(base_network, allocated_subnets, normalize_routing_type(routing_type)):
+        yield from join_lines(lines)
+
+
+def normalize_routing_type(routing_type) -> str:
+    """Lower-case and strip a routing type as the generator compares it."""
+    return (routing_type or "").lower().strip()
+
+
+@tracing.traced("cpt_advanced_generator.plan")
+def plan_advanced_cpt(base_network, subnet_configs, routing_type):
+    """Validate the configuration and allocate the subnets; return ``(allocated, error)``."""
     if not subnet_configs:
         return None, "Debes configurar al menos una subred."
 
-    routing = (routing_type or "").lower().strip()
-    if routing not in VALID_ROUTING_TYPES:
+    if normalize_routing_type(routing_type) not in VALID_ROUTING_TYPES:
         return None, "Tipo de enrutamiento invalido. Usa: estatico, rip u ospf."
 
     allocated_subnets = []
-    current_ip = base_network.network_address
+    current_int = int(base_network.network_address)
+    last_int = int(base_network.broadcast_address)
+    max_prefixlen = base_network.max_prefixlen
+    record_class = record_class_for(AdvancedCPTSubnetRecord, base_network)
 
     for index, config in enumerate(subnet_configs):
         routers = int(config.get("routers", 0))
@@ -31,44 +71,41 @@ def generate_advanced_cpt(base_network, subnet_configs, routing_type):
             return None, f"Subred {index}: routers/switches/hosts deben ser >= 0."
 
         total_hosts_needed = routers + hosts + 3
-        bits = math.ceil(math.log2(total_hosts_needed))
-        prefix = 32 - bits
+        prefix = max_prefixlen - (total_hosts_needed - 1).bit_length()
+        if base_network.version == 6:
+            prefix = min(prefix, IPV6_LAN_PREFIX)
 
         if prefix < base_network.prefixlen:
             return None, f"Subred {index} necesita /{prefix}, mas grande que red base."
-        if prefix > 30:
+        if base_network.version == 4 and prefix > 30:
             return None, f"Subred {index} requiere /{prefix}, excede limite /30."
 
-        aligned_ip = align_address_to_prefix(current_ip, prefix)
-
-        try:
-            subnet = ipaddress.IPv4Network(f"{aligned_ip}/{prefix}", strict=True)
-        except ValueError as error:
-            return None, f"Error calculando subred {index}: {error}"
+        block_size = 1 << (max_prefixlen - prefix)
+        network_int = align_int_to_prefix(current_int, prefix, max_prefixlen)
 
-        if not subnet.subnet_of(base_network):
+        if network_int + block_size - 1 > last_int:
             return None, f"No hay espacio para subred {index}."
 
         allocated_subnets.append(
-            {
-                "id": index,
-                "subnet": subnet,
-                "config": {"routers": routers, "switches": switches, "hosts": hosts},
-                "is_main": index == 0,
-            }
+            record_class(network_int, prefix, index, routers, switches, hosts)
         )
 
-        current_ip = ipaddress.IPv4Address(int(subnet.broadcast_address) + 1)
+        current_int = network_int + block_size
+
+    return allocated_subnets, None
+
 
-    output = _generate_header(base_network, len(subnet_configs), routing)
-    output += _generate_subnet_details(allocated_subnets)
-    output += _generate_routing_config(allocated_subnets, routing)
-    output += _generate_final_notes()
-    return output, None
+def _sections(base_network, allocated_subnets, routing):
+    return (
+        _header_lines(base_network, len(allocated_subnets), routing),
+        _subnet_details_lines(allocated_subnets),
+        _routing_config_lines(allocated_subnets, routing),
+        _final_notes_lines(),
+    )
 
 
-def _generate_header(base_network, num_subnets, routing_type):
-    lines = [
+def _header_lines(base_network, num_subnets, routing_type):
+    yield from [
         "=" * 100,
         "ESQUEMA AVANZADO CPT - CONFIGURACION DETALLADA POR SUBRED",
         "=" * 100,
@@ -79,11 +116,10 @@ def _generate_header(base_network, num_subnets, routing_type):
         "METODO:             VLSM (Variable Length Subnet Mask)",
         "",
     ]
-    return "\n".join(lines)
 
 
-def _generate_subnet_details(allocated_subnets):
-    lines = ["=" * 100, "CONFIGURACION DETALLADA POR SUBRED", "=" * 100]
+def _subnet_details_lines(allocated_subnets):
+    yield from ["=" * 100, "CONFIGURACION DETALLADA POR SUBRED", "=" * 100]
 
     for subnet_data in allocated_subnets:
         subnet_id = subnet_data["id"]
@@ -93,148 +129,125 @@ def _generate_subnet_details(allocated_subnets):
 
         vlan_id = 10 if subnet_id == 0 else (subnet_id + 1) * 10
         gateway = subnet.network_address + 1
-        mask_str = str(subnet.netmask)
-
-        lines.extend(
-            [
-                "",
-                "#" * 100,
-                (
-                    f"SUBRED {subnet_id} - RED PRINCIPAL (Conexion a Internet)"
-                    if is_main
-                    else f"SUBRED {subnet_id}"
-                ),
-                "#" * 100,
-                "",
-                "INFORMACION DE RED:",
-                "-" * 100,
-                f"  Red:               {subnet.network_address}/{subnet.prefixlen}",
-                f"  Subnet Mask:       {mask_str}",
-                f"  Broadcast:         {subnet.broadcast_address}",
-                f"  Gateway:           {gateway}",
-                f"  VLAN ID:           {vlan_id}",
-                f"  Hosts disponibles: {subnet.num_addresses - 2}",
-                "",
-            ]
-        )
+        mask_str = str(subnet.netmask) if subnet.version == 4 else f"/{subnet.prefixlen}"
+        last_label = "Broadcast:        " if subnet.version == 4 else "Ultima direccion: "
+
+        yield from [
+            "",
+            "#" * 100,
+            (
+                f"SUBRED {subnet_id} - RED PRINCIPAL (Conexion a Internet)"
+                if is_main
+                else f"SUBRED {subnet_id}"
+            ),
+            "#" * 100,
+            "",
+            "INFORMACION DE RED:",
+            "-" * 100,
+            f"  Red:               {subnet.network_address}/{subnet.prefixlen}",
+            f"  Subnet Mask:       {mask_str}",
+            f"  {last_label} {subnet.broadcast_address}",
+            f"  Gateway:           {gateway}",
+            f"  VLAN ID:           {vlan_id}",
+            f"  Hosts disponibles: {usable_hosts_for_prefix(subnet.prefixlen, subnet.max_prefixlen)}",
+            "",
+        ]
 
         if config["routers"] > 0:
-            lines.append(
-                _generate_router_details(
-                    subnet,
-                    config["routers"],
-                    gateway,
-                    mask_str,
-                    vlan_id,
-                    is_main,
-                    subnet_id,
-                )
+            yield from _router_details_lines(
+                subnet,
+                config["routers"],
+                gateway,
+                mask_str,
+                vlan_id,
+                is_main,
+                subnet_id,
             )
 
         if config["switches"] > 0:
-            lines.append(
-                _generate_switch_details(
-                    config["switches"], vlan_id, config["routers"], config["hosts"], subnet_id
-                )
+            yield from _switch_details_lines(
+                config["switches"], vlan_id, config["routers"], config["hosts"], subnet_id
             )
 
         if config["hosts"] > 0:
-            lines.append(
-                _generate_host_details(
-                    subnet,
-                    config["hosts"],
-                    gateway,
-                    mask_str,
-                    vlan_id,
-                    config["routers"],
-                    subnet_id,
-                )
+            yield from _host_details_lines(
+                subnet,
+                config["hosts"],
+                gateway,
+                mask_str,
+                vlan_id,
+                config["routers"],
+                subnet_id,
             )
 
-    return "\n".join(lines)
-
 
-def _generate_router_details(subnet, num_routers, gateway, mask_str, vlan_id, is_main, subnet_id):
-    lines = [f"ROUTERS ({num_routers}):", "-" * 100]
+def _router_details_lines(subnet, num_routers, gateway, mask_str, vlan_id, is_main, subnet_id):
+    yield from [f"ROUTERS ({num_routers}):", "-" * 100]
     current_ip = gateway
 
     for index in range(num_routers):
         router_name = f"Router{subnet_id}_{index}" if not is_main else f"RouterPrincipal_{index}"
-        lines.extend(
-            [
-                "",
-                f"  {router_name}:",
-                f"    Hostname:         {router_name}",
-                f"    Interfaz:         GigabitEthernet 0/{index}",
-                f"    IP Address:       {current_ip}",
-                f"    Subnet Mask:      {mask_str}",
-                (
-                    "    Descripcion:      Gateway principal - Conexion a Internet"
-                    if is_main and index == 0
-                    else f"    Descripcion:      Router Subred {subnet_id}"
-                ),
-            ]
-        )
+        yield from [
+            "",
+            f"  {router_name}:",
+            f"    Hostname:         {router_name}",
+            f"    Interfaz:         GigabitEthernet 0/{index}",
+            f"    IP Address:       {current_ip}",
+            f"    Subnet Mask:      {mask_str}",
+            (
+                "    Descripcion:      Gateway principal - Conexion a Internet"
+                if is_main and index == 0
+                else f"    Descripcion:      Router Subred {subnet_id}"
+            ),
+        ]
 
         if is_main and index == 0:
-            lines.extend(
-                [
-                    "    Interfaz WAN:     GigabitEthernet 0/1 (Conectar a ISP/Internet)",
-                    "    NAT:              Configurar NAT overload en Gi0/1",
-                ]
-            )
-
-        lines.extend(
-            [
-                f"    VLAN:             {vlan_id}",
-                f"    Conectar a:       Switch{subnet_id}_0 (Puerto Trunk)",
+            yield from [
+                "    Interfaz WAN:     GigabitEthernet 0/1 (Conectar a ISP/Internet)",
+                "    NAT:              Configurar NAT overload en Gi0/1",
             ]
-        )
 
-        current_ip = ipaddress.IPv4Address(int(current_ip) + 1)
+        yield from [
+            f"    VLAN:             {vlan_id}",
+            f"    Conectar a:       Switch{subnet_id}_0 (Puerto Trunk)",
+        ]
 
-    return "\n".join(lines)
+        current_ip += 1
 
 
-def _generate_switch_details(num_switches, vlan_id, num_routers, num_hosts, subnet_id):
-    lines = [f"SWITCHES ({num_switches}):", "-" * 100]
+def _switch_details_lines(num_switches, vlan_id, num_routers, num_hosts, subnet_id):
+    yield from [f"SWITCHES ({num_switches}):", "-" * 100]
 
     for index in range(num_switches):
         switch_name = f"Switch{subnet_id}_{index}"
-        lines.extend(
-            [
-                "",
-                f"  {switch_name}:",
-                f"    Hostname:         {switch_name}",
-                "    Modelo:           Catalyst 2960",
-                "    VLAN Database:",
-                "      - VLAN 1:       Default (Nativa)",
-                f"      - VLAN {vlan_id}:      Subred_{subnet_id}",
-                "",
-                "    Puertos TRUNK:",
-            ]
-        )
+        yield from [
+            "",
+            f"  {switch_name}:",
+            f"    Hostname:         {switch_name}",
+            "    Modelo:           Catalyst 2960",
+            "    VLAN Database:",
+            "      - VLAN 1:       Default (Nativa)",
+            f"      - VLAN {vlan_id}:      Subred_{subnet_id}",
+            "",
+            "    Puertos TRUNK:",
+        ]
 
         if index == 0 and num_routers > 0:
             for router_index in range(min(num_routers, 2)):
-                lines.extend(
-                    [
-                        f"      - Fa0/{router_index + 1}:      Modo TRUNK -> Router{subnet_id}_{router_index}",
-                        f"                        Allowed VLANs: {vlan_id}",
-                    ]
-                )
-        elif index > 0:
-            lines.extend(
-                [
-                    "      - Fa0/1:          Modo TRUNK -> Switch{subnet_id}_0",
+                yield from [
+                    f"      - Fa0/{router_index + 1}:      Modo TRUNK -> Router{subnet_id}_{router_index}",
                     f"                        Allowed VLANs: {vlan_id}",
                 ]
-            )
+        elif index > 0:
+            yield from [
+                "      - Fa0/1:          Modo TRUNK -> Switch{subnet_id}_0",
+                f"                        Allowed VLANs: {vlan_id}",
+            ]
         else:
-            lines.append("      - (Sin routers conectados)")
+            yield "      - (Sin routers conectados)"
 
-        lines.append("")
-        lines.append("    Puertos ACCESS:")
+        yield ""
+        yield "    Puertos ACCESS:"
 
         hosts_per_switch = num_hosts // num_switches
         if index < num_hosts % num_switches:
@@ -244,71 +257,61 @@ def _generate_switch_details(num_switches, vlan_id, num_routers, num_hosts, subn
         end_port = min(start_port + hosts_per_switch - 1, 24)
 
         if hosts_per_switch > 0:
-            lines.extend(
-                [
-                    f"      - Fa0/{start_port}-Fa0/{end_port}: Modo ACCESS -> VLAN {vlan_id}",
-                    f"                        Conectar {hosts_per_switch} hosts",
-                ]
-            )
+            yield from [
+                f"      - Fa0/{start_port}-Fa0/{end_port}: Modo ACCESS -> VLAN {vlan_id}",
+                f"                        Conectar {hosts_per_switch} hosts",
+            ]
         else:
-            lines.append("      - (Sin hosts asignados)")
-
-    return "\n".join(lines)
+            yield "      - (Sin hosts asignados)"
 
 
-def _generate_host_details(subnet, num_hosts, gateway, mask_str, vlan_id, num_routers, subnet_id):
-    lines = [f"HOSTS/DISPOSITIVOS ({num_hosts}):", "-" * 100]
+def _host_details_lines(subnet, num_hosts, gateway, mask_str, vlan_id, num_routers, subnet_id):
+    yield from [f"HOSTS/DISPOSITIVOS ({num_hosts}):", "-" * 100]
 
     current_ip = subnet.network_address + 1 + num_routers + 1
     sample_limit = min(4, num_hosts)
 
     for index in range(sample_limit):
         pc_name = f"PC{subnet_id}_{index + 1}"
-        lines.extend(
-            [
-                "",
-                f"  {pc_name}:",
-                f"    IP Address:       {current_ip}",
-                f"    Subnet Mask:      {mask_str}",
-                f"    Default Gateway:  {gateway}",
-                f"    DNS:              {gateway} (opcional)",
-                f"    VLAN:             {vlan_id}",
-                f"    Conectar a:       Switch{subnet_id}_0 - Puerto Fa0/{index + 3}",
-            ]
-        )
-        current_ip = ipaddress.IPv4Address(int(current_ip) + 1)
+        yield from [
+            "",
+            f"  {pc_name}:",
+            f"    IP Address:       {current_ip}",
+            f"    Subnet Mask:      {mask_str}",
+            f"    Default Gateway:  {gateway}",
+            f"    DNS:              {gateway} (opcional)",
+            f"    VLAN:             {vlan_id}",
+            f"    Conectar a:       Switch{subnet_id}_0 - Puerto Fa0/{index + 3}",
+        ]
+        current_ip += 1
 
     remaining = num_hosts - sample_limit
     if remaining > 0:
-        lines.extend(
-            [
-                "",
-                (
-                    f"  ... y {remaining} hosts mas configurados secuencialmente "
-                    f"desde {current_ip}"
-                ),
-                f"      (Mismo Gateway, Subnet Mask y VLAN {vlan_id})",
-            ]
-        )
-
-    return "\n".join(lines)
-
-
-def _generate_routing_config(allocated_subnets, routing_type):
-    lines = ["=" * 100, f"CONFIGURACION DE ENRUTAMIENTO - {routing_type.upper()}", "=" * 100, ""]
-
-    if routing_type == "estatico":
-        lines.append(_generate_static_routing(allocated_subnets))
+        yield from [
+            "",
+            (
+                f"  ... y {remaining} hosts mas configurados secuencialmente "
+                f"desde {current_ip}"
+            ),
+            f"      (Mismo Gateway, Subnet Mask y VLAN {vlan_id})",
+        ]
+
+
+def _routing_config_lines(allocated_subnets, routing_type):
+    yield from ["=" * 100, f"CONFIGURACION DE ENRUTAMIENTO - {routing_type.upper()}", "=" * 100, ""]
+
+    if allocated_subnets and allocated_subnets[0]["subnet"].version == 6:
+        yield from _ipv6_routing_lines(allocated_subnets, routing_type)
+    elif routing_type == "estatico":
+        yield from _static_routing_lines(allocated_subnets)
     elif routing_type == "rip":
-        lines.append(_generate_rip_routing(allocated_subnets))
+        yield from _rip_routing_lines(allocated_subnets)
     else:
-        lines.append(_generate_ospf_routing(allocated_subnets))
-
-    return "\n".join(lines)
+        yield from _ospf_routing_lines(allocated_subnets)
 
 
-def _generate_static_routing(allocated_subnets):
-    lines = [
+def _static_routing_lines(allocated_subnets):
+    yield from [
         "ENRUTAMIENTO ESTATICO:",
         "-" * 100,
         "",
@@ -319,21 +322,18 @@ def _generate_static_routing(allocated_subnets):
     for subnet_data in allocated_subnets:
         if subnet_data["config"]["routers"] > 0:
             subnet_id = subnet_data["id"]
-            lines.extend(
-                [
-                    f"Router{subnet_id}_0:",
-                    "  Router(config)# ip route [red_destino] [mascara_destino] [next_hop_ip]",
-                    "  (Configurar una ruta por cada subred remota)",
-                    "",
-                ]
-            )
+            yield from [
+                f"Router{subnet_id}_0:",
+                "  Router(config)# ip route [red_destino] [mascara_destino] [next_hop_ip]",
+                "  (Configurar una ruta por cada subred remota)",
+                "",
+            ]
 
-    lines.append("NOTA: El next_hop_ip es la IP del router vecino en la red de transito.")
-    return "\n".join(lines)
+    yield "NOTA: El next_hop_ip es la IP del router vecino en la red de transito."
 
 
-def _generate_rip_routing(allocated_subnets):
-    lines = [
+def _rip_routing_lines(allocated_subnets):
+    yield from [
         "ENRUTAMIENTO RIP (Routing Information Protocol):",
         "-" * 100,
         "",
@@ -346,14 +346,13 @@ def _generate_rip_routing(allocated_subnets):
 
     for subnet_data in allocated_subnets:
         network_addr = subnet_data["subnet"].network_address
-        lines.append(f"Router(config-router)# network {network_addr}")
+        yield f"Router(config-router)# network {network_addr}"
 
-    lines.append("\nNOTA: RIP propaga automaticamente las rutas entre routers.")
-    return "\n".join(lines)
+    yield "\nNOTA: RIP propaga automaticamente las rutas entre routers."
 
 
-def _generate_ospf_routing(allocated_subnets):
-    lines = [
+def _ospf_routing_lines(allocated_subnets):
+    yield from [
         "ENRUTAMIENTO OSPF (Open Shortest Path First):",
         "-" * 100,
         "",
@@ -364,16 +363,64 @@ def _generate_ospf_routing(allocated_subnets):
 
     for subnet_data in allocated_subnets:
         subnet = subnet_data["subnet"]
-        lines.append(
-            f"Router(config-router)# network {subnet.network_address} {subnet.hostmask} area 0"
-        )
+        yield f"Router(config-router)# network {subnet.network_address} {subnet.hostmask} area 0"
+
+    yield "\nNOTA: OSPF usa areas. Area 0 es el backbone."
+
+
+def _ipv6_routing_lines(allocated_subnets, routing_type):
+    yield from [
+        "En CADA router, activar primero el enrutamiento IPv6:",
+        "",
+        "Router(config)# ipv6 unicast-routing",
+        "",
+    ]
+
+    if routing_type == "estatico":
+        yield from [
+            "ENRUTAMIENTO ESTATICO (IPv6):",
+            "-" * 100,
+            "",
+            "En cada router, configurar rutas estaticas hacia las demas subredes:",
+            "",
+        ]
+        for subnet_data in allocated_subnets:
+            yield f"Router(config)# ipv6 route {subnet_data['subnet']} [next_hop_ipv6]"
+        yield "\nNOTA: El next_hop_ipv6 es la IPv6 del router vecino en la red de transito."
+        return
+
+    if routing_type == "rip":
+        yield from [
+            "ENRUTAMIENTO RIPng (RIP para IPv6):",
+            "-" * 100,
+            "",
+            "Router(config)# ipv6 router rip RIPNG",
+            "",
+            "En cada interfaz LAN del router:",
+            "",
+        ]
+        interface_command = "ipv6 rip RIPNG enable"
+    else:
+        yield from [
+            "ENRUTAMIENTO OSPFv3 (OSPF para IPv6):",
+            "-" * 100,
+            "",
+            "Router(config)# ipv6 router ospf 1",
+            "Router(config-rtr)# router-id [x.x.x.x]",
+            "",
+            "En cada interfaz LAN del router:",
+            "",
+        ]
+        interface_command = "ipv6 ospf 1 area 0"
+
+    for subnet_data in allocated_subnets:
+        yield f"Router(config-if)# {interface_command}    ! red {subnet_data['subnet']}"
 
-    lines.append("\nNOTA: OSPF usa areas. Area 0 es el backbone.")
-    return "\n".join(lines)
+    yield "\nNOTA: En IPv6 los protocolos se activan por interfaz, no con sentencias 'network'."
 
 
-def _generate_final_notes():
-    lines = [
+def _final_notes_lines():
+    yield from [
         "=" * 100,
         "PASOS ADICIONALES",
         "=" * 100,
@@ -396,4 +443,3 @@ def _generate_final_notes():
         "   - O simplemente: write memory",
         "",
     ]
-    return "\n".join(lines)
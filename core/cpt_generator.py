@@ -1,15 +1,62 @@
-"""Cisco Packet Tracer topology generator (basic mode)."""
+"""Cisco Packet Tracer topology generator (basic mode).
+
+IPv6 base networks are supported: every subnet then gets (at least) a /64,
+the LAN prefix IPv6 autoconfiguration expects.
+"""
 
 from __future__ import annotations
 
-import ipaddress
-import math
+from . import tracing
+from .allocator import BuddyAllocator
+from .ip_tools import IPV6_LAN_PREFIX, host_bits_for_devices
+from .records import CPTSubnetRecord, record_class_for
+from .streaming import join_lines
+
+# Bump whenever the generated text changes (invalidates cached schemas).
+GENERATOR_VERSION = 1
+
+
+def generate_cpt_topology(base_network, num_subnets, num_routers, num_switches, devices_list, excluded=None):
+    """Generate a complete CPT topology using VLSM, skipping ``excluded`` networks."""
+    topology_data, error = plan_cpt_topology(
+        base_network, num_subnets, num_routers, num_switches, devices_list, excluded
+    )
+    if error:
+        return None, error
+
+    with tracing.span("cpt_generator.render", subnets=len(topology_data)):
+        sections = _sections(base_network, num_subnets, num_routers, num_switches, topology_data)
+        return "".join("\n".join(lines) for lines in sections), None
+
+
+def stream_cpt_topology(base_network, num_subnets, num_routers, num_switches, devices_list, excluded=None):
+    """Validate and plan like ``generate_cpt_topology`` but return the report as chunks.
+
+    Returns ``(chunks, None)`` where ``chunks`` is a lazy iterator whose
+    concatenation equals the ``generate_cpt_topology`` output, or
+    ``(None, error)``.
+    """
+    topology_data, error = plan_cpt_topology(
+        base_network, num_subnets, num_routers, num_switches, devices_list, excluded
+    )
+    if error:
+        return None, error
+    return iter_cpt_topology(base_network, num_subnets, num_routers, num_switches, topology_data), None
+
+
+def iter_cpt_topology(base_network, num_subnets, num_routers, num_switches, topology_data):
+    """Yield the report for an already planned topology as chunks (see ``core.streaming``)."""
+    for lines in _sections(base_network, num_subnets, num_routers, num_switches, topology_data):
+        yield from join_lines(lines)
 
-from .ip_tools import align_address_to_prefix
 
+@tracing.traced("cpt_generator.plan")
+def plan_cpt_topology(base_network, num_subnets, num_routers, num_switches, devices_list, excluded=None):
+    """Validate the inputs and allocate the subnets; return ``(topology_data, error)``.
 
-def generate_cpt_topology(base_network, num_subnets, num_routers, num_switches, devices_list):
-    """Generate a complete CPT topology using VLSM."""
+    ``excluded`` networks (management, DMZ, ranges in use) are left out of
+    the allocation.
+    """
     if num_subnets < 1:
         return None, "El numero de subredes debe ser mayor a 0."
     if num_routers < 1:
@@ -30,32 +77,32 @@ def generate_cpt_topology(base_network, num_subnets, num_routers, num_switches,
     sorted_devices = [devices_list[idx] for idx in sorted_indexes]
 
     topology_data = []
-    current_ip = base_network.network_address
+    try:
+        allocator = BuddyAllocator.for_network(base_network, excluded)
+    except ValueError as error:
+        return None, f"Exclusion invalida: {error}"
+    max_prefixlen = base_network.max_prefixlen
+    record_class = record_class_for(CPTSubnetRecord, base_network)
 
     for index, num_hosts in enumerate(sorted_devices, start=1):
-        needed = num_hosts + 2
-        host_bits = math.ceil(math.log2(needed))
-        prefix = 32 - host_bits
+        prefix = max_prefixlen - host_bits_for_devices(num_hosts, max_prefixlen)
+        if base_network.version == 6:
+            prefix = min(prefix, IPV6_LAN_PREFIX)
 
         if prefix < base_network.prefixlen:
             return None, (
                 f"El grupo de {num_hosts} dispositivos requiere /{prefix}, "
                 "mas grande que la red base."
             )
-        if prefix > 30:
+        if base_network.version == 4 and prefix > 30:
             return None, (
                 f"El grupo de {num_hosts} dispositivos requiere /{prefix}, "
                 "excede limite practico (/30)."
             )
 
-        aligned_ip = align_address_to_prefix(current_ip, prefix)
+        network_int = allocator.allocate(prefix)
 
-        try:
-            subnet = ipaddress.IPv4Network(f"{aligned_ip}/{prefix}", strict=True)
-        except ValueError as error:
-            return None, f"Error al calcular subred: {error}"
-
-        if not subnet.subnet_of(base_network):
+        if network_int is None:
             return None, (
                 "No hay espacio suficiente en la red base para el grupo "
                 f"de {num_hosts} dispositivos."
@@ -66,31 +113,25 @@ def generate_cpt_topology(base_network, num_subnets, num_routers, num_switches,
         vlan_id = index * 10
 
         topology_data.append(
-            {
-                "id": index,
-                "num_hosts": num_hosts,
-                "subnet": subnet,
-                "router_id": router_id,
-                "switch_id": switch_id,
-                "vlan_id": vlan_id,
-                "gateway": subnet.network_address + 1,
-                "mask_str": str(subnet.netmask),
-            }
+            record_class(network_int, prefix, index, num_hosts, router_id, switch_id, vlan_id)
         )
 
-        current_ip = ipaddress.IPv4Address(int(subnet.broadcast_address) + 1)
+    return topology_data, None
+
 
-    output = _generate_header(base_network, num_subnets, num_routers, num_switches)
-    output += _generate_router_section(topology_data, num_routers)
-    output += _generate_switch_section(topology_data, num_switches)
-    output += _generate_devices_section(topology_data)
-    output += _generate_router_interconnection(num_routers)
-    output += _generate_recommendations()
-    return output, None
+def _sections(base_network, num_subnets, num_routers, num_switches, topology_data):
+    return (
+        _header_lines(base_network, num_subnets, num_routers, num_switches),
+        _router_section_lines(topology_data, num_routers),
+        _switch_section_lines(topology_data, num_switches),
+        _devices_section_lines(topology_data),
+        _router_interconnection_lines(num_routers),
+        _recommendations_lines(base_network.version),
+    )
 
 
-def _generate_header(base_network, num_subnets, num_routers, num_switches):
-    lines = [
+def _header_lines(base_network, num_subnets, num_routers, num_switches):
+    yield from [
         "=" * 90,
         "ESQUEMA DE RED PARA CISCO PACKET TRACER (VLSM)",
         "=" * 90,
@@ -100,39 +141,34 @@ def _generate_header(base_network, num_subnets, num_routers, num_switches):
         "METODO: VLSM (Ordenado por tamano de mayor a menor)",
         "",
     ]
-    return "\n".join(lines)
 
 
-def _generate_router_section(topology_data, num_routers):
-    lines = ["=" * 90, "1. CONFIGURACION DE ROUTERS", "=" * 90]
+def _router_section_lines(topology_data, num_routers):
+    yield from ["=" * 90, "1. CONFIGURACION DE ROUTERS", "=" * 90]
 
     routers = {router_id: [] for router_id in range(1, num_routers + 1)}
     for subnet_data in topology_data:
         routers[subnet_data["router_id"]].append(subnet_data)
 
     for router_id in range(1, num_routers + 1):
-        lines.extend(["", f"ROUTER {router_id}", "-" * 90])
+        yield from ["", f"ROUTER {router_id}", "-" * 90]
         assigned = routers[router_id]
         if not assigned:
-            lines.append("  (Sin subredes asignadas)")
+            yield "  (Sin subredes asignadas)"
             continue
 
         for interface_index, subnet_data in enumerate(assigned):
-            lines.extend(
-                [
-                    f"  Interfaz GigabitEthernet 0/{interface_index}:",
-                    (
-                        "    Descripcion:  Gateway Subred "
-                        f"{subnet_data['id']} (VLAN {subnet_data['vlan_id']})"
-                    ),
-                    f"    IP Address:   {subnet_data['gateway']}",
-                    f"    Subnet Mask:  {subnet_data['mask_str']}",
-                    f"    Conectar a:   Switch {subnet_data['switch_id']}",
-                    "",
-                ]
-            )
-
-    return "\n".join(lines)
+            yield from [
+                f"  Interfaz GigabitEthernet 0/{interface_index}:",
+                (
+                    "    Descripcion:  Gateway Subred "
+                    f"{subnet_data['id']} (VLAN {subnet_data['vlan_id']})"
+                ),
+                f"    IP Address:   {subnet_data['gateway']}",
+                f"    Subnet Mask:  {subnet_data['mask_str']}",
+                f"    Conectar a:   Switch {subnet_data['switch_id']}",
+                "",
+            ]
 
 
 def _distribute_access_ports(available_ports, num_segments):
@@ -147,37 +183,35 @@ def _distribute_access_ports(available_ports, num_segments):
     return distribution
 
 
-def _generate_switch_section(topology_data, num_switches):
-    lines = ["=" * 90, "2. CONFIGURACION DE SWITCHES", "=" * 90]
+def _switch_section_lines(topology_data, num_switches):
+    yield from ["=" * 90, "2. CONFIGURACION DE SWITCHES", "=" * 90]
 
     switches = {switch_id: [] for switch_id in range(1, num_switches + 1)}
     for subnet_data in topology_data:
         switches[subnet_data["switch_id"]].append(subnet_data)
 
     for switch_id in range(1, num_switches + 1):
-        lines.extend(["", f"SWITCH {switch_id}", "-" * 90])
+        yield from ["", f"SWITCH {switch_id}", "-" * 90]
         assigned = switches[switch_id]
         if not assigned:
-            lines.append("  (Sin subredes asignadas)")
+            yield "  (Sin subredes asignadas)"
             continue
 
-        lines.append("  Base de Datos VLAN:")
+        yield "  Base de Datos VLAN:"
         for subnet_data in assigned:
-            lines.append(f"    - VLAN {subnet_data['vlan_id']}: Nombre 'Subred_{subnet_data['id']}'")
+            yield f"    - VLAN {subnet_data['vlan_id']}: Nombre 'Subred_{subnet_data['id']}'"
 
-        lines.append("")
-        lines.append("  Puertos Uplink (Hacia Router):")
+        yield ""
+        yield "  Puertos Uplink (Hacia Router):"
         for uplink_index, subnet_data in enumerate(assigned, start=1):
-            lines.append(
-                (
-                    f"    - Fa0/{uplink_index}: Modo ACCESS (o TRUNK) -> "
-                    f"VLAN {subnet_data['vlan_id']} (Hacia Router {subnet_data['router_id']})"
-                )
+            yield (
+                f"    - Fa0/{uplink_index}: Modo ACCESS (o TRUNK) -> "
+                f"VLAN {subnet_data['vlan_id']} (Hacia Router {subnet_data['router_id']})"
             )
 
         uplinks_count = len(assigned)
-        lines.append("")
-        lines.append("  Puertos de Acceso (Hacia Dispositivos):")
+        yield ""
+        yield "  Puertos de Acceso (Hacia Dispositivos):"
 
         available_ports = max(24 - uplinks_count, 0)
         port_distribution = _distribute_access_ports(available_ports, len(assigned))
@@ -185,84 +219,69 @@ def _generate_switch_section(topology_data, num_switches):
         current_port = uplinks_count + 1
         for subnet_data, ports_for_vlan in zip(assigned, port_distribution):
             if ports_for_vlan <= 0:
-                lines.append(
-                    (
-                        f"    - VLAN {subnet_data['vlan_id']}: "
-                        "sin puertos libres en este switch (requiere expansion)."
-                    )
+                yield (
+                    f"    - VLAN {subnet_data['vlan_id']}: "
+                    "sin puertos libres en este switch (requiere expansion)."
                 )
                 continue
 
             end_port = current_port + ports_for_vlan - 1
-            lines.append(
-                (
-                    f"    - Fa0/{current_port}-Fa0/{end_port}: "
-                    f"Modo ACCESS -> VLAN {subnet_data['vlan_id']} (Subred {subnet_data['id']})"
-                )
+            yield (
+                f"    - Fa0/{current_port}-Fa0/{end_port}: "
+                f"Modo ACCESS -> VLAN {subnet_data['vlan_id']} (Subred {subnet_data['id']})"
             )
             current_port = end_port + 1
 
-    return "\n".join(lines)
 
-
-def _generate_devices_section(topology_data):
-    lines = ["=" * 90, "3. CONFIGURACION DE DISPOSITIVOS (Resumen)", "=" * 90]
+def _devices_section_lines(topology_data):
+    yield from ["=" * 90, "3. CONFIGURACION DE DISPOSITIVOS (Resumen)", "=" * 90]
 
     for subnet_data in topology_data:
-        lines.extend(
-            [
-                "",
-                (
-                    f"SUBRED {subnet_data['id']} "
-                    f"({subnet_data['num_hosts']} dispositivos) - VLAN {subnet_data['vlan_id']}"
-                ),
-                "-" * 90,
-                f"  Red: {subnet_data['subnet']} | Gateway: {subnet_data['gateway']}",
-                "",
-            ]
-        )
+        yield from [
+            "",
+            (
+                f"SUBRED {subnet_data['id']} "
+                f"({subnet_data['num_hosts']} dispositivos) - VLAN {subnet_data['vlan_id']}"
+            ),
+            "-" * 90,
+            f"  Red: {subnet_data['subnet']} | Gateway: {subnet_data['gateway']}",
+            "",
+        ]
 
         sample_limit = 3
         current_ip = subnet_data["subnet"].network_address + 2
 
         shown_hosts = min(subnet_data["num_hosts"], sample_limit)
         for host_index in range(shown_hosts):
-            lines.extend(
-                [
-                    f"  PC_{subnet_data['id']}_{host_index + 1}:",
-                    (
-                        f"    IP: {current_ip} | Mask: {subnet_data['mask_str']} "
-                        f"| Gateway: {subnet_data['gateway']}"
-                    ),
-                    (
-                        f"    Conectar a: Switch {subnet_data['switch_id']} "
-                        f"(Puerto de VLAN {subnet_data['vlan_id']})"
-                    ),
-                ]
-            )
-            current_ip = ipaddress.IPv4Address(int(current_ip) + 1)
+            yield from [
+                f"  PC_{subnet_data['id']}_{host_index + 1}:",
+                (
+                    f"    IP: {current_ip} | Mask: {subnet_data['mask_str']} "
+                    f"| Gateway: {subnet_data['gateway']}"
+                ),
+                (
+                    f"    Conectar a: Switch {subnet_data['switch_id']} "
+                    f"(Puerto de VLAN {subnet_data['vlan_id']})"
+                ),
+            ]
+            current_ip += 1
 
         remaining = subnet_data["num_hosts"] - shown_hosts
         if remaining > 0:
-            lines.append(f"\n  ... y {remaining} dispositivos mas configurados secuencialmente.")
+            yield f"\n  ... y {remaining} dispositivos mas configurados secuencialmente."
 
-    return "\n".join(lines)
 
-
-def _generate_router_interconnection(num_routers):
+def _router_interconnection_lines(num_routers):
     if num_routers <= 1:
-        return ""
+        return
 
-    lines = ["", "=" * 90, "INTERCONEXION DE ROUTERS", "=" * 90]
+    yield from ["", "=" * 90, "INTERCONEXION DE ROUTERS", "=" * 90]
     for router_id in range(1, num_routers):
-        lines.append(
-            f"  Router {router_id} Serial0/0/0 <---> Router {router_id + 1} Serial0/0/1"
-        )
-    return "\n".join(lines)
+        yield f"  Router {router_id} Serial0/0/0 <---> Router {router_id + 1} Serial0/0/1"
 
 
-def _generate_recommendations():
-    lines = [
+def _recommendations_lines(version=4):
+    yield from [
         "",
         "=" * 90,
         "RECOMENDACIONES",
@@ -271,4 +290,5 @@ def _generate_recommendations():
         "2. Si prefieres Router-on-a-Stick, usa un solo TRUNK y subinterfaces (ej: Gi0/0.10).",
         "3. Crea siempre las VLANs en el switch antes de asignar puertos.",
     ]
-    return "\n".join(lines)
+    if version == 6:
+        yield "4. IPv6: activa 'ipv6 unicast-routing' en cada router; los PCs pueden usar SLAAC en cada /64."
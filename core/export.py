@@ -0,0 +1,337 @@
+"""Structured export (CSV, JSON Lines, JSON) of the core results.
+
+The text reports are meant for people; automation should use these rows
+instead of parsing them back. Each ``*_rows`` function turns a core result
+into flat dicts of strings, integers and ``None`` (no ``ipaddress`` objects),
+lazily, and the encoders turn any row iterator into text chunks (see
+``core.streaming``), so a plan of 100k subnets is written without building
+the document in memory::
+
+    from core import export
+
+    results = calculate_subnets_by_devices(base_network, devices)
+    rows = export.vlsm_rows(results)
+    output.writelines(export.iter_rows(rows, export.VLSM_FIELDS, "json", {"base_network": str(base_network)}))
+
+CSV writes ``None`` as an empty cell and JSON as ``null``. ``json`` is one
+document (``{...metadata, "rows": [...]}`` or a bare array without
+metadata); ``jsonl`` is one object per line.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from . import cpt_advanced_generator, cpt_generator
+from .ip_tools import host_range
+
+FORMATS = ("csv", "jsonl", "json")
+
+DETAILS_FIELDS = (
+    "network",
+    "prefix",
+    "mask",
+    "wildcard",
+    "broadcast",
+    "first_host",
+    "last_host",
+    "total_hosts",
+)
+
+SUBNET_FIELDS = (
+    "index",
+    "network",
+    "prefix",
+    "broadcast",
+    "first_host",
+    "last_host",
+    "total_hosts",
+)
+
+VLSM_FIELDS = (
+    "index",
+    "devices",
+    "network",
+    "prefix",
+    "mask",
+    "broadcast",
+    "first_host",
+    "last_host",
+    "total_hosts",
+    "wasted_hosts",
+    "error",
+)
+
+CPT_FIELDS = (
+    "id",
+    "num_hosts",
+    "vlan_id",
+    "router_id",
+    "switch_id",
+    "network",
+    "prefix",
+    "mask",
+    "gateway",
+    "broadcast",
+    "first_host",
+    "last_host",
+    "total_hosts",
+)
+
+CPT_ADVANCED_FIELDS = (
+    "id",
+    "is_main",
+    "routers",
+    "switches",
+    "hosts",
+    "network",
+    "prefix",
+    "mask",
+    "gateway",
+    "broadcast",
+    "first_host",
+    "last_host",
+    "total_hosts",
+)
+
+# Encoded rows are joined into chunks of about this many characters.
+CHUNK_SIZE = 1 << 16
+
+
+def _optional_str(value):
+    return None if value is None else str(value)
+
+
+def _ipv4_str(value: int) -> str:
+    return f"{value >> 24}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}"
+
+
+def _record_fields(record) -> dict:
+    if record.max_prefixlen != 32:
+        return {
+            "network": str(record.network_addr),
+            "prefix": record.prefix,
+            "mask": record.mask_str,
+            "broadcast": str(record.broadcast_addr),
+            "first_host": _optional_str(record.first_host),
+            "last_host": _optional_str(record.last_host),
+            "total_hosts": record.total_hosts,
+        }
+
+    # IPv4 fast path: format the integers directly instead of through ``ipaddress``.
+    network_int = record.network_int
+    broadcast_int = record.broadcast_int
+    has_hosts = record.prefix < 31
+    return {
+        "network": _ipv4_str(network_int),
+        "prefix": record.prefix,
+        "mask": record.mask_str,
+        "broadcast": _ipv4_str(broadcast_int),
+        "first_host": _ipv4_str(network_int + 1) if has_hosts else None,
+        "last_host": _ipv4_str(broadcast_int - 1) if has_hosts else None,
+        "total_hosts": record.total_hosts,
+    }
+
+
+def details_row(details) -> dict:
+    """Return the ``DETAILS_FIELDS`` row of one ``calculate_network_details(_v6)`` result.
+
+    IPv6 has no wildcard (``None``); its ``broadcast`` is the last address.
+    """
+    if details.get("version") == 6:
+        wildcard, broadcast = None, details["last_addr"]
+    else:
+        wildcard, broadcast = details["wildcard_str"], details["broadcast_addr"]
+    return {
+        "network": details["network_addr"],
+        "prefix": details["cidr"],
+        "mask": details["mask_str"],
+        "wildcard": wildcard,
+        "broadcast": broadcast,
+        "first_host": _optional_str(details["first_host"]),
+        "last_host": _optional_str(details["last_host"]),
+        "total_hosts": details["total_hosts"],
+    }
+
+
+def details_rows(details_list):
+    """Yield a ``DETAILS_FIELDS`` row per network details result."""
+    for details in details_list:
+        yield details_row(details)
+
+
+def subnet_rows(subnet_info):
+    """Yield a ``SUBNET_FIELDS`` row per subnet of a ``calculate_subnets`` result."""
+    total_hosts = subnet_info["hosts_per_subnet"]
+    for index, subnet in enumerate(subnet_info["subnets"], start=1):
+        first_host, last_host = host_range(subnet)
+        yield {
+            "index": index,
+            "network": str(subnet.network_address),
+            "prefix": subnet.prefixlen,
+            "broadcast": str(subnet.broadcast_address),
+            "first_host": _optional_str(first_host),
+            "last_host": _optional_str(last_host),
+            "total_hosts": total_hosts,
+        }
+
+
+def vlsm_rows(results):
+    """Yield a ``VLSM_FIELDS`` row per entry of a ``calculate_subnets_by_devices`` plan.
+
+    Failed requests keep only ``index``, ``devices`` and ``error``.
+    """
+    for result in results:
+        if "error" in result:
+            yield {"index": result["index"], "devices": result["devices"], "error": result["error"]}
+            continue
+        row = {"index": result.index, "devices": result.devices}
+        row.update(_record_fields(result))
+        row["wasted_hosts"] = result.wasted_hosts
+        yield row
+
+
+def cpt_rows(topology_data):
+    """Yield a ``CPT_FIELDS`` row per subnet of a ``plan_cpt_topology`` result."""
+    for record in topology_data:
+        row = {
+            "id": record.id,
+            "num_hosts": record.num_hosts,
+            "vlan_id": record.vlan_id,
+            "router_id": record.router_id,
+            "switch_id": record.switch_id,
+        }
+        row.update(_record_fields(record))
+        row["gateway"] = str(record.gateway)
+        yield row
+
+
+def cpt_advanced_rows(allocated_subnets):
+    """Yield a ``CPT_ADVANCED_FIELDS`` row per subnet of a ``plan_advanced_cpt`` result."""
+    for record in allocated_subnets:
+        row = {
+            "id": record.id,
+            "is_main": record.is_main,
+            "routers": record.routers,
+            "switches": record.switches,
+            "hosts": record.hosts,
+        }
+        row.update(_record_fields(record))
+        row["gateway"] = str(record.gateway)
+        yield row
+
+
+def _chunked(pieces):
+    """Join small strings into chunks of about ``CHUNK_SIZE`` characters."""
+    batch = []
+    size = 0
+    for piece in pieces:
+        batch.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield "".join(batch)
+            batch.clear()
+            size = 0
+    if batch:
+        yield "".join(batch)
+
+
+def iter_csv(rows, fields):
+    """Yield ``rows`` as CSV chunks with a ``fields`` header; missing keys are empty."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, restval="", lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(rows):
+    """Yield ``rows`` as JSON Lines chunks, one object per line."""
+    return _chunked(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def iter_json(rows, metadata=None):
+    """Yield one JSON document: ``{**metadata, "rows": [...]}``, or a bare array without metadata."""
+    if metadata:
+        head = "{" + "".join(
+            f"{json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)}, "
+            for key, value in metadata.items()
+        )
+        yield head + '"rows": ['
+        tail = "\n]}\n"
+    else:
+        yield "["
+        tail = "\n]\n"
+
+    def pieces():
+        separator = "\n"
+        for row in rows:
+            yield separator
+            yield json.dumps(row, ensure_ascii=False)
+            separator = ",\n"
+
+    yield from _chunked(pieces())
+    yield tail
+
+
+def iter_rows(rows, fields, output_format="csv", metadata=None):
+    """Encode ``rows`` in ``output_format`` (one of ``FORMATS``) as chunks.
+
+    ``fields`` is the CSV header; ``metadata`` only goes into ``json``.
+    """
+    if output_format == "csv":
+        return iter_csv(rows, fields)
+    if output_format == "jsonl":
+        return iter_jsonl(rows)
+    if output_format == "json":
+        return iter_json(rows, metadata)
+    raise ValueError(f"Formato de exportacion invalido: {output_format}. Usa: {', '.join(FORMATS)}.")
+
+
+def write_rows(rows, fields, output, output_format="csv", metadata=None):
+    """Write ``rows`` to the text stream ``output`` (see :func:`iter_rows`)."""
+    output.writelines(iter_rows(rows, fields, output_format, metadata))
+
+
+def stream_cpt_export(
+    base_network, num_subnets, num_routers, num_switches, devices_list, output_format="json", excluded=None
+):
+    """Plan like ``cpt_generator.stream_cpt_topology`` but return structured chunks.
+
+    Returns ``(chunks, None)`` or ``(None, error)``.
+    """
+    topology_data, error = cpt_generator.plan_cpt_topology(
+        base_network, num_subnets, num_routers, num_switches, devices_list, excluded
+    )
+    if error:
+        return None, error
+    metadata = {
+        "base_network": str(base_network),
+        "num_subnets": num_subnets,
+        "num_routers": num_routers,
+        "num_switches": num_switches,
+    }
+    return iter_rows(cpt_rows(topology_data), CPT_FIELDS, output_format, metadata), None
+
+
+def stream_advanced_cpt_export(base_network, subnet_configs, routing_type, output_format="json"):
+    """Plan like ``cpt_advanced_generator.stream_advanced_cpt`` but return structured chunks.
+
+    Returns ``(chunks, None)`` or ``(None, error)``.
+    """
+    allocated_subnets, error = cpt_advanced_generator.plan_advanced_cpt(base_network, subnet_configs, routing_type)
+    if error:
+        return None, error
+    metadata = {
+        "base_network": str(base_network),
+        "routing": cpt_advanced_generator.normalize_routing_type(routing_type),
+    }
+    return iter_rows(cpt_advanced_rows(allocated_subnets), CPT_ADVANCED_FIELDS, output_format, metadata), None
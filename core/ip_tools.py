@@ -1,19 +1,27 @@
-"""Shared IPv4 utilities for core modules."""
+"""Shared IPv4/IPv6 utilities for core modules.
+
+IPv4 values come from the precomputed prefix tables; IPv6 values are plain
+integer arithmetic on ``max_prefixlen = 128``.
+"""
 
 from __future__ import annotations
 
 import ipaddress
 
+from .prefix_tables import NUM_ADDRESSES, PREFIX_TABLE, USABLE_HOSTS
+from .records import SubnetRecord
+
+# Addresses of each subnet that cannot go to hosts: network and broadcast in
+# IPv4; in IPv6 (no broadcast) only the subnet-router anycast address.
+RESERVED_ADDRESSES = {32: 2, 128: 1}
+
+# Prefix of an IPv6 LAN segment (SLAAC needs a 64-bit interface ID).
+IPV6_LAN_PREFIX = 64
+
 
 def netmask_octets(prefix: int) -> list[int]:
     """Return decimal octets for a CIDR prefix."""
-    mask_int = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF if prefix > 0 else 0
-    return [
-        (mask_int >> 24) & 0xFF,
-        (mask_int >> 16) & 0xFF,
-        (mask_int >> 8) & 0xFF,
-        mask_int & 0xFF,
-    ]
+    return list(PREFIX_TABLE[prefix].octets)
 
 
 def format_octets(octets: list[int]) -> str:
@@ -21,25 +29,55 @@ def format_octets(octets: list[int]) -> str:
     return ".".join(str(octet) for octet in octets)
 
 
-def usable_hosts_for_prefix(prefix: int) -> int:
+def usable_hosts_for_prefix(prefix: int, max_prefixlen: int = 32) -> int:
     """Return RFC-agnostic usable host count for a prefix."""
-    if prefix >= 31:
-        return 0
-    return (2 ** (32 - prefix)) - 2
+    if max_prefixlen == 32:
+        return USABLE_HOSTS[prefix]
+    return (1 << (max_prefixlen - prefix)) - RESERVED_ADDRESSES[max_prefixlen]
+
+
+def host_bits_for_devices(num_devices: int, max_prefixlen: int = 32) -> int:
+    """Host bits of the smallest subnet with ``num_devices`` usable addresses.
 
+    Exact integer form of ``ceil(log2(num_devices + reserved))``, safe for
+    IPv6-sized counts.
+    """
+    return (num_devices + RESERVED_ADDRESSES[max_prefixlen] - 1).bit_length()
 
-def host_range(network: ipaddress.IPv4Network):
+
+def host_range(network):
     """Return first/last usable host addresses, or ``None`` if not available."""
+    if network.version == 6:
+        if network.prefixlen == 128:
+            return None, None
+        return network.network_address + 1, network.broadcast_address
     if network.prefixlen >= 31:
         return None, None
     return network.network_address + 1, network.broadcast_address - 1
 
 
+def align_int_to_prefix(address_int: int, prefix: int, max_prefixlen: int = 32) -> int:
+    """Round an integer address up to the next network boundary for ``prefix``."""
+    block_size = NUM_ADDRESSES[prefix] if max_prefixlen == 32 else 1 << (max_prefixlen - prefix)
+    return (address_int + block_size - 1) & ~(block_size - 1)
+
+
 def align_address_to_prefix(address: ipaddress.IPv4Address, prefix: int) -> ipaddress.IPv4Address:
     """Align an address to the next valid network boundary for ``prefix``."""
-    block_size = 2 ** (32 - prefix)
-    address_int = int(address)
-    remainder = address_int % block_size
-    if remainder == 0:
+    aligned_int = align_int_to_prefix(int(address), prefix)
+    if aligned_int == int(address):
         return address
-    return ipaddress.IPv4Address(address_int + (block_size - remainder))
+    return ipaddress.IPv4Address(aligned_int)
+
+
+def network_bounds(network) -> tuple[int, int, int]:
+    """Return ``(network_int, prefix, max_prefixlen)`` for a network-like value.
+
+    Accepts anything ``ipaddress.ip_network`` does (host bits are dropped)
+    and subnet records, which are read without building a network object.
+    """
+    if isinstance(network, SubnetRecord):
+        return network.network_int, network.prefix, network.max_prefixlen
+    if not isinstance(network, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        network = ipaddress.ip_network(network.strip() if isinstance(network, str) else network, strict=False)
+    return int(network.network_address), network.prefixlen, network.max_prefixlen
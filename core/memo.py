@@ -0,0 +1,144 @@
+"""Opt-in LRU memoization for the ``core`` calculation entry points.
+
+Plain functions in ``core`` are never cached implicitly. Callers that see the
+same inputs over and over (GUI re-clicks, batch jobs over logs) import the
+memoized variants from here instead::
+
+    from core import memo
+
+    details = memo.calculate_network_details("192.168.1.10/24")
+    memo.calculate_network_details.cache_info()
+
+Cached results are frozen (dicts become ``MappingProxyType``, lists become
+tuples) so one caller cannot corrupt the value another caller receives.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import NamedTuple
+
+from . import network_calc, subnet_calc
+
+DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def freeze(value):
+    """Return a read-only equivalent of ``value`` (recursing into dicts, lists and tuples)."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class MemoizedFunction:
+    """Thread-safe LRU cache around ``func`` with hit/miss/eviction counters.
+
+    ``key`` maps the call arguments to a hashable cache key (positional
+    arguments by default). Exceptions are not cached. ``maxsize=0``
+    disables caching while still counting misses.
+    """
+
+    def __init__(self, func, maxsize: int = DEFAULT_MAXSIZE, key=None):
+        if maxsize < 0:
+            raise ValueError("maxsize no puede ser negativo")
+        self.__wrapped__ = func
+        self.__name__ = getattr(func, "__name__", "memoized")
+        self.__doc__ = getattr(func, "__doc__", None)
+        self._key = key or (lambda *args: args)
+        self._maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __call__(self, *args):
+        key = self._key(*args)
+        with self._lock:
+            result = self._cache.get(key, _MISSING)
+            if result is not _MISSING:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return result
+            self._misses += 1
+
+        result = freeze(self.__wrapped__(*args))
+
+        with self._lock:
+            if self._maxsize:
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                self._trim()
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._cache))
+
+    def cache_clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def resize(self, maxsize: int):
+        """Change the capacity, evicting the least recently used entries if needed."""
+        if maxsize < 0:
+            raise ValueError("maxsize no puede ser negativo")
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    def _trim(self):
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+            self._evictions += 1
+
+
+def memoize(maxsize: int = DEFAULT_MAXSIZE, key=None):
+    """Decorator form of :class:`MemoizedFunction`."""
+
+    def decorator(func):
+        return MemoizedFunction(func, maxsize=maxsize, key=key)
+
+    return decorator
+
+
+calculate_network_details = MemoizedFunction(network_calc.calculate_network_details)
+
+calculate_subnets = MemoizedFunction(subnet_calc.calculate_subnets)
+
+MEMOIZED = {
+    "calculate_network_details": calculate_network_details,
+    "calculate_subnets": calculate_subnets,
+}
+
+
+def configure(maxsize: int):
+    """Set the capacity of every memoized entry point."""
+    for function in MEMOIZED.values():
+        function.resize(maxsize)
+
+
+def cache_info() -> dict:
+    """Return the ``CacheInfo`` of every memoized entry point by name."""
+    return {name: function.cache_info() for name, function in MEMOIZED.items()}
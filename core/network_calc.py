@@ -3,8 +3,26 @@
 from __future__ import annotations
 
 import ipaddress
+from array import array
 
-from .ip_tools import format_octets, host_range, netmask_octets, usable_hosts_for_prefix
+from .ip_tools import IPV6_LAN_PREFIX, format_octets, host_range, usable_hosts_for_prefix
+from .prefix_tables import MASK_INTS, PREFIX_TABLE
+from .streaming import join_lines
+
+BATCH_COLUMNS = (
+    "address",
+    "prefix",
+    "network",
+    "broadcast",
+    "mask",
+    "wildcard",
+    "first_host",
+    "last_host",
+    "total_hosts",
+)
+
+# Smallest array typecode able to hold an unsigned 32-bit value on this platform.
+_UINT32_TYPECODE = next(code for code in ("I", "L") if array(code).itemsize >= 4)
 
 
 def calculate_network_details(ip_input: str):
@@ -14,46 +32,178 @@ def calculate_network_details(ip_input: str):
 
     ip_obj = ipaddress.IPv4Address(ip_part)
     network = ipaddress.IPv4Network(ip_input, strict=False)
+    prefix_info = PREFIX_TABLE[cidr]
 
-    mask_octets = netmask_octets(cidr)
-    mask_str = format_octets(mask_octets)
-
-    mask_int = int(network.netmask)
-    network_int = int(ip_obj) & mask_int
-    broadcast_int = network_int | int(network.hostmask)
+    network_int = int(ip_obj) & prefix_info.mask_int
+    broadcast_int = network_int | prefix_info.wildcard_int
 
     network_addr = str(ipaddress.IPv4Address(network_int))
     broadcast_addr = str(ipaddress.IPv4Address(broadcast_int))
-
-    determining_octet = next((idx for idx in range(3, -1, -1) if mask_octets[idx] != 255), -1)
-    block_size = 256 - mask_octets[determining_octet] if determining_octet >= 0 else 256
-
-    mask_binary = ".".join(format((mask_int >> (24 - idx * 8)) & 0xFF, "08b") for idx in range(4))
-    wildcard_octets = [255 - octet for octet in mask_octets]
+    wildcard_octets = [255 - octet for octet in prefix_info.octets]
 
     first_host, last_host = host_range(network)
 
     return {
         "ip": ip_part,
         "cidr": cidr,
-        "mask_str": mask_str,
-        "mask_binary": mask_binary,
-        "mask_octets": mask_octets,
+        "mask_str": prefix_info.mask_str,
+        "mask_binary": prefix_info.mask_binary,
+        "mask_octets": list(prefix_info.octets),
         "network_addr": network_addr,
         "broadcast_addr": broadcast_addr,
         "wildcard_str": format_octets(wildcard_octets),
-        "block_size": block_size,
-        "determining_octet": determining_octet,
-        "total_hosts": usable_hosts_for_prefix(cidr),
+        "block_size": prefix_info.block_size,
+        "determining_octet": prefix_info.determining_octet,
+        "total_hosts": prefix_info.usable_hosts,
         "first_host": first_host,
         "last_host": last_host,
         "network_obj": network,
     }
 
 
-def format_detailed_output(details):
-    """Format network details into a readable report."""
-    lines = [
+def calculate_network_details_v6(ip_input: str):
+    """IPv6 counterpart of :func:`calculate_network_details`.
+
+    Everything is derived from the 128-bit integers; the result carries
+    ``"version": 6`` and is understood by :func:`format_detailed_output`.
+    """
+    network = ipaddress.IPv6Network(ip_input.strip(), strict=False)
+    ip_part = ip_input.strip().split("/", 1)[0]
+    address = ipaddress.IPv6Address(ip_part)
+    cidr = network.prefixlen
+    host_bits = 128 - cidr
+
+    host_mask = (1 << host_bits) - 1
+    mask_int = ((1 << 128) - 1) ^ host_mask
+    network_int = int(address) & mask_int
+    last_int = network_int | host_mask
+    first_host, last_host = host_range(network)
+
+    return {
+        "version": 6,
+        "ip": ip_part,
+        "ip_exploded": address.exploded,
+        "cidr": cidr,
+        "host_bits": host_bits,
+        "mask_str": str(ipaddress.IPv6Address(mask_int)),
+        "network_addr": str(ipaddress.IPv6Address(network_int)),
+        "network_exploded": ipaddress.IPv6Address(network_int).exploded,
+        "last_addr": str(ipaddress.IPv6Address(last_int)),
+        "total_addresses": 1 << host_bits,
+        "total_hosts": usable_hosts_for_prefix(cidr, 128),
+        "lan_subnets": 1 << (IPV6_LAN_PREFIX - cidr) if cidr <= IPV6_LAN_PREFIX else 0,
+        "first_host": first_host,
+        "last_host": last_host,
+        "network_obj": network,
+    }
+
+
+def calculate_network_details_batch(addresses, prefixes=None, use_numpy=None):
+    """Columnar variant of :func:`calculate_network_details` for large inputs.
+
+    ``addresses`` is either a sequence of ``"IP/CIDR"`` strings (with
+    ``prefixes`` left as ``None``) or a sequence / NumPy array of integer
+    addresses paired with ``prefixes``. Returns a dict mapping each name in
+    ``BATCH_COLUMNS`` to a column of unsigned 32-bit integers: NumPy arrays
+    when NumPy is available (or ``use_numpy=True``), ``array.array``
+    otherwise. For /31 and /32 ``first_host`` and ``last_host`` are 0 and
+    ``total_hosts`` is 0, matching the ``None`` values of the scalar API.
+    """
+    if prefixes is None:
+        addresses, prefixes = _parse_ip_cidr_column(addresses)
+
+    numpy = _load_numpy() if use_numpy in (None, True) else None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy no esta instalado.")
+
+    if numpy is not None:
+        return _details_batch_numpy(numpy, addresses, prefixes)
+    return _details_batch_array(addresses, prefixes)
+
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _parse_ip_cidr_column(ip_inputs):
+    addresses = array(_UINT32_TYPECODE)
+    prefixes = array("B")
+    for ip_input in ip_inputs:
+        network = ipaddress.IPv4Interface(ip_input.strip())
+        addresses.append(int(network.ip))
+        prefixes.append(network.network.prefixlen)
+    return addresses, prefixes
+
+
+def _details_batch_numpy(numpy, addresses, prefixes):
+    address_col = numpy.asarray(addresses, dtype=numpy.uint32)
+    prefix_col = numpy.asarray(prefixes, dtype=numpy.uint8)
+    if address_col.shape != prefix_col.shape:
+        raise ValueError("Las columnas de direcciones y prefijos deben tener la misma longitud.")
+    if prefix_col.size and int(prefix_col.max()) > 32:
+        raise ValueError("El prefijo debe estar entre 0 y 32.")
+
+    mask = numpy.array(MASK_INTS, dtype=numpy.uint32)[prefix_col]
+    wildcard = ~mask
+    network = address_col & mask
+    broadcast = network | wildcard
+    has_hosts = prefix_col < 31
+    zero = numpy.uint32(0)
+
+    return {
+        "address": address_col,
+        "prefix": prefix_col,
+        "network": network,
+        "broadcast": broadcast,
+        "mask": mask,
+        "wildcard": wildcard,
+        "first_host": numpy.where(has_hosts, network + numpy.uint32(1), zero),
+        "last_host": numpy.where(has_hosts, broadcast - numpy.uint32(1), zero),
+        "total_hosts": numpy.where(has_hosts, wildcard - numpy.uint32(1), zero),
+    }
+
+
+def _details_batch_array(addresses, prefixes):
+    if len(addresses) != len(prefixes):
+        raise ValueError("Las columnas de direcciones y prefijos deben tener la misma longitud.")
+
+    columns = {name: array(_UINT32_TYPECODE) for name in BATCH_COLUMNS}
+    columns["prefix"] = array("B")
+    for address, prefix in zip(addresses, prefixes):
+        address = int(address)
+        prefix = int(prefix)
+        if not 0 <= prefix <= 32:
+            raise ValueError("El prefijo debe estar entre 0 y 32.")
+
+        prefix_info = PREFIX_TABLE[prefix]
+        wildcard = prefix_info.wildcard_int
+        network = address & prefix_info.mask_int
+        broadcast = network | wildcard
+        has_hosts = prefix < 31
+
+        columns["address"].append(address)
+        columns["prefix"].append(prefix)
+        columns["network"].append(network)
+        columns["broadcast"].append(broadcast)
+        columns["mask"].append(prefix_info.mask_int)
+        columns["wildcard"].append(wildcard)
+        columns["first_host"].append(network + 1 if has_hosts else 0)
+        columns["last_host"].append(broadcast - 1 if has_hosts else 0)
+        columns["total_hosts"].append(wildcard - 1 if has_hosts else 0)
+
+    return columns
+
+
+def _detailed_output_lines(details):
+    if details.get("version") == 6:
+        yield from _detailed_output_lines_v6(details)
+        return
+
+    yield from [
         "=" * 80,
         "CALCULO DETALLADO DE RED",
         "=" * 80,
@@ -77,29 +227,79 @@ def format_detailed_output(details):
 
     if details["determining_octet"] >= 0:
         mask_value = details["mask_octets"][details["determining_octet"]]
-        lines.append(f"256 - {mask_value} = {details['block_size']}")
-        lines.append("")
-
-    lines.extend(
-        [
-            "PASO 4: BROADCAST",
-            "-" * 40,
-            f"Wildcard: {details['wildcard_str']}",
-            f"Broadcast: {details['broadcast_addr']}",
-            "",
-            "RESUMEN",
-            "=" * 80,
-            f"Red: {details['network_addr']}/{details['cidr']}",
-            f"Mascara: {details['mask_str']}",
-            f"Broadcast: {details['broadcast_addr']}",
-            f"Hosts usables: {details['total_hosts']}",
-        ]
-    )
+        yield f"256 - {mask_value} = {details['block_size']}"
+        yield ""
+
+    yield from [
+        "PASO 4: BROADCAST",
+        "-" * 40,
+        f"Wildcard: {details['wildcard_str']}",
+        f"Broadcast: {details['broadcast_addr']}",
+        "",
+        "RESUMEN",
+        "=" * 80,
+        f"Red: {details['network_addr']}/{details['cidr']}",
+        f"Mascara: {details['mask_str']}",
+        f"Broadcast: {details['broadcast_addr']}",
+        f"Hosts usables: {details['total_hosts']}",
+    ]
 
     if details["first_host"] is None:
-        lines.append("Rango de hosts: no aplica para /31 o /32")
+        yield "Rango de hosts: no aplica para /31 o /32"
     else:
-        lines.append(f"Primer host: {details['first_host']}")
-        lines.append(f"Ultimo host: {details['last_host']}")
+        yield f"Primer host: {details['first_host']}"
+        yield f"Ultimo host: {details['last_host']}"
 
-    return "\n".join(lines)
+
+def _detailed_output_lines_v6(details):
+    yield from [
+        "=" * 80,
+        "CALCULO DETALLADO DE RED (IPv6)",
+        "=" * 80,
+        "",
+        f"IP: {details['ip']}/{details['cidr']}",
+        f"Forma completa: {details['ip_exploded']}",
+        "",
+        "PASO 1: PREFIJO",
+        "-" * 40,
+        f"/{details['cidr']} = {details['cidr']} bits de red y {details['host_bits']} bits de host",
+        f"Mascara: {details['mask_str']}",
+        "",
+        "PASO 2: DIRECCION DE RED",
+        "-" * 40,
+        "AND entre IP y Mascara",
+        f"Resultado: {details['network_addr']}/{details['cidr']}",
+        f"Forma completa: {details['network_exploded']}",
+        "",
+        "PASO 3: RANGO",
+        "-" * 40,
+        f"Primera direccion: {details['network_addr']}",
+        f"Ultima direccion: {details['last_addr']}",
+        f"Direcciones: 2^{details['host_bits']} = {details['total_addresses']}",
+        "",
+        "RESUMEN",
+        "=" * 80,
+        f"Red: {details['network_addr']}/{details['cidr']}",
+        f"Mascara: {details['mask_str']}",
+        f"Ultima direccion: {details['last_addr']}",
+    ]
+
+    if details["lan_subnets"]:
+        yield f"Subredes /{IPV6_LAN_PREFIX}: {details['lan_subnets']}"
+    yield f"Hosts usables: {details['total_hosts']}"
+
+    if details["first_host"] is None:
+        yield "Rango de hosts: no aplica para /128"
+    else:
+        yield f"Primer host: {details['first_host']}"
+        yield f"Ultimo host: {details['last_host']}"
+
+
+def iter_detailed_output(details):
+    """Yield the network details report as chunks (see ``core.streaming``)."""
+    return join_lines(_detailed_output_lines(details))
+
+
+def format_detailed_output(details):
+    """Format network details into a readable report."""
+    return "\n".join(_detailed_output_lines(details))
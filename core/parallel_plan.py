@@ -0,0 +1,161 @@
+"""Sharded, multi-process VLSM planning for very large address plans.
+
+:func:`calculate_subnets_by_devices_parallel` returns exactly the same plan as
+:func:`core.subnet_calc.calculate_subnets_by_devices`. The serial planner
+hands out blocks largest first, so every block lands right after the
+previous one and each run of equal-size blocks starts on an address
+aligned to that size. That lets the parent compute, from the sorted
+requirements alone, where any slice of them starts: the sorted list is cut
+into shards, each shard gets its aligned start offset, and worker processes
+compute the prefixes and network addresses of their shard independently.
+The parent then merges the shards in order into the usual records.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .ip_tools import RESERVED_ADDRESSES, host_bits_for_devices
+from .records import DeviceSubnetRecord, record_class_for
+
+# Worker result codes stored in the prefix column instead of a prefix.
+_INVALID_DEVICES = -1
+_TOO_LARGE = -2
+_NO_SPACE = -3
+
+ERROR_MESSAGES = {
+    _INVALID_DEVICES: "El numero de dispositivos debe ser mayor a 0",
+    _TOO_LARGE: "Subred demasiado grande para la red base",
+    _NO_SPACE: "Excede la red base",
+}
+
+# Below this many requirements the pool start-up costs more than it saves.
+MIN_PARALLEL_REQUESTS = 20_000
+SHARDS_PER_WORKER = 4
+
+
+def calculate_subnets_by_devices_parallel(base_network, devices_list, workers=None, shard_size=None):
+    """Plan like ``calculate_subnets_by_devices`` using up to ``workers`` processes.
+
+    ``workers`` defaults to ``os.cpu_count()``; ``workers=1`` (or a small
+    input) runs the shards in-process. The result is identical to the serial
+    planner for any ``workers`` / ``shard_size``.
+    """
+    if not devices_list:
+        return []
+
+    devices_sorted = sorted(devices_list, reverse=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    if shard_size is None:
+        shard_size = max(1, math.ceil(len(devices_sorted) / (workers * SHARDS_PER_WORKER)))
+
+    base_int = int(base_network.network_address)
+    base_prefix = base_network.prefixlen
+    max_prefixlen = base_network.max_prefixlen
+    total = 1 << (max_prefixlen - base_prefix)
+    classes = _size_classes(devices_sorted, max_prefixlen - base_prefix, max_prefixlen)
+
+    shards = [
+        (
+            devices_sorted[start : start + shard_size],
+            _offset_before(classes, start),
+            total,
+            max_prefixlen,
+            base_prefix,
+        )
+        for start in range(0, len(devices_sorted), shard_size)
+    ]
+
+    if workers == 1 or len(devices_sorted) < MIN_PARALLEL_REQUESTS:
+        shard_results = [_allocate_shard(*shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            shard_results = list(executor.map(_allocate_shard, *zip(*shards)))
+
+    record_class = record_class_for(DeviceSubnetRecord, base_network)
+    results = []
+    index = 1
+    for (devices, *_), (offsets, prefixes) in zip(shards, shard_results):
+        for num_devices, offset, prefix in zip(devices, offsets, prefixes):
+            if prefix < 0:
+                results.append({"index": index, "devices": num_devices, "error": ERROR_MESSAGES[prefix]})
+            else:
+                results.append(record_class(base_int + offset, prefix, index, num_devices))
+            index += 1
+    return results
+
+
+def _size_classes(devices_sorted, max_host_bits, max_prefixlen=32):
+    """Return ``(start, count, block_size)`` of each block size in the sorted list.
+
+    A requirement of ``n`` devices needs ``host_bits_for_devices(n)`` host
+    bits, i.e. ``n + reserved`` fits in ``2 ** host_bits``, so each size
+    class is a contiguous run of the descending list found by bisection.
+    """
+    reserved = RESERVED_ADDRESSES[max_prefixlen]
+    keys = _Negated(devices_sorted)
+    classes = []
+    for host_bits in range(max_host_bits, host_bits_for_devices(1, max_prefixlen) - 1, -1):
+        start = bisect.bisect_left(keys, -((1 << host_bits) - reserved))
+        stop = bisect.bisect_left(keys, -((1 << (host_bits - 1)) - reserved))
+        if stop > start:
+            classes.append((start, stop - start, 1 << host_bits))
+    return classes
+
+
+def _offset_before(classes, position):
+    """Address offset of the first block at ``position`` of the sorted list."""
+    offset = 0
+    for start, count, block_size in classes:
+        if position <= start:
+            break
+        offset += min(position - start, count) * block_size
+    return offset
+
+
+def _allocate_shard(devices, offset, total, max_prefixlen, base_prefix):
+    """Worker: return ``(offsets, prefixes)`` columns for one shard."""
+    # IPv6 offsets can exceed 64 bits; fall back to a plain list there.
+    offsets = array("q", bytes(8 * len(devices))) if total <= 1 << 63 else [0] * len(devices)
+    prefixes = array("h", bytes(2 * len(devices)))
+    for position, num_devices in enumerate(devices):
+        if num_devices < 1:
+            prefixes[position] = _INVALID_DEVICES
+            continue
+
+        prefix = max_prefixlen - host_bits_for_devices(num_devices, max_prefixlen)
+        if prefix < base_prefix:
+            prefixes[position] = _TOO_LARGE
+            continue
+
+        block_size = 1 << (max_prefixlen - prefix)
+        if offset + block_size > total:
+            # Blocks only shrink from here on and the space left is a
+            # multiple of this block, i.e. none: every later block fails too.
+            prefixes[position] = _NO_SPACE
+            offset += block_size
+            continue
+
+        offsets[position] = offset
+        prefixes[position] = prefix
+        offset += block_size
+    return offsets, prefixes
+
+
+class _Negated:
+    """Ascending view (``-value``) of a descending list, for ``bisect``."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return -self.values[index]
@@ -0,0 +1,174 @@
+"""Longest-prefix-match lookups of addresses against generated plans."""
+
+from __future__ import annotations
+
+import ipaddress
+from array import array
+from bisect import bisect_right
+
+from .ip_tools import network_bounds
+
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class PlanIndex:
+    """Compiled address → subnet lookup over a set of networks.
+
+    The networks (which may nest, e.g. a /16 summary and /24s inside it) are
+    flattened once into disjoint, sorted integer intervals, each mapped to
+    its most specific network. A lookup is then one ``bisect`` over the
+    interval starts; :meth:`find_many` uses NumPy ``searchsorted`` for whole
+    batches when NumPy is installed. When the same network appears twice,
+    the later entry wins.
+    """
+
+    def __init__(self, entries):
+        """Build the index from ``(network, value)`` pairs of a single IP version.
+
+        ``network`` is anything ``ipaddress.ip_network`` accepts, or a
+        subnet record (read without building an ``ip_network`` object).
+        """
+        intervals = []
+        max_prefixlen = None
+        for order, (network, value) in enumerate(entries):
+            start, prefix, bits = network_bounds(network)
+            if max_prefixlen is None:
+                max_prefixlen = bits
+            elif bits != max_prefixlen:
+                raise ValueError("No se pueden mezclar redes IPv4 e IPv6 en el mismo indice.")
+            end = start + (1 << (bits - prefix)) - 1
+            intervals.append((start, -end, order, prefix, value))
+
+        self.max_prefixlen = max_prefixlen or 32
+        intervals.sort()
+        self._starts, self._ends, self._network_ints, self._prefixes, self.values = _flatten(intervals)
+        self._numpy_columns = None
+
+    @classmethod
+    def from_plan(cls, results):
+        """Index the subnets of a ``calculate_subnets_by_devices`` result (errors are skipped)."""
+        return cls((result, result) for result in results if "error" not in result)
+
+    def __len__(self):
+        """Number of disjoint intervals in the compiled index."""
+        return len(self._starts)
+
+    def find(self, address) -> int:
+        """Return the interval position covering ``address`` or ``-1``."""
+        address = _to_int(address)
+        position = bisect_right(self._starts, address) - 1
+        if position >= 0 and address <= self._ends[position]:
+            return position
+        return -1
+
+    def lookup(self, address):
+        """Return the value of the most specific network containing ``address`` (or ``None``)."""
+        position = self.find(address)
+        return None if position < 0 else self.values[position]
+
+    def lookup_network(self, address):
+        """Return the most specific network containing ``address`` (or ``None``)."""
+        position = self.find(address)
+        if position < 0:
+            return None
+        return ipaddress.ip_network((self._network_ints[position], self._prefixes[position]))
+
+    def find_many(self, addresses, use_numpy=None):
+        """Vectorised :meth:`find`: interval positions (``-1`` for misses) for each address.
+
+        Integer addresses are fastest; with NumPy (auto-detected, or forced
+        with ``use_numpy=True``) an ``int64`` NumPy array is returned,
+        otherwise an ``array.array``. IPv6 indexes always use the bisect loop.
+        """
+        numpy = _load_numpy() if use_numpy in (None, True) and self.max_prefixlen <= 64 else None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy no esta instalado o el indice no cabe en 64 bits.")
+
+        if numpy is not None:
+            return self._find_many_numpy(numpy, addresses)
+
+        starts = self._starts
+        ends = self._ends
+        positions = array("q")
+        append = positions.append
+        for address in addresses:
+            if not isinstance(address, int):
+                address = _to_int(address)
+            position = bisect_right(starts, address) - 1
+            append(position if position >= 0 and address <= ends[position] else -1)
+        return positions
+
+    def lookup_many(self, addresses, use_numpy=None) -> list:
+        """Return the value (or ``None``) for every address of ``addresses``."""
+        values = self.values
+        return [None if position < 0 else values[position] for position in self.find_many(addresses, use_numpy)]
+
+    def _find_many_numpy(self, numpy, addresses):
+        if self._numpy_columns is None:
+            self._numpy_columns = (
+                numpy.array(self._starts, dtype=numpy.uint64),
+                numpy.array(self._ends, dtype=numpy.uint64),
+            )
+        starts, ends = self._numpy_columns
+
+        if not isinstance(addresses, numpy.ndarray):
+            addresses = [address if isinstance(address, int) else _to_int(address) for address in addresses]
+        addresses = numpy.asarray(addresses, dtype=numpy.uint64)
+
+        positions = numpy.searchsorted(starts, addresses, side="right").astype(numpy.int64) - 1
+        if not len(starts):
+            return positions
+        covered = (positions >= 0) & (addresses <= ends[numpy.maximum(positions, 0)])
+        return numpy.where(covered, positions, -1)
+
+
+def _to_int(address) -> int:
+    if isinstance(address, int):
+        return address
+    if isinstance(address, str):
+        return int(ipaddress.ip_address(address.strip()))
+    return int(address)
+
+
+def _flatten(intervals):
+    """Turn sorted, possibly nested intervals into disjoint most-specific ones.
+
+    ``intervals`` are ``(start, -end, order, prefix, value)`` sorted so that
+    an enclosing network precedes the networks nested in it. A stack holds
+    the enclosing networks still open at the current position.
+    """
+    starts, ends, network_ints, prefixes, values = [], [], [], [], []
+
+    def emit(start, end, entry):
+        if start <= end:
+            starts.append(start)
+            ends.append(end)
+            network_ints.append(entry[0])
+            prefixes.append(entry[3])
+            values.append(entry[4])
+
+    stack = []
+    cursor = 0
+    for entry in intervals:
+        start = entry[0]
+        while stack and -stack[-1][1] < start:
+            closed = stack.pop()
+            emit(cursor, -closed[1], closed)
+            cursor = -closed[1] + 1
+        if stack:
+            emit(cursor, start - 1, stack[-1])
+        stack.append(entry)
+        cursor = start
+
+    while stack:
+        closed = stack.pop()
+        emit(cursor, -closed[1], closed)
+        cursor = -closed[1] + 1
+
+    return starts, ends, network_ints, prefixes, values
@@ -0,0 +1,52 @@
+"""Precomputed per-prefix IPv4 lookup tables.
+
+There are only 33 IPv4 prefixes, so every value derived from a prefix alone
+is computed once at import time and looked up by index afterwards
+(``PREFIX_TABLE[prefix]``). Prefixes must be in ``0..32``.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class PrefixInfo(NamedTuple):
+    prefix: int
+    mask_int: int
+    wildcard_int: int
+    octets: tuple[int, int, int, int]
+    mask_str: str
+    mask_binary: str
+    num_addresses: int
+    block_size: int
+    usable_hosts: int
+    determining_octet: int
+
+
+def _build_prefix_info(prefix: int) -> PrefixInfo:
+    mask_int = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    octets = tuple((mask_int >> shift) & 0xFF for shift in (24, 16, 8, 0))
+    determining_octet = next((idx for idx in range(3, -1, -1) if octets[idx] != 255), -1)
+    num_addresses = 1 << (32 - prefix)
+
+    return PrefixInfo(
+        prefix=prefix,
+        mask_int=mask_int,
+        wildcard_int=mask_int ^ 0xFFFFFFFF,
+        octets=octets,
+        mask_str=".".join(str(octet) for octet in octets),
+        mask_binary=".".join(format(octet, "08b") for octet in octets),
+        num_addresses=num_addresses,
+        block_size=256 - octets[determining_octet] if determining_octet >= 0 else 256,
+        usable_hosts=0 if prefix >= 31 else num_addresses - 2,
+        determining_octet=determining_octet,
+    )
+
+
+PREFIX_TABLE: tuple[PrefixInfo, ...] = tuple(_build_prefix_info(prefix) for prefix in range(33))
+
+MASK_INTS: tuple[int, ...] = tuple(info.mask_int for info in PREFIX_TABLE)
+WILDCARD_INTS: tuple[int, ...] = tuple(info.wildcard_int for info in PREFIX_TABLE)
+NUM_ADDRESSES: tuple[int, ...] = tuple(info.num_addresses for info in PREFIX_TABLE)
+USABLE_HOSTS: tuple[int, ...] = tuple(info.usable_hosts for info in PREFIX_TABLE)
+MASK_STRINGS: tuple[str, ...] = tuple(info.mask_str for info in PREFIX_TABLE)
@@ -0,0 +1,248 @@
+"""Compact subnet records shared by the VLSM allocators.
+
+The base classes are IPv4 records; each has an IPv6 counterpart (``...V6``)
+that only changes the address classes and the prefix-derived fields. Use
+:func:`record_class_for` to pick the right one for a base network.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+from collections.abc import Mapping
+
+from .prefix_tables import MASK_STRINGS, NUM_ADDRESSES, USABLE_HOSTS
+
+
+class SubnetRecord(Mapping):
+    """Subnet entry stored as network integer + prefix.
+
+    Address fields are derived on access instead of being kept as
+    ``ipaddress`` objects. The record also behaves as a read-only mapping over
+    ``_KEYS`` so code written against the former per-subnet dicts keeps
+    working (``record["network_addr"]``, ``"error" in record``...).
+    """
+
+    __slots__ = ("network_int", "prefix")
+
+    _KEYS: tuple[str, ...] = ()
+
+    max_prefixlen = 32
+    _address_class = ipaddress.IPv4Address
+    _network_class = ipaddress.IPv4Network
+
+    def __init__(self, network_int: int, prefix: int):
+        self.network_int = network_int
+        self.prefix = prefix
+
+    @property
+    def subnet(self):
+        return self._network_class((self.network_int, self.prefix))
+
+    @property
+    def num_addresses(self) -> int:
+        return NUM_ADDRESSES[self.prefix]
+
+    @property
+    def broadcast_int(self) -> int:
+        return self.network_int + self.num_addresses - 1
+
+    @property
+    def network_addr(self):
+        return self._address_class(self.network_int)
+
+    @property
+    def broadcast_addr(self):
+        return self._address_class(self.broadcast_int)
+
+    @property
+    def mask_str(self) -> str:
+        return MASK_STRINGS[self.prefix]
+
+    @property
+    def first_host(self):
+        if self.prefix >= 31:
+            return None
+        return ipaddress.IPv4Address(self.network_int + 1)
+
+    @property
+    def last_host(self):
+        if self.prefix >= 31:
+            return None
+        return ipaddress.IPv4Address(self.broadcast_int - 1)
+
+    @property
+    def gateway(self):
+        return self._address_class(self.network_int + 1)
+
+    @property
+    def total_hosts(self) -> int:
+        return USABLE_HOSTS[self.prefix]
+
+    @property
+    def host_bits(self) -> int:
+        return self.max_prefixlen - self.prefix
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class DeviceSubnetRecord(SubnetRecord):
+    """VLSM-by-devices result entry (``calculate_subnets_by_devices``)."""
+
+    __slots__ = ("index", "devices")
+
+    _KEYS = (
+        "index",
+        "devices",
+        "subnet",
+        "network_addr",
+        "broadcast_addr",
+        "mask_str",
+        "prefix",
+        "first_host",
+        "last_host",
+        "total_hosts",
+        "wasted_hosts",
+        "host_bits",
+    )
+
+    def __init__(self, network_int: int, prefix: int, index: int, devices: int):
+        super().__init__(network_int, prefix)
+        self.index = index
+        self.devices = devices
+
+    @property
+    def wasted_hosts(self) -> int:
+        return max(self.total_hosts - self.devices, 0)
+
+
+class CPTSubnetRecord(SubnetRecord):
+    """Basic CPT topology entry (``generate_cpt_topology``)."""
+
+    __slots__ = ("id", "num_hosts", "router_id", "switch_id", "vlan_id")
+
+    _KEYS = (
+        "id",
+        "num_hosts",
+        "subnet",
+        "router_id",
+        "switch_id",
+        "vlan_id",
+        "gateway",
+        "mask_str",
+    )
+
+    def __init__(
+        self,
+        network_int: int,
+        prefix: int,
+        subnet_id: int,
+        num_hosts: int,
+        router_id: int,
+        switch_id: int,
+        vlan_id: int,
+    ):
+        super().__init__(network_int, prefix)
+        self.id = subnet_id
+        self.num_hosts = num_hosts
+        self.router_id = router_id
+        self.switch_id = switch_id
+        self.vlan_id = vlan_id
+
+
+class AdvancedCPTSubnetRecord(SubnetRecord):
+    """Advanced CPT topology entry (``generate_advanced_cpt``)."""
+
+    __slots__ = ("id", "routers", "switches", "hosts")
+
+    _KEYS = ("id", "subnet", "config", "is_main")
+
+    def __init__(self, network_int: int, prefix: int, subnet_id: int, routers: int, switches: int, hosts: int):
+        super().__init__(network_int, prefix)
+        self.id = subnet_id
+        self.routers = routers
+        self.switches = switches
+        self.hosts = hosts
+
+    @property
+    def config(self) -> dict:
+        return {"routers": self.routers, "switches": self.switches, "hosts": self.hosts}
+
+    @property
+    def is_main(self) -> bool:
+        return self.id == 0
+
+
+class _IPv6Fields:
+    """IPv6 overrides of the prefix-derived record fields (listed first in the bases).
+
+    IPv6 has no broadcast: ``broadcast_addr`` is the last address of the
+    subnet and only the subnet-router anycast address (the network address)
+    is kept out of the host range. ``mask_str`` is the prefix length
+    (``/64``), the form IPv6 configurations use.
+    """
+
+    __slots__ = ()
+
+    max_prefixlen = 128
+    _address_class = ipaddress.IPv6Address
+    _network_class = ipaddress.IPv6Network
+
+    @property
+    def num_addresses(self) -> int:
+        return 1 << (128 - self.prefix)
+
+    @property
+    def mask_str(self) -> str:
+        return f"/{self.prefix}"
+
+    @property
+    def first_host(self):
+        if self.prefix == 128:
+            return None
+        return ipaddress.IPv6Address(self.network_int + 1)
+
+    @property
+    def last_host(self):
+        if self.prefix == 128:
+            return None
+        return ipaddress.IPv6Address(self.broadcast_int)
+
+    @property
+    def total_hosts(self) -> int:
+        return self.num_addresses - 1
+
+
+class DeviceSubnetRecordV6(_IPv6Fields, DeviceSubnetRecord):
+    __slots__ = ()
+
+
+class CPTSubnetRecordV6(_IPv6Fields, CPTSubnetRecord):
+    __slots__ = ()
+
+
+class AdvancedCPTSubnetRecordV6(_IPv6Fields, AdvancedCPTSubnetRecord):
+    __slots__ = ()
+
+
+_IPV6_RECORDS = {
+    DeviceSubnetRecord: DeviceSubnetRecordV6,
+    CPTSubnetRecord: CPTSubnetRecordV6,
+    AdvancedCPTSubnetRecord: AdvancedCPTSubnetRecordV6,
+}
+
+
+def record_class_for(record_class, network):
+    """Return ``record_class`` or its IPv6 variant, matching ``network``'s version."""
+    return _IPV6_RECORDS[record_class] if network.version == 6 else record_class
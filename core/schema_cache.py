@@ -0,0 +1,194 @@
+"""Persistent, content-addressed cache for generated CPT schemas.
+
+The CPT generators are pure functions of their inputs, so a schema can be
+stored on disk under a hash of the normalized inputs plus the generator's
+``GENERATOR_VERSION`` and served again without recomputation, also across
+restarts. Bump ``GENERATOR_VERSION`` in a generator whenever its output
+changes so stale entries are never returned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from . import cpt_advanced_generator, cpt_generator
+from .ip_tools import network_bounds
+
+CACHE_DIR_ENV = "IP_CALCULATOR_CACHE_DIR"
+ENTRY_SUFFIX = ".txt"
+
+
+def default_cache_dir() -> Path:
+    """Directory used when none is given (``$IP_CALCULATOR_CACHE_DIR`` or ``~/.cache``)."""
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ip_calculator" / "schemas"
+
+
+class SchemaCache:
+    """On-disk LRU store of schema reports keyed by a SHA-256 of their inputs.
+
+    Each entry is one text file named after its key. Reads refresh the file
+    mtime, which is the recency used to evict the oldest entries once more
+    than ``max_entries`` are stored. Writes go to a temporary file that is
+    atomically renamed, so concurrent processes sharing the directory never
+    see a partial schema. Validation errors are returned but never cached.
+    """
+
+    def __init__(self, directory=None, max_entries: int = 512):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser mayor a 0")
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries = sum(1 for _ in self._entry_paths())
+
+    @staticmethod
+    def make_key(kind: str, version: int, inputs) -> str:
+        """Hash the normalized ``inputs`` of generator ``kind`` at ``version``."""
+        payload = json.dumps([kind, version, inputs], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached text for ``key`` or ``None``."""
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+
+    def put(self, key: str, text: str):
+        """Store ``text`` under ``key`` and evict the least recently used entries."""
+        path = self._path(key)
+        is_new = not path.exists()
+        descriptor, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as handle:
+                handle.write(text)
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+        if is_new:
+            self._entries += 1
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def generate_cpt_topology(self, base_network, num_subnets, num_routers, num_switches, devices_list, excluded=None):
+        """Cached ``cpt_generator.generate_cpt_topology``."""
+        inputs = {
+            "base_network": str(base_network),
+            "num_subnets": int(num_subnets),
+            "num_routers": int(num_routers),
+            "num_switches": int(num_switches),
+            "devices_list": [int(value) for value in devices_list],
+        }
+        if excluded:
+            inputs["excluded"] = _normalize_networks(excluded)
+        key = self.make_key("cpt", cpt_generator.GENERATOR_VERSION, inputs)
+        return self._get_or_generate(
+            key,
+            cpt_generator.generate_cpt_topology,
+            base_network,
+            num_subnets,
+            num_routers,
+            num_switches,
+            devices_list,
+            excluded,
+        )
+
+    def generate_advanced_cpt(self, base_network, subnet_configs, routing_type):
+        """Cached ``cpt_advanced_generator.generate_advanced_cpt``."""
+        try:
+            configs = [
+                {field: int(config.get(field, 0)) for field in ("routers", "switches", "hosts")}
+                for config in subnet_configs
+            ]
+        except (AttributeError, TypeError, ValueError):
+            return cpt_advanced_generator.generate_advanced_cpt(base_network, subnet_configs, routing_type)
+
+        inputs = {
+            "base_network": str(base_network),
+            "subnet_configs": configs,
+            "routing_type": cpt_advanced_generator.normalize_routing_type(routing_type),
+        }
+        key = self.make_key("cpt_advanced", cpt_advanced_generator.GENERATOR_VERSION, inputs)
+        return self._get_or_generate(
+            key, cpt_advanced_generator.generate_advanced_cpt, base_network, subnet_configs, routing_type
+        )
+
+    def clear(self):
+        """Delete every cached entry."""
+        for path in self._entry_paths():
+            path.unlink(missing_ok=True)
+        self._entries = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+        }
+
+    def _get_or_generate(self, key, generator, *args):
+        cached = self.get(key)
+        if cached is not None:
+            return cached, None
+
+        output, error = generator(*args)
+        if error is None:
+            self.put(key, output)
+        return output, error
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _entry_paths(self):
+        return self.directory.glob(f"*{ENTRY_SUFFIX}")
+
+    def _evict(self):
+        entries = []
+        for path in self._entry_paths():
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+
+        entries.sort()
+        excess = len(entries) - self.max_entries
+        for _, path in entries[: max(excess, 0)]:
+            path.unlink(missing_ok=True)
+            self.evictions += 1
+        self._entries = min(len(entries), self.max_entries)
+
+
+def _normalize_networks(networks):
+    """Sorted ``[max_prefixlen, network_int, prefix]`` triples for cache keys."""
+    triples = []
+    for network in networks:
+        network_int, prefix, max_prefixlen = network_bounds(network)
+        triples.append([max_prefixlen, network_int, prefix])
+    return sorted(triples)
@@ -0,0 +1,33 @@
+"""Helpers for generator-based (streaming) report output.
+
+Report generators in ``core`` yield *chunks*: pieces of text whose
+concatenation is exactly the string returned by the matching ``format_*`` /
+``generate_*`` function, so they can be written progressively
+(``stream.writelines(chunks)``) with constant memory.
+"""
+
+from __future__ import annotations
+
+
+def join_lines(lines):
+    """Yield ``lines`` as chunks equivalent to ``"\\n".join(lines)``."""
+    iterator = iter(lines)
+    for first in iterator:
+        yield first
+        for line in iterator:
+            yield "\n"
+            yield line
+
+
+def split_lines(chunks):
+    """Yield the lines of the text formed by ``chunks`` (like ``str.split("\\n")``)."""
+    pending = ""
+    for chunk in chunks:
+        if "\n" not in chunk:
+            pending += chunk
+            continue
+        parts = chunk.split("\n")
+        yield pending + parts[0]
+        yield from parts[1:-1]
+        pending = parts[-1]
+    yield pending
@@ -3,41 +3,135 @@
 from __future__ import annotations
 
 import ipaddress
-import math
-
-from .ip_tools import align_address_to_prefix, host_range, usable_hosts_for_prefix
-
-
-def calculate_subnets(network: ipaddress.IPv4Network, num_subnets: int):
-    """Split a network into ``num_subnets`` equal-size subnets."""
+from collections.abc import Sequence
+
+from . import tracing
+from .allocator import BuddyAllocator
+from .ip_tools import RESERVED_ADDRESSES, host_bits_for_devices, usable_hosts_for_prefix
+from .records import DeviceSubnetRecord, record_class_for
+from .streaming import join_lines
+
+
+class SubnetSequence(Sequence):
+    """Lazy, read-only sequence of equal-size subnets of a base network.
+
+    Items are computed arithmetically from the base network integer, so
+    indexing, slicing and iteration never enumerate the subnets that are not
+    requested. IPv6 splits can hold more subnets than ``len()`` can report
+    (``sys.maxsize``); :attr:`count` always works.
+    """
+
+    __slots__ = ("_base_int", "_new_prefix", "_block_size", "_network_class", "_indexes")
+
+    def __init__(self, network, new_prefix: int, count: int | None = None):
+        self._base_int = int(network.network_address)
+        self._new_prefix = new_prefix
+        self._block_size = 1 << (network.max_prefixlen - new_prefix)
+        self._network_class = type(network)
+        total = 1 << (new_prefix - network.prefixlen)
+        self._indexes = range(total if count is None else min(count, total))
+
+    @property
+    def prefix(self) -> int:
+        return self._new_prefix
+
+    @property
+    def count(self) -> int:
+        """Number of subnets, without the ``sys.maxsize`` limit of ``len()``."""
+        indexes = self._indexes
+        step = indexes.step
+        if step > 0:
+            return max(0, (indexes.stop - indexes.start + step - 1) // step)
+        return max(0, (indexes.start - indexes.stop - step - 1) // -step)
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __bool__(self):
+        return bool(self._indexes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = object.__new__(SubnetSequence)
+            view._base_int = self._base_int
+            view._new_prefix = self._new_prefix
+            view._block_size = self._block_size
+            view._network_class = self._network_class
+            view._indexes = self._indexes[index]
+            return view
+        return self._subnet_at(self._indexes[index])
+
+    def __contains__(self, subnet):
+        if not isinstance(subnet, self._network_class) or subnet.prefixlen != self._new_prefix:
+            return False
+        position, remainder = divmod(int(subnet.network_address) - self._base_int, self._block_size)
+        return remainder == 0 and position in self._indexes
+
+    def __iter__(self):
+        for position in self._indexes:
+            yield self._subnet_at(position)
+
+    def __repr__(self):
+        first = self[0] if self else None
+        return f"SubnetSequence(first={first}, prefix=/{self._new_prefix}, len={self.count})"
+
+    def _subnet_at(self, position: int):
+        return self._network_class((self._base_int + position * self._block_size, self._new_prefix))
+
+
+@tracing.traced("subnet_calc.calculate_subnets")
+def calculate_subnets(network: ipaddress.IPv4Network | ipaddress.IPv6Network, num_subnets: int):
+    """Split a network (IPv4 or IPv6) into ``num_subnets`` equal-size subnets.
+
+    The subnets are a lazy :class:`SubnetSequence`, so even a /32 -> /64
+    IPv6 split costs nothing until items are read.
+    """
     if num_subnets < 1:
         return None, "ERROR: El numero de subredes debe ser mayor a 0"
 
-    bits_needed = 0 if num_subnets == 1 else math.ceil(math.log2(num_subnets))
+    bits_needed = (num_subnets - 1).bit_length()
     new_prefix = network.prefixlen + bits_needed
+    max_prefixlen = network.max_prefixlen
 
-    if new_prefix > 32:
-        return None, f"ERROR: /{new_prefix} excede /32"
-
-    subnets = list(network.subnets(new_prefix=new_prefix))
+    if new_prefix > max_prefixlen:
+        return None, f"ERROR: /{new_prefix} excede /{max_prefixlen}"
 
     return {
         "bits_needed": bits_needed,
         "new_prefix": new_prefix,
-        "hosts_per_subnet": usable_hosts_for_prefix(new_prefix),
-        "subnets": subnets[:num_subnets],
+        "hosts_per_subnet": usable_hosts_for_prefix(new_prefix, max_prefixlen),
+        "subnets": SubnetSequence(network, new_prefix, num_subnets),
         "total_possible": 2 ** bits_needed,
     }, None
 
 
-def calculate_subnets_by_devices(base_network: ipaddress.IPv4Network, devices_list: list[int]):
-    """Allocate variable-size subnets based on requested devices."""
+@tracing.traced("subnet_calc.calculate_subnets_by_devices")
+def calculate_subnets_by_devices(
+    base_network: ipaddress.IPv4Network | ipaddress.IPv6Network,
+    devices_list: list[int],
+    allocator: BuddyAllocator | None = None,
+    excluded=None,
+):
+    """Allocate variable-size subnets based on requested devices.
+
+    Space is handed out by a :class:`BuddyAllocator` over ``base_network``.
+    Pass your own ``allocator`` to inspect ``allocator.stats()`` afterwards
+    or to plan into space that already has blocks taken. ``excluded``
+    networks (reserved or already used ranges) are never allocated. IPv6
+    base networks produce ``DeviceSubnetRecordV6`` entries.
+    """
     if not devices_list:
         return []
 
+    if allocator is None:
+        allocator = BuddyAllocator.for_network(base_network, excluded)
+    elif excluded:
+        allocator.exclude(excluded)
+
+    max_prefixlen = base_network.max_prefixlen
+    record_class = record_class_for(DeviceSubnetRecord, base_network)
     devices_sorted = sorted(devices_list, reverse=True)
     results = []
-    next_addr = base_network.network_address
 
     for idx, num_devices in enumerate(devices_sorted, start=1):
         if num_devices < 1:
@@ -50,9 +144,7 @@ def calculate_subnets_by_devices(base_network: ipaddress.IPv4Network, devices_li
             )
             continue
 
-        needed_addresses = num_devices + 2
-        host_bits = math.ceil(math.log2(needed_addresses))
-        prefix = 32 - host_bits
+        prefix = max_prefixlen - host_bits_for_devices(num_devices, max_prefixlen)
 
         if prefix < base_network.prefixlen:
             results.append(
@@ -64,21 +156,9 @@ def calculate_subnets_by_devices(base_network: ipaddress.IPv4Network, devices_li
             )
             continue
 
-        aligned_addr = align_address_to_prefix(next_addr, prefix)
-
-        try:
-            subnet = ipaddress.IPv4Network(f"{aligned_addr}/{prefix}", strict=True)
-        except ValueError as error:
-            results.append(
-                {
-                    "index": idx,
-                    "devices": num_devices,
-                    "error": f"No se pudo crear subred: {error}",
-                }
-            )
-            continue
+        network_int = allocator.allocate(prefix)
 
-        if not subnet.subnet_of(base_network):
+        if network_int is None:
             results.append(
                 {
                     "index": idx,
@@ -88,34 +168,16 @@ def calculate_subnets_by_devices(base_network: ipaddress.IPv4Network, devices_li
             )
             continue
 
-        first_host, last_host = host_range(subnet)
-        usable_hosts = usable_hosts_for_prefix(prefix)
-
-        results.append(
-            {
-                "index": idx,
-                "devices": num_devices,
-                "subnet": subnet,
-                "network_addr": subnet.network_address,
-                "broadcast_addr": subnet.broadcast_address,
-                "mask_str": str(subnet.netmask),
-                "prefix": prefix,
-                "first_host": first_host,
-                "last_host": last_host,
-                "total_hosts": usable_hosts,
-                "wasted_hosts": max(usable_hosts - num_devices, 0),
-                "host_bits": host_bits,
-            }
-        )
-
-        next_addr = ipaddress.IPv4Address(int(subnet.broadcast_address) + 1)
+        results.append(record_class(network_int, prefix, idx, num_devices))
 
+    if tracing.is_enabled():
+        tracing.count("vlsm.requests", len(devices_list))
+        tracing.count("vlsm.errors", sum(1 for result in results if "error" in result))
     return results
 
 
-def format_subnets_output(base_network, num_subnets, subnet_info):
-    """Format subnet split output."""
-    lines = [
+def _subnets_output_lines(base_network, num_subnets, subnet_info):
+    yield from [
         "CALCULO DE SUBREDES",
         "=" * 80,
         "",
@@ -132,16 +194,14 @@ def format_subnets_output(base_network, num_subnets, subnet_info):
     ]
 
     for index, subnet in enumerate(subnet_info["subnets"], start=1):
-        lines.append(
-            f"{index}. {subnet.network_address}/{subnet_info['new_prefix']} - {subnet.broadcast_address}"
-        )
+        yield f"{index}. {subnet.network_address}/{subnet_info['new_prefix']} - {subnet.broadcast_address}"
 
-    return "\n".join(lines)
 
+def _devices_output_lines(base_network, devices_list, results):
+    reserved = RESERVED_ADDRESSES[base_network.max_prefixlen]
+    last_label = "Broadcast:            " if base_network.version == 4 else "Ultima direccion:     "
 
-def format_devices_output(base_network, devices_list, results):
-    """Format VLSM-by-devices output."""
-    lines = [
+    yield from [
         "SUBREDES POR DISPOSITIVOS",
         "=" * 80,
         "",
@@ -152,38 +212,54 @@ def format_devices_output(base_network, devices_list, results):
     ]
 
     for result in results:
-        lines.extend(
-            [
-                f"SUBRED {result['index']}: {result['devices']} dispositivos",
-                "-" * 80,
-            ]
-        )
+        yield from [
+            f"SUBRED {result['index']}: {result['devices']} dispositivos",
+            "-" * 80,
+        ]
 
         if "error" in result:
-            lines.extend([f"ERROR: {result['error']}", ""])
+            yield from [f"ERROR: {result['error']}", ""]
             continue
 
-        lines.extend(
-            [
-                f"Direccion de red:     {result['network_addr']}/{result['prefix']}",
-                f"Mascara de red:       {result['mask_str']}",
-                f"Broadcast:            {result['broadcast_addr']}",
-                f"Hosts disponibles:    {result['total_hosts']}",
-                (
-                    "Primera IP host:      "
-                    f"{result['first_host'] if result['first_host'] is not None else 'No aplica'}"
-                ),
-                (
-                    "Ultima IP host:       "
-                    f"{result['last_host'] if result['last_host'] is not None else 'No aplica'}"
-                ),
-                f"Hosts desperdiciados: {result['wasted_hosts']}",
-                (
-                    f"Calculo: 2^{result['host_bits']} - 2 = "
-                    f"{(2 ** result['host_bits']) - 2} hosts"
-                ),
-                "",
-            ]
-        )
-
-    return "\n".join(lines)
+        yield from [
+            f"Direccion de red:     {result['network_addr']}/{result['prefix']}",
+            f"Mascara de red:       {result['mask_str']}",
+            f"{last_label}{result['broadcast_addr']}",
+            f"Hosts disponibles:    {result['total_hosts']}",
+            (
+                "Primera IP host:      "
+                f"{result['first_host'] if result['first_host'] is not None else 'No aplica'}"
+            ),
+            (
+                "Ultima IP host:       "
+                f"{result['last_host'] if result['last_host'] is not None else 'No aplica'}"
+            ),
+            f"Hosts desperdiciados: {result['wasted_hosts']}",
+            (
+                f"Calculo: 2^{result['host_bits']} - {reserved} = "
+                f"{(2 ** result['host_bits']) - reserved} hosts"
+            ),
+            "",
+        ]
+
+
+def iter_subnets_output(base_network, num_subnets, subnet_info):
+    """Yield the subnet split report as chunks (see ``core.streaming``)."""
+    return join_lines(_subnets_output_lines(base_network, num_subnets, subnet_info))
+
+
+@tracing.traced("subnet_calc.format_subnets_output")
+def format_subnets_output(base_network, num_subnets, subnet_info):
+    """Format subnet split output."""
+    return "\n".join(_subnets_output_lines(base_network, num_subnets, subnet_info))
+
+
+def iter_devices_output(base_network, devices_list, results):
+    """Yield the VLSM-by-devices report as chunks (see ``core.streaming``)."""
+    return join_lines(_devices_output_lines(base_network, devices_list, results))
+
+
+@tracing.traced("subnet_calc.format_devices_output")
+def format_devices_output(base_network, devices_list, results):
+    """Format VLSM-by-devices output."""
+    return "\n".join(_devices_output_lines(base_network, devices_list, results))
@@ -0,0 +1,95 @@
+"""Route summarization: collapse network lists into the fewest CIDR blocks.
+
+The reverse of subnetting. Every input is reduced to one integer that packs
+its start address and host bits, so the whole list sorts as plain ints; one
+linear pass then merges adjacent and overlapping ranges, and each merged
+range is cut back into aligned CIDR blocks. Output is produced lazily::
+
+    from core.summarize import collapse_networks
+
+    for network in collapse_networks(["10.0.0.0/24", "10.0.1.0/24", "10.0.1.128/25"]):
+        print(network)  # 10.0.0.0/23
+
+The result is the same as ``ipaddress.collapse_addresses``, except that
+IPv4 and IPv6 may be mixed (IPv4 blocks come first) and host bits in the
+inputs are ignored instead of rejected.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+
+from . import tracing
+from .ip_tools import network_bounds
+
+# Low bits of a packed entry hold its host bits (0..128).
+_HOST_BITS_WIDTH = 8
+_HOST_BITS_MASK = (1 << _HOST_BITS_WIDTH) - 1
+
+
+def merge_ranges(ranges):
+    """Yield the union of ``(start, end)`` ranges sorted by ``start`` as disjoint ranges.
+
+    Adjacent ranges (``end + 1 == start``) are merged as well.
+    """
+    iterator = iter(ranges)
+    for start, end in iterator:
+        for next_start, next_end in iterator:
+            if next_start > end + 1:
+                yield start, end
+                start, end = next_start, next_end
+            elif next_end > end:
+                end = next_end
+        yield start, end
+
+
+def range_to_blocks(start: int, end: int, max_prefixlen: int = 32):
+    """Yield the ``(network_int, prefix)`` CIDR blocks exactly covering ``start..end``."""
+    while start <= end:
+        host_bits = (end - start + 1).bit_length() - 1
+        if start:
+            host_bits = min(host_bits, (start & -start).bit_length() - 1)
+        yield start, max_prefixlen - host_bits
+        start += 1 << host_bits
+
+
+def collapse_blocks(blocks, max_prefixlen: int = 32):
+    """Yield the collapsed ``(network_int, prefix)`` blocks of one IP version.
+
+    ``blocks`` is any iterable of ``(network_int, prefix)`` pairs with
+    aligned network integers; this is the fast path for callers that
+    already work with integers.
+    """
+    packed = [
+        (network_int << _HOST_BITS_WIDTH) | (max_prefixlen - prefix) for network_int, prefix in blocks
+    ]
+    yield from _collapse_packed(packed, max_prefixlen)
+
+
+def collapse_networks(networks):
+    """Yield the fewest ``ipaddress`` networks covering all of ``networks``.
+
+    ``networks`` may contain strings, ``ipaddress`` networks or subnet
+    records, of either IP version. Raises ``ValueError`` on invalid input.
+    """
+    packed = {32: [], 128: []}
+    for network in networks:
+        network_int, prefix, max_prefixlen = network_bounds(network)
+        packed[max_prefixlen].append((network_int << _HOST_BITS_WIDTH) | (max_prefixlen - prefix))
+
+    for max_prefixlen, network_class in ((32, ipaddress.IPv4Network), (128, ipaddress.IPv6Network)):
+        for network_int, prefix in _collapse_packed(packed[max_prefixlen], max_prefixlen):
+            yield network_class((network_int, prefix))
+
+
+def _collapse_packed(packed, max_prefixlen):
+    with tracing.span("summarize.sort", inputs=len(packed)):
+        packed.sort()
+    tracing.count("summarize.inputs", len(packed))
+
+    ranges = (
+        (item >> _HOST_BITS_WIDTH, (item >> _HOST_BITS_WIDTH) + (1 << (item & _HOST_BITS_MASK)) - 1)
+        for item in packed
+    )
+    for start, end in merge_ranges(ranges):
+        yield from range_to_blocks(start, end, max_prefixlen)
@@ -0,0 +1,222 @@
+"""Lightweight tracing: timed spans and counters for profiling sessions.
+
+Tracing is off by default. While disabled, :func:`span` hands back a shared
+no-op context manager and :func:`count` returns immediately, so the hooks
+left in hot paths cost one flag check per call (never per item)::
+
+    from core import tracing
+
+    tracing.enable()
+    with tracing.span("vlsm", devices=120):
+        ...
+    tracing.count("subnets", 120)
+    tracing.export_chrome_trace("sesion.trace.json")  # chrome://tracing, Perfetto
+
+Setting ``IP_CALCULATOR_TRACE=/ruta/traza.json`` before launching the app
+(see :func:`enable_from_env`) records the whole session and writes the trace
+on exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+TRACE_ENV = "IP_CALCULATOR_TRACE"
+TRACE_FORMAT_ENV = "IP_CALCULATOR_TRACE_FORMAT"
+MAX_EVENTS = 1_000_000
+
+_enabled = False
+_lock = threading.Lock()
+_origin_ns = time.perf_counter_ns()
+_spans = []
+_counter_events = []
+_counters = {}
+_dropped = 0
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "_start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        _record(
+            _spans,
+            (self.name, self.category, self._start - _origin_ns, end - self._start, threading.get_ident(), self.args),
+        )
+        return False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Forget every recorded span and counter."""
+    global _dropped
+    with _lock:
+        _spans.clear()
+        _counter_events.clear()
+        _counters.clear()
+        _dropped = 0
+
+
+def span(name: str, category: str = "core", **args):
+    """Context manager timing the enclosed block (a no-op while disabled)."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name: str, category: str = "core"):
+    """Decorator wrapping every call of the function in a :func:`span`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, value: int = 1):
+    """Add ``value`` to counter ``name`` (a no-op while disabled)."""
+    if not _enabled:
+        return
+    with _lock:
+        total = _counters.get(name, 0) + value
+        _counters[name] = total
+    _record(_counter_events, (name, time.perf_counter_ns() - _origin_ns, total))
+
+
+def snapshot() -> dict:
+    """Return the recorded spans (times in microseconds) and counter totals."""
+    with _lock:
+        spans = list(_spans)
+        counters = dict(_counters)
+        dropped = _dropped
+    return {
+        "spans": [
+            {
+                "name": name,
+                "category": category,
+                "start_us": start / 1000,
+                "duration_us": duration / 1000,
+                "thread": thread,
+                "args": args,
+            }
+            for name, category, start, duration, thread, args in spans
+        ],
+        "counters": counters,
+        "dropped_events": dropped,
+    }
+
+
+def chrome_trace_events() -> list:
+    """Recorded data as Chrome trace-event dicts (complete and counter events)."""
+    pid = os.getpid()
+    with _lock:
+        spans = list(_spans)
+        counter_events = list(_counter_events)
+
+    events = [
+        {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": thread,
+            "args": args,
+        }
+        for name, category, start, duration, thread, args in spans
+    ]
+    events.extend(
+        {"name": name, "ph": "C", "ts": timestamp / 1000, "pid": pid, "args": {"value": total}}
+        for name, timestamp, total in counter_events
+    )
+    events.sort(key=lambda event: event["ts"])
+    return events
+
+
+def export_json(path):
+    """Write :func:`snapshot` to ``path``."""
+    _write_json(path, snapshot())
+
+
+def export_chrome_trace(path):
+    """Write a Chrome trace-event file (``chrome://tracing`` / Perfetto) to ``path``."""
+    _write_json(path, {"traceEvents": chrome_trace_events(), "displayTimeUnit": "ms"})
+
+
+def enable_from_env(environ=None) -> bool:
+    """Enable tracing if ``IP_CALCULATOR_TRACE`` names an output file.
+
+    The trace is written at interpreter exit, as a Chrome trace unless
+    ``IP_CALCULATOR_TRACE_FORMAT=json``. Returns whether tracing was enabled.
+    """
+    environ = os.environ if environ is None else environ
+    path = environ.get(TRACE_ENV)
+    if not path:
+        return False
+
+    exporter = export_json if environ.get(TRACE_FORMAT_ENV, "chrome").lower() == "json" else export_chrome_trace
+    enable()
+    atexit.register(exporter, path)
+    return True
+
+
+def _record(events, event):
+    global _dropped
+    with _lock:
+        if len(_spans) + len(_counter_events) >= MAX_EVENTS:
+            _dropped += 1
+            return
+        events.append(event)
+
+
+def _write_json(path, document):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, default=str)
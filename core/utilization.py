@@ -0,0 +1,124 @@
+"""Utilization and free-space report of a base network for a plan.
+
+The subnets of a plan are packed into integers (start address and host
+bits), sorted once and walked in a single linear pass; every gap between
+them is free space, cut into aligned CIDR blocks as it is found. Only the
+sorted integers are kept, so the report scales to plans of millions of
+subnets::
+
+    from core.utilization import analyze_utilization
+
+    plan = calculate_subnets_by_devices(base_network, devices)
+    report = analyze_utilization(base_network, plan)
+    report["utilization"], report["largest_free_block"], report["fragmentation"]
+
+``fragmentation`` uses the same definition as ``BuddyAllocator.stats``
+(``1 - largest_free / free``), so a plan produced by the allocator reports
+the same free space either way.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+
+from . import tracing
+from .ip_tools import network_bounds, usable_hosts_for_prefix
+from .summarize import range_to_blocks
+
+# Low bits of a packed entry hold its host bits (0..128).
+_HOST_BITS_WIDTH = 8
+_HOST_BITS_MASK = (1 << _HOST_BITS_WIDTH) - 1
+
+_NETWORK_CLASSES = {32: ipaddress.IPv4Network, 128: ipaddress.IPv6Network}
+
+
+@tracing.traced("utilization.analyze")
+def analyze_utilization(base_network, results) -> dict:
+    """Summarize how much of ``base_network`` the plan ``results`` consumes.
+
+    ``results`` may hold subnet records, ``ipaddress`` networks or strings;
+    error entries (dicts with ``"error"``) are counted in ``errors``. Space
+    outside the base network or of the other IP version is ignored, and
+    overlapping subnets are counted once in ``allocated_addresses`` (the
+    excess shows up in ``overlap_addresses``).
+    """
+    max_prefixlen = base_network.max_prefixlen
+    base_start = int(base_network.network_address)
+    base_end = int(base_network.broadcast_address)
+    base_host_bits = max_prefixlen - base_network.prefixlen
+
+    usable_hosts = [usable_hosts_for_prefix(prefix, max_prefixlen) for prefix in range(max_prefixlen + 1)]
+    packed = []
+    errors = 0
+    wasted_hosts = 0
+    for item in results:
+        try:
+            # Subnet records: read the integers directly (the common, fast case).
+            start, prefix, bits = item.network_int, item.prefix, item.max_prefixlen
+        except AttributeError:
+            if isinstance(item, dict) and "error" in item:
+                errors += 1
+                continue
+            start, prefix, bits = network_bounds(item)
+        if bits != max_prefixlen:
+            continue
+        devices = getattr(item, "devices", None)
+        if devices is not None:
+            wasted_hosts += max(usable_hosts[prefix] - devices, 0)
+        if base_start <= start <= base_end:
+            packed.append((start << _HOST_BITS_WIDTH) | min(max_prefixlen - prefix, base_host_bits))
+        elif prefix < base_network.prefixlen and start >> base_host_bits == base_start >> base_host_bits:
+            # CIDR blocks nest: one starting before the base only overlaps it by containing it.
+            packed.append((base_start << _HOST_BITS_WIDTH) | base_host_bits)
+
+    with tracing.span("utilization.sort", subnets=len(packed)):
+        packed.sort()
+
+    subnet_addresses = 0
+    free = 0
+    by_prefix = {}
+    largest = [None, max_prefixlen + 1]
+
+    def add_free(first, last):
+        for block_start, block_prefix in range_to_blocks(first, last, max_prefixlen):
+            by_prefix[block_prefix] = by_prefix.get(block_prefix, 0) + 1
+            if block_prefix < largest[1]:
+                largest[:] = block_start, block_prefix
+
+    # ``cursor`` is the first address not covered by the subnets seen so far.
+    cursor = base_start
+    for item in packed:
+        start = item >> _HOST_BITS_WIDTH
+        size = 1 << (item & _HOST_BITS_MASK)
+        subnet_addresses += size
+        if start > cursor:
+            free += start - cursor
+            add_free(cursor, start - 1)
+        if start + size > cursor:
+            cursor = start + size
+    if cursor <= base_end:
+        free += base_end - cursor + 1
+        add_free(cursor, base_end)
+
+    total = base_end - base_start + 1
+    allocated = total - free
+    largest_block = None
+    fragmentation = 0.0
+    if largest[0] is not None:
+        largest_block = _NETWORK_CLASSES[max_prefixlen]((largest[0], largest[1]))
+        fragmentation = 1 - (1 << (max_prefixlen - largest[1])) / free
+
+    return {
+        "total_addresses": total,
+        "allocated_addresses": allocated,
+        "free_addresses": free,
+        "overlap_addresses": subnet_addresses - allocated,
+        "utilization": allocated / total,
+        "subnets": len(packed),
+        "errors": errors,
+        "wasted_hosts": wasted_hosts,
+        "free_blocks": sum(by_prefix.values()),
+        "free_blocks_by_prefix": dict(sorted(by_prefix.items())),
+        "largest_free_block": largest_block,
+        "fragmentation": fragmentation,
+    }
@@ -0,0 +1,159 @@
+"""Incremental VLSM planning for interactive what-if editing."""
+
+from __future__ import annotations
+
+from .allocator import BuddyAllocator
+from .ip_tools import host_bits_for_devices
+from .records import DeviceSubnetRecord, record_class_for
+
+NO_SPACE_ERROR = "Excede la red base"
+
+
+class IncrementalVLSMPlanner:
+    """Keep a VLSM plan alive and update it when the device list changes.
+
+    Requirements are identified by their position in the devices list. On
+    :meth:`update` only the positions whose size class (prefix) changed, plus
+    added and removed positions, are released and re-allocated; every other
+    subnet keeps its address. If the changed requirements no longer fit the
+    free space, the whole plan is rebuilt exactly as
+    :func:`core.subnet_calc.calculate_subnets_by_devices` would, and the
+    displaced subnets show up as relocated in the diff. ``excluded`` networks
+    stay reserved across updates and rebuilds.
+
+    ``incremental`` is true while the plan carries addresses over from an
+    earlier devices list, i.e. it may differ from a plan computed from the
+    current list alone; it resets on the first update and on every rebuild.
+    """
+
+    def __init__(self, base_network, excluded=None):
+        self.base_network = base_network
+        self.excluded = list(excluded or ())
+        self.devices_list: list[int] = []
+        self.incremental = False
+        self._allocator = BuddyAllocator.for_network(base_network, self.excluded)
+        # Per position: (devices, prefix or None, network_int or None, error or None)
+        self._slots: list[tuple] = []
+
+    def update(self, devices_list: list[int]) -> dict:
+        """Apply a new devices list and return the diff against the previous plan."""
+        old_slots = self._slots
+        new_slots = []
+        pending = []
+
+        for position, num_devices in enumerate(devices_list):
+            old = old_slots[position] if position < len(old_slots) else None
+            if old is not None and old[0] == num_devices and old[3] != NO_SPACE_ERROR:
+                new_slots.append(old)
+                continue
+
+            prefix, error = self._prefix_for(num_devices)
+            if old is not None and old[1] == prefix and old[2] is not None:
+                new_slots.append((num_devices, prefix, old[2], None))
+                continue
+
+            if old is not None and old[2] is not None:
+                self._allocator.free(old[2], old[1])
+            if error:
+                new_slots.append((num_devices, None, None, error))
+            else:
+                new_slots.append(None)
+                pending.append(position)
+
+        for old in old_slots[len(devices_list):]:
+            if old[2] is not None:
+                self._allocator.free(old[2], old[1])
+
+        pending.sort(key=lambda position: (-devices_list[position], position))
+        full_replan = False
+        for position in pending:
+            num_devices = devices_list[position]
+            prefix, _ = self._prefix_for(num_devices)
+            network_int = self._allocator.allocate(prefix)
+            if network_int is None:
+                full_replan = True
+                break
+            new_slots[position] = (num_devices, prefix, network_int, None)
+
+        if full_replan:
+            new_slots = self._replan(devices_list)
+
+        diff = self._diff(old_slots, new_slots, full_replan)
+        if full_replan or not old_slots:
+            self.incremental = False
+        elif any(diff[key] for key in ("added", "removed", "resized", "relocated")):
+            self.incremental = True
+        self._slots = new_slots
+        self.devices_list = list(devices_list)
+        return diff
+
+    def results(self) -> list:
+        """Return the plan in the ``calculate_subnets_by_devices`` format."""
+        order = sorted(range(len(self._slots)), key=lambda position: (-self._slots[position][0], position))
+        record_class = record_class_for(DeviceSubnetRecord, self.base_network)
+        results = []
+        for index, position in enumerate(order, start=1):
+            num_devices, prefix, network_int, error = self._slots[position]
+            if network_int is None:
+                results.append({"index": index, "devices": num_devices, "error": error})
+            else:
+                results.append(record_class(network_int, prefix, index, num_devices))
+        return results
+
+    def stats(self) -> dict:
+        """Free-space statistics of the current plan (see ``BuddyAllocator.stats``)."""
+        return self._allocator.stats()
+
+    def _prefix_for(self, num_devices: int):
+        if num_devices < 1:
+            return None, "El numero de dispositivos debe ser mayor a 0"
+        max_prefixlen = self.base_network.max_prefixlen
+        prefix = max_prefixlen - host_bits_for_devices(num_devices, max_prefixlen)
+        if prefix < self.base_network.prefixlen:
+            return None, "Subred demasiado grande para la red base"
+        return prefix, None
+
+    def _replan(self, devices_list):
+        self._allocator = BuddyAllocator.for_network(self.base_network, self.excluded)
+        slots = [None] * len(devices_list)
+        order = sorted(range(len(devices_list)), key=lambda position: (-devices_list[position], position))
+        for position in order:
+            num_devices = devices_list[position]
+            prefix, error = self._prefix_for(num_devices)
+            network_int = None if error else self._allocator.allocate(prefix)
+            if network_int is None and error is None:
+                error = NO_SPACE_ERROR
+            slots[position] = (num_devices, prefix if network_int is not None else None, network_int, error)
+        return slots
+
+    def _diff(self, old_slots, new_slots, full_replan):
+        diff = {"added": [], "removed": [], "resized": [], "relocated": [], "full_replan": full_replan}
+        network_class = type(self.base_network)
+
+        def network_of(slot):
+            if slot is None or slot[2] is None:
+                return None
+            return network_class((slot[2], slot[1]))
+
+        for position in range(max(len(old_slots), len(new_slots))):
+            old = old_slots[position] if position < len(old_slots) else None
+            new = new_slots[position] if position < len(new_slots) else None
+            if old is new or old == new:
+                continue
+
+            entry = {
+                "position": position,
+                "devices": None if new is None else new[0],
+                "old": network_of(old),
+                "new": network_of(new),
+            }
+            if old is None:
+                diff["added"].append(entry)
+            elif new is None:
+                diff["removed"].append(entry)
+            elif old[1:3] == new[1:3]:
+                diff["resized"].append(entry)
+            else:
+                diff["relocated"].append(entry)
+
+        return diff
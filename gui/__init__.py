@@ -1,15 +1,26 @@
-"""GUI package exports."""
-
-from .main_window import MainWindow
-from .tab_cpt import CPTTab
-from .tab_cpt_advanced import CPTAdvancedTab
-from .tab_detailed import DetailedTab
-from .tab_practice import PracticeTab
-
-__all__ = [
-    "MainWindow",
-    "DetailedTab",
-    "PracticeTab",
-    "CPTTab",
-    "CPTAdvancedTab",
-]
+"""GUI package exports.
+
+Tab classes are imported on first access so the main window can start
+without importing every tab (and the core modules behind them).
+"""
+
+from __future__ import annotations
+
+import importlib
+
+_EXPORTS = {
+    "MainWindow": ".main_window",
+    "DetailedTab": ".tab_detailed",
+    "PracticeTab": ".tab_practice",
+    "CPTTab": ".tab_cpt",
+    "CPTAdvancedTab": ".tab_cpt_advanced",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
@@ -0,0 +1,93 @@
+"""Run core calculations off the Tk main thread."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+
+class BackgroundRunner:
+    """Thread-pool executor whose results are delivered back on the Tk thread.
+
+    Jobs are identified by a key (usually one per button). The worker thread
+    only runs the computation; completion is detected by polling with
+    ``after()`` so every callback, widget update and dialog happens on the
+    Tk main thread. Progress (elapsed time) is shown in ``status_var`` when
+    one is given.
+
+    Python threads cannot be interrupted, so cancelling a job that already
+    started lets it finish in the background and discards its result.
+    """
+
+    POLL_MS = 40
+    MAX_WORKERS = 4
+
+    def __init__(self, widget, status_var=None):
+        self.widget = widget
+        self.status_var = status_var
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="ipcalc")
+        self._jobs = {}
+
+    def is_running(self, key) -> bool:
+        return key in self._jobs
+
+    def submit(self, key, func, *args, on_success, on_error=None, description="Calculando"):
+        """Run ``func(*args)`` in the pool and call ``on_success(result)`` on the Tk thread.
+
+        A job already running under ``key`` is cancelled first.
+        """
+        self.cancel(key, announce=False)
+        job = {
+            "future": self._executor.submit(func, *args),
+            "on_success": on_success,
+            "on_error": on_error,
+            "description": description,
+            "started": time.perf_counter(),
+        }
+        self._jobs[key] = job
+        self._set_status(f"{description}...")
+        self.widget.after(self.POLL_MS, self._poll, key, job)
+
+    def cancel(self, key, announce=True) -> bool:
+        """Cancel the job running under ``key``; return ``True`` if there was one."""
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        job["future"].cancel()
+        if announce:
+            self._set_status(f"{job['description']}: cancelado")
+        return True
+
+    def shutdown(self):
+        """Drop pending jobs and stop accepting new ones."""
+        self._jobs.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self, key, job):
+        if self._jobs.get(key) is not job:
+            return
+
+        future = job["future"]
+        elapsed = time.perf_counter() - job["started"]
+        if not future.done():
+            self._set_status(f"{job['description']}... {elapsed:.1f} s")
+            self.widget.after(self.POLL_MS, self._poll, key, job)
+            return
+
+        del self._jobs[key]
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as error:
+            self._set_status(f"{job['description']}: error")
+            if job["on_error"] is not None:
+                job["on_error"](error)
+            return
+
+        self._set_status(f"{job['description']}: listo en {elapsed:.2f} s")
+        job["on_success"](result)
+
+    def _set_status(self, text):
+        if self.status_var is not None:
+            self.status_var.set(text)
@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
+import time
 import tkinter as tk
 from tkinter import ttk
 
+from core import tracing
+
+from .background import BackgroundRunner
 from .theme import apply_theme
 
 
 class MainWindow:
-    def __init__(self):
+    """Application window whose tabs can be built lazily on first selection.
+
+    ``started`` is the ``time.perf_counter()`` value the startup time is
+    measured from (window creation by default); ``startup_seconds`` is set
+    once the first tab has been built and the event loop goes idle.
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.startup_seconds = None
         self.root = tk.Tk()
         self.root.title("Calculadora de Red IP")
         self.root.geometry("1180x860")
@@ -18,7 +31,10 @@ class MainWindow:
         apply_theme(self.root)
 
         self._build_layout()
+        self.runner = BackgroundRunner(self.root, self.status_var)
         self.tabs = {}
+        self._pending_tabs = {}
+        self._on_startup = None
 
     def _build_layout(self):
         outer = ttk.Frame(self.root, style="App.TFrame", padding=12)
@@ -44,7 +60,9 @@ class MainWindow:
         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
 
     def _on_tab_change(self, _event):
-        current_tab = self.notebook.tab(self.notebook.select(), "text")
+        selected = self.notebook.select()
+        self._build_pending_tab(selected)
+        current_tab = self.notebook.tab(selected, "text")
         self.status_var.set(f"Pestana activa: {current_tab}")
 
     def add_tab(self, tab_instance, title):
@@ -52,6 +70,41 @@ class MainWindow:
         self.tabs[title] = tab_instance
         self.notebook.add(tab_instance.frame, text=title)
 
-    def run(self):
-        """Start the Tk event loop."""
-        self.root.mainloop()
+    def add_lazy_tab(self, title, factory):
+        """Register a tab that is built by ``factory(parent)`` when first selected."""
+        placeholder = ttk.Frame(self.notebook, style="App.TFrame")
+        self.notebook.add(placeholder, text=title)
+        self._pending_tabs[str(placeholder)] = (title, factory, placeholder)
+
+    def run(self, on_startup=None):
+        """Start the Tk event loop.
+
+        ``on_startup(seconds)`` is called once the window is up and the first
+        tab is built; it is where the startup time is reported.
+        """
+        self._on_startup = on_startup
+        self.root.after_idle(self._finish_startup)
+        try:
+            self.root.mainloop()
+        finally:
+            self.runner.shutdown()
+
+    def _build_pending_tab(self, tab_id):
+        pending = self._pending_tabs.pop(str(tab_id), None)
+        if pending is None:
+            return
+
+        title, factory, placeholder = pending
+        with tracing.span("gui.build_tab", "gui", title=title):
+            tab = factory(placeholder)
+            tab.frame.pack(fill=tk.BOTH, expand=True)
+        self.tabs[title] = tab
+
+    def _finish_startup(self):
+        if self.notebook.tabs():
+            self._build_pending_tab(self.notebook.select())
+        self.root.update_idletasks()
+        self.startup_seconds = time.perf_counter() - self.started
+        self.status_var.set(f"Listo (inicio en {self.startup_seconds:.2f} s)")
+        if self._on_startup is not None:
+            self._on_startup(self.startup_seconds)
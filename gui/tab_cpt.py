@@ -6,15 +6,17 @@ import tkinter as tk
 from tkinter import ttk
 
 from core import cpt_generator
-from utils import validators
+from core.streaming import split_lines
+from utils import dialogs, validators
 
-from .theme import configure_output_text
 from .ui_utils import copy_text_to_clipboard, set_text_output
+from .virtual_text import VirtualTextView
 
 
 class CPTTab:
-    def __init__(self, parent):
+    def __init__(self, parent, runner):
         self.frame = ttk.Frame(parent, style="App.TFrame", padding=16)
+        self.runner = runner
         self._create_widgets()
 
     def _create_widgets(self):
@@ -62,19 +64,8 @@ class CPTTab:
         output_frame = ttk.LabelFrame(self.frame, text="Resultado", padding=8)
         output_frame.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar = ttk.Scrollbar(output_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.text_output = tk.Text(
-            output_frame,
-            height=24,
-            wrap=tk.WORD,
-            font=("Cascadia Mono", 9),
-            yscrollcommand=scrollbar.set,
-        )
-        self.text_output.pack(fill=tk.BOTH, expand=True)
-        configure_output_text(self.text_output)
-        scrollbar.config(command=self.text_output.yview)
+        self.text_output = VirtualTextView(output_frame, height=24)
+        self.text_output.frame.pack(fill=tk.BOTH, expand=True)
 
         set_text_output(
             self.text_output,
@@ -96,55 +87,76 @@ class CPTTab:
     def _copy_output(self):
         copied = copy_text_to_clipboard(self.frame.winfo_toplevel(), self.text_output)
         if copied:
-            validators.show_info("Salida copiada al portapapeles.")
+            dialogs.show_info("Salida copiada al portapapeles.")
         else:
-            validators.show_warning("No hay contenido para copiar.")
+            dialogs.show_warning("No hay contenido para copiar.")
 
     def _clear_output(self):
         set_text_output(self.text_output, "")
 
     def _generate_schema(self):
+        if self.runner.cancel("cpt"):
+            return
+
         valid, network, error = validators.validate_ip_cidr(self.entry_ip.get().strip())
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         valid, num_subnets, error = validators.validate_positive_int(self.entry_subnets.get(), "Numero de subredes")
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         valid, num_routers, error = validators.validate_positive_int(self.entry_routers.get(), "Numero de routers")
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         valid, num_switches, error = validators.validate_positive_int(
             self.entry_switches.get(), "Numero de switches"
         )
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         valid, devices_list, error = validators.validate_device_list(self.entry_devices.get(), num_subnets)
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
-        try:
-            output, calc_error = cpt_generator.generate_cpt_topology(
-                network,
-                num_subnets,
-                num_routers,
-                num_switches,
-                devices_list,
+        self.runner.submit(
+            "cpt",
+            self._plan_schema,
+            network,
+            num_subnets,
+            num_routers,
+            num_switches,
+            devices_list,
+            on_success=self._show_schema,
+            on_error=lambda error: dialogs.show_error(f"Error al generar esquema: {error}"),
+            description="Generando esquema CPT",
+        )
+
+    @staticmethod
+    def _plan_schema(network, num_subnets, num_routers, num_switches, devices_list):
+        topology_data, calc_error = cpt_generator.plan_cpt_topology(
+            network, num_subnets, num_routers, num_switches, devices_list
+        )
+        if calc_error:
+            return None, calc_error
+
+        def source():
+            return split_lines(
+                cpt_generator.iter_cpt_topology(network, num_subnets, num_routers, num_switches, topology_data)
             )
-        except Exception as error:
-            validators.show_error(f"Error al generar esquema: {error}")
-            return
 
+        return source, None
+
+    def _show_schema(self, result):
+        source, calc_error = result
         if calc_error:
-            validators.show_error(calc_error)
+            dialogs.show_error(calc_error)
             return
 
-        set_text_output(self.text_output, output)
+        self.text_output.set_source(source)
@@ -6,15 +6,16 @@ import tkinter as tk
 from tkinter import ttk
 
 from core import cpt_advanced_generator
-from utils import validators
+from utils import dialogs, validators
 
 from .theme import configure_output_text
 from .ui_utils import copy_text_to_clipboard, set_text_output
 
 
 class CPTAdvancedTab:
-    def __init__(self, parent):
+    def __init__(self, parent, runner):
         self.frame = ttk.Frame(parent, style="App.TFrame", padding=16)
+        self.runner = runner
         self.subnet_frames = []
         self.subnet_entries = []
         self._create_widgets()
@@ -125,9 +126,9 @@ class CPTAdvancedTab:
     def _copy_output(self):
         copied = copy_text_to_clipboard(self.frame.winfo_toplevel(), self.text_output)
         if copied:
-            validators.show_info("Salida copiada al portapapeles.")
+            dialogs.show_info("Salida copiada al portapapeles.")
         else:
-            validators.show_warning("No hay contenido para copiar.")
+            dialogs.show_warning("No hay contenido para copiar.")
 
     def _clear_output(self):
         set_text_output(self.text_output, "")
@@ -143,11 +144,11 @@ class CPTAdvancedTab:
             self.entry_num_subnets.get(), "Numero de subredes"
         )
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         if num_subnets > 12:
-            validators.show_error("Para mantener legibilidad, usa un maximo de 12 subredes.")
+            dialogs.show_error("Para mantener legibilidad, usa un maximo de 12 subredes.")
             return
 
         for index in range(num_subnets):
@@ -183,46 +184,52 @@ class CPTAdvancedTab:
             )
 
     def _generate_schema(self):
+        if self.runner.cancel("cpt_advanced"):
+            return
+
         valid, network, error = validators.validate_ip_cidr(self.entry_base_ip.get().strip())
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         if not self.subnet_entries:
-            validators.show_error("Primero genera los campos de subredes.")
+            dialogs.show_error("Primero genera los campos de subredes.")
             return
 
         subnet_configs = []
         for index, entries in enumerate(self.subnet_entries):
             valid, routers, error = validators.validate_non_negative_int(entries["routers"].get(), "Routers")
             if not valid:
-                validators.show_error(f"Subred {index}: {error}")
+                dialogs.show_error(f"Subred {index}: {error}")
                 return
 
             valid, switches, error = validators.validate_non_negative_int(entries["switches"].get(), "Switches")
             if not valid:
-                validators.show_error(f"Subred {index}: {error}")
+                dialogs.show_error(f"Subred {index}: {error}")
                 return
 
             valid, hosts, error = validators.validate_non_negative_int(entries["hosts"].get(), "Hosts")
             if not valid:
-                validators.show_error(f"Subred {index}: {error}")
+                dialogs.show_error(f"Subred {index}: {error}")
                 return
 
             subnet_configs.append({"routers": routers, "switches": switches, "hosts": hosts})
 
-        try:
-            output, calc_error = cpt_advanced_generator.generate_advanced_cpt(
-                network,
-                subnet_configs,
-                self.routing_var.get(),
-            )
-        except Exception as error:
-            validators.show_error(f"Error al generar esquema avanzado: {error}")
-            return
+        self.runner.submit(
+            "cpt_advanced",
+            cpt_advanced_generator.generate_advanced_cpt,
+            network,
+            subnet_configs,
+            self.routing_var.get(),
+            on_success=self._show_schema,
+            on_error=lambda error: dialogs.show_error(f"Error al generar esquema avanzado: {error}"),
+            description="Generando esquema CPT avanzado",
+        )
 
+    def _show_schema(self, result):
+        output, calc_error = result
         if calc_error:
-            validators.show_error(calc_error)
+            dialogs.show_error(calc_error)
             return
 
         set_text_output(self.text_output, output)
@@ -2,19 +2,31 @@
 
 from __future__ import annotations
 
+import itertools
 import tkinter as tk
 from tkinter import ttk
 
-from core import network_calc, subnet_calc
-from utils import validators
+from core import memo, network_calc, subnet_calc
+from core.streaming import split_lines
+from core.vlsm_planner import IncrementalVLSMPlanner
+from utils import dialogs, validators
 
-from .theme import configure_output_text
 from .ui_utils import copy_text_to_clipboard, set_text_output
+from .virtual_text import VirtualTextView
+
+INCREMENTAL_NOTE = (
+    "NOTA: distribucion incremental. Se conservan las direcciones del calculo anterior,",
+    "por lo que puede diferir de un calculo solo con estos datos. Usa 'Recalcular desde cero'",
+    "para obtener la distribucion VLSM estandar.",
+    "",
+)
 
 
 class DetailedTab:
-    def __init__(self, parent):
+    def __init__(self, parent, runner):
         self.frame = ttk.Frame(parent, style="App.TFrame", padding=16)
+        self.runner = runner
+        self.vlsm_planner = None
         self._create_widgets()
 
     def _create_widgets(self):
@@ -61,6 +73,13 @@ class DetailedTab:
             style="Secondary.TButton",
         ).grid(row=2, column=2, padx=(6, 0), pady=(10, 0))
 
+        ttk.Button(
+            input_frame,
+            text="Recalcular desde cero",
+            command=self._recalculate_devices,
+            style="Secondary.TButton",
+        ).grid(row=2, column=3, padx=(6, 0), pady=(10, 0))
+
         input_frame.columnconfigure(1, weight=1)
 
         actions = ttk.Frame(self.frame, style="App.TFrame")
@@ -76,19 +95,8 @@ class DetailedTab:
         output_frame = ttk.LabelFrame(self.frame, text="Resultado", padding=8)
         output_frame.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar = ttk.Scrollbar(output_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.text_output = tk.Text(
-            output_frame,
-            height=28,
-            wrap=tk.WORD,
-            font=("Cascadia Mono", 9),
-            yscrollcommand=scrollbar.set,
-        )
-        self.text_output.pack(fill=tk.BOTH, expand=True)
-        configure_output_text(self.text_output)
-        scrollbar.config(command=self.text_output.yview)
+        self.text_output = VirtualTextView(output_frame, height=28)
+        self.text_output.frame.pack(fill=tk.BOTH, expand=True)
 
         set_text_output(
             self.text_output,
@@ -97,16 +105,18 @@ class DetailedTab:
                 "1) Ingresa una red base en formato IP/CIDR.\n"
                 "2) Usa 'Calcular detallado' para ver mascara, red, broadcast y hosts.\n"
                 "3) Usa 'Dividir en subredes' para subnetting fijo.\n"
-                "4) Usa 'VLSM por dispositivos' para reparto optimizado por hosts."
+                "4) Usa 'VLSM por dispositivos' para reparto optimizado por hosts.\n"
+                "   Al editar la lista se conservan las subredes previas; 'Recalcular desde cero'\n"
+                "   descarta el calculo anterior."
             ),
         )
 
     def _copy_output(self):
         copied = copy_text_to_clipboard(self.frame.winfo_toplevel(), self.text_output)
         if copied:
-            validators.show_info("Salida copiada al portapapeles.")
+            dialogs.show_info("Salida copiada al portapapeles.")
         else:
-            validators.show_warning("No hay contenido para copiar.")
+            dialogs.show_warning("No hay contenido para copiar.")
 
     def _clear_output(self):
         set_text_output(self.text_output, "")
@@ -115,70 +125,109 @@ class DetailedTab:
         ip_input = self.entry_ip.get().strip()
         valid, _, error = validators.validate_ip_cidr(ip_input)
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         try:
-            details = network_calc.calculate_network_details(ip_input)
+            details = memo.calculate_network_details(ip_input)
             output = network_calc.format_detailed_output(details)
         except Exception as error:
-            validators.show_error(f"Error al calcular detalles: {error}")
+            dialogs.show_error(f"Error al calcular detalles: {error}")
             return
 
         set_text_output(self.text_output, output)
 
+    def _show_output(self, source):
+        self.text_output.set_source(source)
+
     def _calculate_subnets(self):
+        if self.runner.cancel("subnets"):
+            return
+
         ip_input = self.entry_ip.get().strip()
         valid, network, error = validators.validate_ip_cidr(ip_input)
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         valid, num_subnets, error = validators.validate_positive_int(
             self.entry_subnets.get(), "Numero de subredes"
         )
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
-        try:
-            subnet_info, calc_error = subnet_calc.calculate_subnets(network, num_subnets)
-            if calc_error:
-                set_text_output(self.text_output, calc_error)
-                return
-            output = subnet_calc.format_subnets_output(network, num_subnets, subnet_info)
-        except Exception as error:
-            validators.show_error(f"Error al calcular subredes: {error}")
-            return
+        self.runner.submit(
+            "subnets",
+            self._compute_subnets,
+            network,
+            num_subnets,
+            on_success=self._show_output,
+            on_error=lambda error: dialogs.show_error(f"Error al calcular subredes: {error}"),
+            description="Dividiendo en subredes",
+        )
 
-        set_text_output(self.text_output, output)
+    @staticmethod
+    def _compute_subnets(network, num_subnets):
+        subnet_info, calc_error = memo.calculate_subnets(network, num_subnets)
+        if calc_error:
+            return lambda: [calc_error]
+        return lambda: split_lines(subnet_calc.iter_subnets_output(network, num_subnets, subnet_info))
 
     def _calculate_devices(self):
+        if self.runner.cancel("devices"):
+            # The cancelled worker may still be mutating the planner.
+            self.vlsm_planner = None
+            return
+
         ip_input = self.entry_ip.get().strip()
         valid, network, error = validators.validate_ip_cidr(ip_input)
         if not valid:
-            validators.show_error(error)
+            dialogs.show_error(error)
             return
 
         try:
             devices_list = validators.parse_int_list(self.entry_devices.get())
         except ValueError:
-            validators.show_error("La lista de dispositivos debe contener solo enteros.")
+            dialogs.show_error("La lista de dispositivos debe contener solo enteros.")
             return
 
         if not devices_list:
-            validators.show_error("Debes ingresar al menos un valor de dispositivos.")
+            dialogs.show_error("Debes ingresar al menos un valor de dispositivos.")
             return
 
         if any(value < 1 for value in devices_list):
-            validators.show_error("Todos los dispositivos deben ser mayores a 0.")
+            dialogs.show_error("Todos los dispositivos deben ser mayores a 0.")
             return
 
-        try:
-            results = subnet_calc.calculate_subnets_by_devices(network, devices_list)
-            output = subnet_calc.format_devices_output(network, devices_list, results)
-        except Exception as error:
-            validators.show_error(f"Error al calcular VLSM: {error}")
-            return
+        if self.vlsm_planner is None or self.vlsm_planner.base_network != network:
+            self.vlsm_planner = IncrementalVLSMPlanner(network)
+
+        self.runner.submit(
+            "devices",
+            self._compute_devices,
+            self.vlsm_planner,
+            network,
+            devices_list,
+            on_success=self._show_output,
+            on_error=self._on_devices_error,
+            description="Calculando VLSM",
+        )
 
-        set_text_output(self.text_output, output)
+    def _recalculate_devices(self):
+        self.runner.cancel("devices")
+        self.vlsm_planner = None
+        self._calculate_devices()
+
+    @staticmethod
+    def _compute_devices(planner, network, devices_list):
+        planner.update(devices_list)
+        results = planner.results()
+        note = INCREMENTAL_NOTE if planner.incremental else ()
+        return lambda: itertools.chain(
+            note, split_lines(subnet_calc.iter_devices_output(network, devices_list, results))
+        )
+
+    def _on_devices_error(self, error):
+        self.vlsm_planner = None
+        dialogs.show_error(f"Error al calcular VLSM: {error}")
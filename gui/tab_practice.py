@@ -8,7 +8,7 @@ import random
 import tkinter as tk
 from tkinter import ttk
 
-from utils import validators
+from utils import dialogs
 
 from .theme import configure_output_text
 from .ui_utils import clear_entries, copy_text_to_clipboard, set_text_output
@@ -139,9 +139,9 @@ class PracticeTab:
     def _copy_feedback(self):
         copied = copy_text_to_clipboard(self.frame.winfo_toplevel(), self.feedback_text)
         if copied:
-            validators.show_info("Retroalimentacion copiada al portapapeles.")
+            dialogs.show_info("Retroalimentacion copiada al portapapeles.")
         else:
-            validators.show_warning("No hay texto para copiar.")
+            dialogs.show_warning("No hay texto para copiar.")
 
     def _set_entries_color(self, entries, color):
         for entry in entries:
@@ -214,7 +214,7 @@ class PracticeTab:
 
     def _verify_basic(self):
         if self.state["mode"] != "basic":
-            validators.show_warning("Primero inicia un ejercicio basico.")
+            dialogs.show_warning("Primero inicia un ejercicio basico.")
             return
 
         network = self.state["network"]
@@ -250,7 +250,7 @@ class PracticeTab:
 
     def _verify_subnets(self):
         if self.state["mode"] != "subnets":
-            validators.show_warning("Primero inicia un ejercicio de subredes.")
+            dialogs.show_warning("Primero inicia un ejercicio de subredes.")
             return
 
         num_subnets = self.state["num_subnets"]
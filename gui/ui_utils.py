@@ -4,13 +4,22 @@ from __future__ import annotations
 
 import tkinter as tk
 
+from core import tracing
 
-def set_text_output(text_widget: tk.Text, content: str):
+from .virtual_text import VirtualTextView
+
+
+def set_text_output(text_widget: tk.Text | VirtualTextView, content: str):
     """Replace text widget content and reset the scroll position."""
-    text_widget.configure(state=tk.NORMAL)
-    text_widget.delete("1.0", tk.END)
-    text_widget.insert("1.0", content)
-    text_widget.see("1.0")
+    with tracing.span("gui.set_text_output", "gui", chars=len(content)):
+        if isinstance(text_widget, VirtualTextView):
+            text_widget.set_text(content)
+            return
+
+        text_widget.configure(state=tk.NORMAL)
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert("1.0", content)
+        text_widget.see("1.0")
 
 
 def clear_entries(entries):
@@ -19,8 +28,11 @@ def clear_entries(entries):
         entry.delete(0, tk.END)
 
 
-def copy_text_to_clipboard(root: tk.Tk, text_widget: tk.Text):
+def copy_text_to_clipboard(root: tk.Tk, text_widget: tk.Text | VirtualTextView):
     """Copy current text widget content to clipboard."""
+    if isinstance(text_widget, VirtualTextView):
+        return text_widget.copy_all(root)
+
     content = text_widget.get("1.0", tk.END).strip()
     if not content:
         return False
@@ -0,0 +1,236 @@
+"""Virtualized read-only text view for very large reports."""
+
+from __future__ import annotations
+
+import itertools
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+
+from core import tracing
+
+from .theme import configure_output_text
+
+
+class VirtualTextView:
+    """Show a lazily generated report while only materializing visible lines.
+
+    The report comes from a *source*: a callable returning a fresh iterable
+    of lines. Only a bounded window of ``WINDOW_LINES`` lines around the
+    visible rows is kept; scrolling past it reads on from the source, and
+    scrolling back before it regenerates the source and skips ahead. The
+    total line count is found during idle time by a separate pass that only
+    counts. The inner ``tk.Text`` holds just the rows that fit on screen, so
+    neither Tk nor Python ever holds the whole report. Search and copy-all
+    iterate the source instead of reading the widget.
+    """
+
+    CHUNK_LINES = 5000
+    WINDOW_LINES = 2000
+    SEARCH_TAG = "search_match"
+
+    def __init__(self, parent, height=24, font=("Cascadia Mono", 9)):
+        self.frame = ttk.Frame(parent, style="App.TFrame")
+
+        search_row = ttk.Frame(self.frame, style="App.TFrame")
+        search_row.pack(fill=tk.X, pady=(0, 6))
+        ttk.Label(search_row, text="Buscar:").pack(side=tk.LEFT)
+        self.entry_search = ttk.Entry(search_row, width=30)
+        self.entry_search.pack(side=tk.LEFT, padx=(6, 6))
+        self.entry_search.bind("<Return>", lambda _event: self.search_next())
+        ttk.Button(search_row, text="Siguiente", command=self.search_next, style="Secondary.TButton").pack(
+            side=tk.LEFT
+        )
+        self.search_status = ttk.Label(search_row, text="", style="Subtitle.TLabel")
+        self.search_status.pack(side=tk.LEFT, padx=(8, 0))
+
+        body = ttk.Frame(self.frame, style="App.TFrame")
+        body.pack(fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text = tk.Text(body, height=height, wrap=tk.NONE, font=font)
+        self.text.pack(fill=tk.BOTH, expand=True)
+        configure_output_text(self.text)
+        self.text.tag_configure(self.SEARCH_TAG, background="#FFE08A")
+        self.text.configure(state=tk.DISABLED)
+
+        self._line_height = max(tkfont.Font(font=self.text.cget("font")).metrics("linespace"), 1)
+        self._rows = height
+        self._top = 0
+        self._source = None
+        self._window_start = 0
+        self._window = []
+        self._cursor = None
+        self._cursor_pos = 0
+        self._counter = None
+        self._counted = 0
+        self._total = 0
+        self._fill_job = None
+        self._last_match = -1
+
+        self.text.bind("<Configure>", self._on_resize)
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda _event: self.scroll(-3))
+        self.text.bind("<Button-5>", lambda _event: self.scroll(3))
+        for key, delta in (("<Up>", -1), ("<Down>", 1)):
+            self.text.bind(key, lambda _event, delta=delta: self.scroll(delta))
+        self.text.bind("<Prior>", lambda _event: self.scroll(-self._rows))
+        self.text.bind("<Next>", lambda _event: self.scroll(self._rows))
+        self.text.bind("<Home>", lambda _event: self.scroll_to(0))
+        self.text.bind("<End>", lambda _event: self.scroll_to(self.line_count))
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines known so far (final once the counting pass finishes)."""
+        if self._total is not None:
+            return self._total
+        return max(self._counted, self._window_start + len(self._window))
+
+    def set_source(self, source):
+        """Display the report produced by ``source()`` (an iterable of lines)."""
+        if self._fill_job is not None:
+            self.text.after_cancel(self._fill_job)
+            self._fill_job = None
+
+        self._source = source
+        self._window_start = 0
+        self._window = []
+        self._cursor = None
+        self._cursor_pos = 0
+        self._counter = iter(source())
+        self._counted = 0
+        self._total = None
+        self._top = 0
+        self._last_match = -1
+        self.search_status.configure(text="")
+        self._render()
+        self._schedule_fill()
+
+    def set_text(self, content: str):
+        """Display a plain string (convenience wrapper over :meth:`set_source`)."""
+        self.set_source(lambda: iter(content.splitlines()))
+
+    def scroll(self, delta: int):
+        self.scroll_to(self._top + delta)
+        return "break"
+
+    def scroll_to(self, line: int):
+        line = max(0, line)
+        self._load_window(line, self._rows)
+        self._top = max(0, min(line, self.line_count - self._rows))
+        self._render()
+        return "break"
+
+    def search_next(self):
+        """Scroll to the next line containing the search text."""
+        needle = self.entry_search.get()
+        if not needle or self._source is None:
+            return
+
+        start = self._last_match + 1
+        for index, line in enumerate(itertools.islice(self._source(), start, None), start):
+            if needle in line:
+                self._last_match = index
+                self.search_status.configure(text=f"Linea {index + 1}")
+                self.scroll_to(index)
+                return
+
+        self.search_status.configure(text="Sin mas coincidencias" if start else "Sin coincidencias")
+        self._last_match = -1
+
+    def copy_all(self, root) -> bool:
+        """Copy the whole report to the clipboard, streaming it from the source in chunks."""
+        if self._source is None:
+            return False
+
+        root.clipboard_clear()
+        lines = iter(self._source())
+        copied = False
+        while True:
+            batch = list(itertools.islice(lines, self.CHUNK_LINES))
+            if not batch:
+                break
+            chunk = "\n".join(batch)
+            root.clipboard_append(f"\n{chunk}" if copied else chunk)
+            copied = True
+        root.update_idletasks()
+        return copied
+
+    def _load_window(self, start: int, count: int):
+        """Make sure the window holds lines ``start .. start + count - 1`` (or up to the end)."""
+        window_end = self._window_start + len(self._window)
+        if self._window_start <= start and (start + count <= window_end or window_end == self._total):
+            return
+
+        new_start = max(0, start - self.WINDOW_LINES // 4)
+        if self._cursor is None or new_start < self._cursor_pos:
+            self._cursor = iter(self._source())
+            self._cursor_pos = 0
+        self._cursor_pos += sum(1 for _ in itertools.islice(self._cursor, new_start - self._cursor_pos))
+
+        size = max(self.WINDOW_LINES, start - new_start + count)
+        self._window = list(itertools.islice(self._cursor, size))
+        self._window_start = self._cursor_pos
+        self._cursor_pos += len(self._window)
+        if len(self._window) < size:
+            # The source ended inside this window: the total is known now.
+            self._total = self._cursor_pos
+            self._cursor = None
+            self._counter = None
+
+    def _schedule_fill(self):
+        if self._total is None:
+            self._fill_job = self.text.after_idle(self._fill_step)
+
+    def _fill_step(self):
+        self._fill_job = None
+        if self._total is None:
+            counted = sum(1 for _ in itertools.islice(self._counter, self.CHUNK_LINES))
+            self._counted += counted
+            if counted < self.CHUNK_LINES:
+                self._total = self._counted
+                self._counter = None
+        self._update_scrollbar()
+        self._schedule_fill()
+
+    def _render(self):
+        self._load_window(self._top, self._rows)
+        offset = self._top - self._window_start
+        visible = self._window[offset : offset + self._rows]
+        with tracing.span("gui.virtual_text.render", "gui", rows=len(visible)):
+            self.text.configure(state=tk.NORMAL)
+            self.text.delete("1.0", tk.END)
+            self.text.insert("1.0", "\n".join(visible))
+
+        needle = self.entry_search.get()
+        if needle and self._top <= self._last_match < self._top + len(visible):
+            row = self._last_match - self._top + 1
+            column = visible[row - 1].find(needle)
+            if column >= 0:
+                self.text.tag_add(self.SEARCH_TAG, f"{row}.{column}", f"{row}.{column + len(needle)}")
+
+        self.text.configure(state=tk.DISABLED)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = max(self.line_count, 1)
+        first = self._top / total
+        self.scrollbar.set(first, min(1.0, (self._top + self._rows) / total))
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * self.line_count))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll(amount * (self._rows if unit == "pages" else 1))
+
+    def _on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self._line_height)
+        if rows != self._rows:
+            self._rows = rows
+            self.scroll_to(self._top)
@@ -10,9 +10,9 @@ if errorlevel 1 (
   exit /b 1
 )
 
-if not exist "..\dist\ip-calculator.exe" (
-  echo No se encontro dist\ip-calculator.exe
-  echo Genera primero el ejecutable con build_exe.bat
+if not exist "..\dist\ip-calculator\ip-calculator.exe" (
+  echo No se encontro dist\ip-calculator\ip-calculator.exe
+  echo Genera primero el ejecutable con build_exe.bat onedir o build_exe.bat lite
   pause
   exit /b 1
 )
@@ -0,0 +1,41 @@
+import unittest
+
+from benchmarks import suite
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_case_names_match_the_suite(self):
+        self.assertEqual(tuple(suite._build_cases()), suite.CASE_NAMES)
+
+    def test_measure_reports_throughput_and_peak_memory(self):
+        result = suite.measure(lambda: bytearray(64 * 1024), min_time=0.01)
+
+        self.assertGreater(result["ops_per_sec"], 0)
+        self.assertGreaterEqual(result["peak_bytes"], 64 * 1024)
+
+    def test_compare_flags_only_regressions_beyond_threshold(self):
+        baseline = {
+            "results": {
+                "fast": {"ops_per_sec": 1000.0, "peak_bytes": 1000},
+                "lean": {"ops_per_sec": 1000.0, "peak_bytes": 1000},
+                "stable": {"ops_per_sec": 1000.0, "peak_bytes": 1000},
+            }
+        }
+        current = {
+            "results": {
+                "fast": {"ops_per_sec": 700.0, "peak_bytes": 1000},
+                "lean": {"ops_per_sec": 1000.0, "peak_bytes": 1300},
+                "stable": {"ops_per_sec": 800.0, "peak_bytes": 1200},
+                "new_case": {"ops_per_sec": 1.0, "peak_bytes": 10**9},
+            }
+        }
+
+        regressions = suite.compare(current, baseline, threshold=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("fast: ops/s -30%"))
+        self.assertTrue(regressions[1].startswith("lean: memoria pico +30%"))
+
+
+if __name__ == "__main__":
+    unittest.main()
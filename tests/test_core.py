@@ -1,7 +1,41 @@
+import importlib.util
+import io
 import ipaddress
+import itertools
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
-from core import cpt_advanced_generator, cpt_generator, network_calc, subnet_calc
+from core import (
+    cli,
+    cpt_advanced_generator,
+    cpt_generator,
+    export,
+    memo,
+    network_calc,
+    parallel_plan,
+    subnet_calc,
+    summarize,
+    tracing,
+)
+from core.allocator import BuddyAllocator
+from core.conflicts import check_plan, find_conflicts, free_blocks
+from core.ip_tools import host_bits_for_devices
+from core.plan_index import PlanIndex
+from core.prefix_tables import PREFIX_TABLE
+from core.schema_cache import SchemaCache
+from core.streaming import split_lines
+from core.utilization import analyze_utilization
+from core.vlsm_planner import IncrementalVLSMPlanner
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 
 class CoreCalculationsTests(unittest.TestCase):
@@ -21,6 +55,45 @@ class CoreCalculationsTests(unittest.TestCase):
         self.assertIsNone(details["first_host"])
         self.assertIsNone(details["last_host"])
 
+    def test_prefix_table_matches_ipaddress(self):
+        for prefix, info in enumerate(PREFIX_TABLE):
+            network = ipaddress.IPv4Network(f"0.0.0.0/{prefix}")
+            self.assertEqual(info.mask_int, int(network.netmask))
+            self.assertEqual(info.wildcard_int, int(network.hostmask))
+            self.assertEqual(info.mask_str, str(network.netmask))
+            self.assertEqual(info.num_addresses, network.num_addresses)
+            self.assertEqual(info.usable_hosts, max(network.num_addresses - 2, 0) if prefix < 31 else 0)
+
+    def test_network_details_batch_matches_scalar_api(self):
+        inputs = ["192.168.10.99/24", "10.0.0.1/31", "172.16.5.4/12", "8.8.8.8/32"]
+        columns = network_calc.calculate_network_details_batch(inputs, use_numpy=False)
+
+        for row, ip_input in enumerate(inputs):
+            details = network_calc.calculate_network_details(ip_input)
+            network = details["network_obj"]
+            self.assertEqual(columns["network"][row], int(network.network_address))
+            self.assertEqual(columns["broadcast"][row], int(network.broadcast_address))
+            self.assertEqual(columns["mask"][row], int(network.netmask))
+            self.assertEqual(columns["wildcard"][row], int(network.hostmask))
+            self.assertEqual(columns["total_hosts"][row], details["total_hosts"])
+            self.assertEqual(columns["first_host"][row], int(details["first_host"] or 0))
+
+    def test_network_details_batch_numpy_matches_array_fallback(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy no disponible")
+
+        addresses = numpy.array([0xC0A80A63, 0x0A000001, 0xFFFFFFFF], dtype=numpy.uint32)
+        prefixes = numpy.array([24, 31, 0], dtype=numpy.uint8)
+        vectorized = network_calc.calculate_network_details_batch(addresses, prefixes)
+        fallback = network_calc.calculate_network_details_batch(
+            addresses.tolist(), prefixes.tolist(), use_numpy=False
+        )
+
+        for name in network_calc.BATCH_COLUMNS:
+            self.assertEqual([int(value) for value in vectorized[name]], list(fallback[name]))
+
     def test_calculate_subnets(self):
         base_network = ipaddress.IPv4Network("10.0.0.0/24")
         subnet_info, error = subnet_calc.calculate_subnets(base_network, 4)
@@ -31,6 +104,21 @@ class CoreCalculationsTests(unittest.TestCase):
         self.assertEqual(subnet_info["hosts_per_subnet"], 62)
         self.assertEqual(len(subnet_info["subnets"]), 4)
 
+    def test_calculate_subnets_is_lazy_for_large_splits(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/8")
+        subnet_info, error = subnet_calc.calculate_subnets(base_network, 2**20)
+
+        self.assertIsNone(error)
+        subnets = subnet_info["subnets"]
+        self.assertEqual(len(subnets), 2**20)
+        self.assertEqual(subnets[0], ipaddress.IPv4Network("10.0.0.0/28"))
+        self.assertEqual(subnets[-1], ipaddress.IPv4Network("10.255.255.240/28"))
+        self.assertEqual(
+            list(subnets[1:3]),
+            list(itertools.islice(base_network.subnets(new_prefix=28), 1, 3)),
+        )
+        self.assertIn(ipaddress.IPv4Network("10.1.2.48/28"), subnets)
+
     def test_subnets_by_devices(self):
         base_network = ipaddress.IPv4Network("192.168.1.0/24")
         result = subnet_calc.calculate_subnets_by_devices(base_network, [50, 20, 10])
@@ -39,6 +127,419 @@ class CoreCalculationsTests(unittest.TestCase):
         self.assertNotIn("error", result[0])
         self.assertEqual(result[0]["prefix"], 26)
 
+    def test_subnets_by_devices_records_expose_legacy_keys(self):
+        base_network = ipaddress.IPv4Network("192.168.1.0/24")
+        record = subnet_calc.calculate_subnets_by_devices(base_network, [50])[0]
+
+        self.assertEqual(record["subnet"], ipaddress.IPv4Network("192.168.1.0/26"))
+        self.assertEqual(record["broadcast_addr"], ipaddress.IPv4Address("192.168.1.63"))
+        self.assertEqual(record["mask_str"], "255.255.255.192")
+        self.assertEqual(record["first_host"], ipaddress.IPv4Address("192.168.1.1"))
+        self.assertEqual(record["wasted_hosts"], 12)
+        self.assertEqual(record["host_bits"], 6)
+        self.assertEqual(set(dict(record)), set(record.keys()))
+        self.assertFalse(hasattr(record, "__dict__"))
+
+
+class ParallelPlanTests(unittest.TestCase):
+    def test_sharded_plan_matches_serial_plan(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/22")
+        devices = [0, 5000, 60, 60, 1, 2, 200, 30, 14, 6, -1, 120] * 5
+        expected = [dict(result) for result in subnet_calc.calculate_subnets_by_devices(base_network, devices)]
+
+        for shard_size in (1, 7, None):
+            results = parallel_plan.calculate_subnets_by_devices_parallel(
+                base_network, devices, workers=1, shard_size=shard_size
+            )
+            self.assertEqual([dict(result) for result in results], expected)
+
+        with mock.patch.object(parallel_plan, "MIN_PARALLEL_REQUESTS", 0):
+            results = parallel_plan.calculate_subnets_by_devices_parallel(base_network, devices, workers=2)
+        self.assertEqual([dict(result) for result in results], expected)
+
+
+class IPv6Tests(unittest.TestCase):
+    def test_network_details_v6(self):
+        details = network_calc.calculate_network_details_v6("2001:db8:abcd:12::5/48")
+
+        self.assertEqual(details["network_addr"], "2001:db8:abcd::")
+        self.assertEqual(details["last_addr"], "2001:db8:abcd:ffff:ffff:ffff:ffff:ffff")
+        self.assertEqual(details["mask_str"], "ffff:ffff:ffff::")
+        self.assertEqual(details["total_addresses"], 2**80)
+        self.assertEqual(details["lan_subnets"], 65536)
+        self.assertEqual(str(details["first_host"]), "2001:db8:abcd::1")
+        self.assertIn("Subredes /64: 65536", network_calc.format_detailed_output(details))
+
+    def test_huge_split_is_lazy(self):
+        network = ipaddress.IPv6Network("2001:db8::/32")
+        subnet_info, error = subnet_calc.calculate_subnets(network, 2**32)
+
+        self.assertIsNone(error)
+        self.assertEqual(subnet_info["new_prefix"], 64)
+        subnets = subnet_info["subnets"]
+        self.assertEqual(len(subnets), 2**32)
+        self.assertEqual(subnets[-1], ipaddress.IPv6Network("2001:db8:ffff:ffff::/64"))
+        self.assertIn(ipaddress.IPv6Network("2001:db8:1234:5678::/64"), subnets)
+
+        subnet_info, _ = subnet_calc.calculate_subnets(network, 2**90)
+        self.assertEqual(subnet_info["subnets"].count, 2**90)
+        self.assertEqual(subnet_info["subnets"][2**89], ipaddress.IPv6Network("2001:db8:8000::/122"))
+        self.assertEqual(subnet_calc.calculate_subnets(network, 2**97)[1], "ERROR: /129 excede /128")
+
+    def test_devices_plan_v6_matches_parallel_and_incremental_planners(self):
+        base_network = ipaddress.IPv6Network("2001:db8::/112")
+        devices = [5000, 100, 1, 2, 3, 0, 70000] * 3
+        results = subnet_calc.calculate_subnets_by_devices(base_network, devices)
+
+        self.assertEqual(results[0]["error"], "Subred demasiado grande para la red base")
+        self.assertEqual(results[3]["prefix"], 115)
+        self.assertEqual(results[3]["total_hosts"], 8191)
+        self.assertEqual(str(results[3]["subnet"]), "2001:db8::/115")
+        expected = [dict(result) for result in results]
+
+        parallel = parallel_plan.calculate_subnets_by_devices_parallel(base_network, devices, workers=1, shard_size=4)
+        self.assertEqual([dict(result) for result in parallel], expected)
+        planner = IncrementalVLSMPlanner(base_network)
+        planner.update(devices)
+        self.assertEqual([dict(result) for result in planner.results()], expected)
+
+    def test_ipv4_sizing_is_unchanged(self):
+        for devices in range(1, 5000):
+            expected = 32 - math.ceil(math.log2(devices + 2))
+            self.assertEqual(32 - host_bits_for_devices(devices), expected)
+
+    def test_cpt_generators_use_64_subnets_and_ipv6_routing(self):
+        base_network = ipaddress.IPv6Network("2001:db8:10::/48")
+        topology, error = cpt_generator.plan_cpt_topology(base_network, 2, 1, 1, [20, 10])
+        self.assertIsNone(error)
+        self.assertEqual([str(subnet["subnet"]) for subnet in topology], ["2001:db8:10::/64", "2001:db8:10:1::/64"])
+        text, error = cpt_generator.generate_cpt_topology(base_network, 2, 1, 1, [20, 10])
+        self.assertIn("IP: 2001:db8:10::2 | Mask: /64 | Gateway: 2001:db8:10::1", text)
+        self.assertIn("ipv6 unicast-routing", text)
+
+        configs = [{"routers": 1, "switches": 1, "hosts": 5}, {"routers": 1, "switches": 1, "hosts": 3}]
+        text, error = cpt_advanced_generator.generate_advanced_cpt(base_network, configs, "rip")
+        self.assertIsNone(error)
+        self.assertIn("Red:               2001:db8:10:1::/64", text)
+        self.assertIn("ipv6 router rip RIPNG", text)
+        self.assertNotIn("version 2", text)
+
+
+class PlanIndexTests(unittest.TestCase):
+    def test_lookups_match_brute_force_over_a_plan(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/22")
+        plan = subnet_calc.calculate_subnets_by_devices(base_network, [100, 60, 0, 30, 12, 5000, 2])
+        index = PlanIndex.from_plan(plan)
+        subnets = [result for result in plan if "error" not in result]
+
+        addresses = range(int(base_network.network_address) - 2, int(base_network.broadcast_address) + 3)
+        expected = [
+            next((result for result in subnets if ipaddress.IPv4Address(address) in result["subnet"]), None)
+            for address in addresses
+        ]
+
+        self.assertEqual([index.lookup(address) for address in addresses], expected)
+        self.assertEqual(index.lookup_many(addresses, use_numpy=False), expected)
+        if importlib.util.find_spec("numpy") is not None:
+            self.assertEqual(index.lookup_many(addresses, use_numpy=True), expected)
+
+    def test_most_specific_network_wins(self):
+        index = PlanIndex(
+            [
+                ("10.0.0.0/8", "red"),
+                ("10.1.2.0/24", "vlan-a"),
+                ("10.1.0.0/16", "sede"),
+                ("10.1.2.0/24", "vlan-b"),
+            ]
+        )
+
+        self.assertEqual(index.lookup("10.0.0.1"), "red")
+        self.assertEqual(index.lookup("10.1.0.1"), "sede")
+        self.assertEqual(index.lookup("10.1.2.3"), "vlan-b")
+        self.assertEqual(index.lookup("10.1.3.0"), "sede")
+        self.assertEqual(index.lookup("10.255.255.255"), "red")
+        self.assertIsNone(index.lookup("11.0.0.0"))
+        self.assertEqual(index.lookup_network(ipaddress.IPv4Address("10.1.2.3")), ipaddress.IPv4Network("10.1.2.0/24"))
+        self.assertEqual(index.lookup_many(["10.1.2.3", "9.255.255.255"]), ["vlan-b", None])
+
+    def test_mixed_ip_versions_are_rejected(self):
+        with self.assertRaises(ValueError):
+            PlanIndex([("10.0.0.0/8", 1), ("2001:db8::/32", 2)])
+
+
+class ConflictDetectionTests(unittest.TestCase):
+    def test_conflicts_match_brute_force(self):
+        rng = random.Random(9)
+
+        def random_network():
+            prefix = rng.randint(22, 30)
+            host_bits = 32 - prefix
+            return ipaddress.IPv4Network(((rng.randrange(0x0A000000, 0x0A002000) >> host_bits) << host_bits, prefix))
+
+        for _ in range(30):
+            proposed = [random_network() for _ in range(rng.randint(0, 25))]
+            existing = [random_network() for _ in range(rng.randint(0, 25))]
+
+            found = sorted(
+                (proposed.index(conflict.proposed), existing.index(conflict.existing), conflict.first, conflict.last)
+                for conflict in find_conflicts(proposed, existing)
+            )
+            expected = sorted(
+                (
+                    proposed.index(mine),
+                    existing.index(theirs),
+                    max(mine.network_address, theirs.network_address),
+                    min(mine.broadcast_address, theirs.broadcast_address),
+                )
+                for mine in proposed
+                for theirs in existing
+                if mine.overlaps(theirs)
+            )
+            self.assertEqual(found, expected)
+
+    def test_check_plan_reports_conflicts_and_free_blocks(self):
+        base_network = ipaddress.IPv4Network("192.168.1.0/24")
+        plan = subnet_calc.calculate_subnets_by_devices(base_network, [60, 30, 0])
+        existing = ["192.168.1.68/30", "10.0.0.0/8", "2001:db8::/32", "192.168.1.160/27"]
+
+        report = check_plan(plan, existing, base_network)
+
+        self.assertFalse(report["ok"])
+        self.assertEqual(len(report["conflicts"]), 1)
+        conflict = report["conflicts"][0]
+        self.assertEqual(str(conflict.proposed["subnet"]), "192.168.1.64/27")
+        self.assertEqual(conflict.existing, "192.168.1.68/30")
+        self.assertEqual((str(conflict.first), str(conflict.last)), ("192.168.1.68", "192.168.1.71"))
+        self.assertEqual(
+            [str(block) for block in report["free_blocks"]],
+            ["192.168.1.96/27", "192.168.1.128/27", "192.168.1.192/26"],
+        )
+        self.assertTrue(check_plan(plan, ["192.168.1.128/25"])["ok"])
+
+    def test_free_blocks_of_an_empty_inventory_is_the_base(self):
+        base_network = ipaddress.IPv6Network("2001:db8::/48")
+        self.assertEqual(list(free_blocks(base_network, [])), [base_network])
+
+
+class UtilizationTests(unittest.TestCase):
+    def test_report_for_devices_plan(self):
+        base_network = ipaddress.IPv4Network("192.168.1.0/24")
+        plan = subnet_calc.calculate_subnets_by_devices(base_network, [50, 20, 500, 0])
+
+        report = analyze_utilization(base_network, plan)
+
+        self.assertEqual(report["allocated_addresses"], 96)
+        self.assertEqual(report["free_addresses"], 160)
+        self.assertEqual(report["utilization"], 96 / 256)
+        self.assertEqual(report["subnets"], 2)
+        self.assertEqual(report["errors"], 2)
+        self.assertEqual(report["wasted_hosts"], sum(result["wasted_hosts"] for result in plan if "error" not in result))
+        self.assertEqual(report["free_blocks_by_prefix"], {25: 1, 27: 1})
+        self.assertEqual(report["largest_free_block"], ipaddress.IPv4Network("192.168.1.128/25"))
+        self.assertAlmostEqual(report["fragmentation"], 1 - 128 / 160)
+
+    def test_matches_allocator_stats(self):
+        rng = random.Random(24)
+        base_network = ipaddress.IPv4Network("10.0.0.0/16")
+        for _ in range(20):
+            allocator = BuddyAllocator.for_network(base_network)
+            devices = [rng.randint(1, 3000) for _ in range(rng.randint(1, 60))]
+            plan = subnet_calc.calculate_subnets_by_devices(base_network, devices, allocator=allocator)
+
+            report = analyze_utilization(base_network, plan)
+            stats = allocator.stats()
+            for key in ("allocated_addresses", "free_addresses", "free_blocks_by_prefix", "largest_free_block"):
+                self.assertEqual(report[key], stats[key])
+            self.assertAlmostEqual(report["fragmentation"], stats["fragmentation"])
+
+    def test_overlaps_foreign_items_and_ipv6(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/24")
+        items = ["10.0.0.0/25", "10.0.0.64/26", "10.0.1.0/24", "2001:db8::/64"]
+
+        report = analyze_utilization(base_network, items)
+        self.assertEqual(report["allocated_addresses"], 128)
+        self.assertEqual(report["overlap_addresses"], 64)
+        self.assertEqual(analyze_utilization(base_network, ["10.0.0.0/8"])["free_addresses"], 0)
+
+        v6_network = ipaddress.IPv6Network("2001:db8::/48")
+        plan = subnet_calc.calculate_subnets_by_devices(v6_network, [2**16 - 1])
+        report = analyze_utilization(v6_network, plan)
+        self.assertEqual(report["allocated_addresses"], 2**16)
+        self.assertEqual(report["largest_free_block"], ipaddress.IPv6Network("2001:db8:0:8000::/49"))
+
+
+class SummarizeTests(unittest.TestCase):
+    def test_collapse_matches_ipaddress_collapse_addresses(self):
+        rng = random.Random(5)
+        for _ in range(50):
+            networks = []
+            for _ in range(rng.randint(0, 80)):
+                prefix = rng.randint(20, 32)
+                host_bits = 32 - prefix
+                start = (rng.randrange(0x0A000000, 0x0A001000) >> host_bits) << host_bits
+                networks.append(ipaddress.IPv4Network((start, prefix)))
+
+            self.assertEqual(
+                list(summarize.collapse_networks(networks)), list(ipaddress.collapse_addresses(networks))
+            )
+
+    def test_adjacent_overlapping_and_mixed_versions(self):
+        collapsed = summarize.collapse_networks(
+            ["10.0.1.0/24", "10.0.0.0/24", "10.0.1.128/25", "10.0.2.7/24", "2001:db8:8000::/33", "2001:db8::/33"]
+        )
+
+        self.assertEqual(
+            [str(network) for network in collapsed], ["10.0.0.0/23", "10.0.2.0/24", "2001:db8::/32"]
+        )
+
+    def test_ranges_are_cut_into_aligned_blocks(self):
+        self.assertEqual(list(summarize.merge_ranges([(0, 4), (5, 9), (11, 12), (12, 20)])), [(0, 9), (11, 20)])
+        self.assertEqual(list(summarize.range_to_blocks(1, 6)), [(1, 32), (2, 31), (4, 31), (6, 32)])
+        self.assertEqual(list(summarize.collapse_blocks([(0, 1), (1 << 31, 1)])), [(0, 0)])
+
+
+class BuddyAllocatorTests(unittest.TestCase):
+    def test_allocate_fills_holes_and_free_coalesces(self):
+        allocator = BuddyAllocator.for_network(ipaddress.IPv4Network("10.0.0.0/24"))
+
+        small = allocator.allocate(28)
+        large = allocator.allocate(25)
+        hole_filler = allocator.allocate(28)
+
+        self.assertEqual(small, int(ipaddress.IPv4Address("10.0.0.0")))
+        self.assertEqual(large, int(ipaddress.IPv4Address("10.0.0.128")))
+        self.assertEqual(hole_filler, int(ipaddress.IPv4Address("10.0.0.16")))
+
+        for start, prefix in ((small, 28), (large, 25), (hole_filler, 28)):
+            allocator.free(start, prefix)
+        self.assertEqual(list(allocator.free_blocks()), [(int(ipaddress.IPv4Address("10.0.0.0")), 24)])
+
+    def test_stats_report_fragmentation(self):
+        base_network = ipaddress.IPv4Network("192.168.1.0/24")
+        allocator = BuddyAllocator.for_network(base_network)
+        subnet_calc.calculate_subnets_by_devices(base_network, [50, 20], allocator=allocator)
+
+        stats = allocator.stats()
+        self.assertEqual(stats["allocated_addresses"], 96)
+        self.assertEqual(stats["free_addresses"], 160)
+        self.assertEqual(stats["largest_free_block"], ipaddress.IPv4Network("192.168.1.128/25"))
+        self.assertAlmostEqual(stats["fragmentation"], 1 - 128 / 160)
+
+    def test_full_base_network_reports_error(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/30")
+        results = subnet_calc.calculate_subnets_by_devices(base_network, [2, 1])
+
+        self.assertEqual(results[1]["error"], "Excede la red base")
+
+    def test_exclude_reserves_space_and_splits_free_blocks(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/24")
+        allocator = BuddyAllocator.for_network(base_network, ["10.0.0.64/27", "10.0.0.96/27", "10.0.0.200/30"])
+
+        stats = allocator.stats()
+        self.assertEqual(stats["reserved_addresses"], 68)
+        self.assertEqual(stats["free_addresses"], 188)
+        self.assertEqual(stats["allocated_addresses"], 0)
+        free = [ipaddress.IPv4Network(block) for block in allocator.free_blocks()]
+        self.assertEqual(
+            sorted(free),
+            sorted(free_blocks(base_network, ["10.0.0.64/26", "10.0.0.200/30"])),
+        )
+
+    def test_reserve_over_allocated_space_only_takes_free_parts(self):
+        allocator = BuddyAllocator.for_network(ipaddress.IPv4Network("10.0.0.0/24"))
+        allocated = allocator.allocate(28)
+
+        reserved = allocator.exclude([ipaddress.IPv4Network("10.0.0.0/25"), "2001:db8::/64", "10.0.1.0/24"])
+
+        self.assertEqual(allocated, int(ipaddress.IPv4Address("10.0.0.0")))
+        self.assertEqual(reserved, 112)
+        self.assertEqual(allocator.stats()["allocated_addresses"], 16)
+        self.assertEqual(allocator.allocate(25), int(ipaddress.IPv4Address("10.0.0.128")))
+        self.assertIsNone(allocator.allocate(30))
+
+    def test_plans_skip_excluded_ranges(self):
+        base_network = ipaddress.IPv4Network("192.168.1.0/24")
+        excluded = ["192.168.1.0/26", "192.168.1.130/32"]
+
+        results = subnet_calc.calculate_subnets_by_devices(base_network, [60, 30, 12], excluded=excluded)
+        self.assertEqual(
+            [f"{result['network_addr']}/{result['prefix']}" for result in results],
+            ["192.168.1.64/26", "192.168.1.160/27", "192.168.1.144/28"],
+        )
+        self.assertTrue(check_plan(results, excluded)["ok"])
+
+        topology, error = cpt_generator.plan_cpt_topology(base_network, 2, 1, 1, [50, 20], excluded)
+        self.assertIsNone(error)
+        self.assertEqual([str(record["subnet"]) for record in topology], ["192.168.1.64/26", "192.168.1.160/27"])
+        _, error = cpt_generator.plan_cpt_topology(base_network, 1, 1, 1, [100], ["192.168.1.200/29"])
+        self.assertIsNone(error)
+        _, error = cpt_generator.plan_cpt_topology(base_network, 1, 1, 1, [100], excluded)
+        self.assertIn("No hay espacio suficiente", error)
+
+    def test_random_exclusions_never_overlap_the_plan(self):
+        rng = random.Random(23)
+        base_network = ipaddress.IPv4Network("10.0.0.0/16")
+        excluded = [
+            ipaddress.IPv4Network((int(base_network.network_address) + rng.randrange(1 << 16), rng.randint(24, 32)), strict=False)
+            for _ in range(300)
+        ]
+        devices = [rng.randint(1, 200) for _ in range(200)]
+
+        results = subnet_calc.calculate_subnets_by_devices(base_network, devices, excluded=excluded)
+
+        self.assertTrue(check_plan(results, excluded)["ok"])
+        self.assertGreater(sum(1 for result in results if "error" not in result), 100)
+
+
+class IncrementalVLSMPlannerTests(unittest.TestCase):
+    def test_first_plan_matches_full_calculation(self):
+        base_network = ipaddress.IPv4Network("192.168.1.0/24")
+        planner = IncrementalVLSMPlanner(base_network)
+        diff = planner.update([60, 30, 12])
+
+        self.assertEqual(len(diff["added"]), 3)
+        expected = subnet_calc.calculate_subnets_by_devices(base_network, [60, 30, 12])
+        self.assertEqual([dict(result) for result in planner.results()], [dict(result) for result in expected])
+
+    def test_only_changed_size_class_is_relocated(self):
+        planner = IncrementalVLSMPlanner(ipaddress.IPv4Network("192.168.1.0/24"))
+        planner.update([60, 30, 12])
+
+        diff = planner.update([60, 31, 12])
+        self.assertEqual([entry["position"] for entry in diff["relocated"]], [1])
+        self.assertEqual(diff["relocated"][0]["old"], ipaddress.IPv4Network("192.168.1.64/27"))
+        self.assertFalse(diff["full_replan"])
+
+        diff = planner.update([60, 31, 13])
+        self.assertEqual([entry["position"] for entry in diff["resized"]], [2])
+        self.assertEqual(diff["relocated"], [])
+
+    def test_falls_back_to_full_replan_when_space_runs_out(self):
+        planner = IncrementalVLSMPlanner(ipaddress.IPv4Network("192.168.1.0/24"))
+        planner.update([100, 60, 12])
+
+        diff = planner.update([100, 100, 12])
+        self.assertTrue(diff["full_replan"])
+        results = planner.results()
+        self.assertEqual(
+            [str(result["subnet"]) for result in results[:2]],
+            ["192.168.1.0/25", "192.168.1.128/25"],
+        )
+        self.assertEqual(results[2]["error"], "Excede la red base")
+
+    def test_incremental_flag_tracks_carried_over_layout(self):
+        planner = IncrementalVLSMPlanner(ipaddress.IPv4Network("192.168.1.0/24"))
+        planner.update([60, 30, 12])
+        self.assertFalse(planner.incremental)
+
+        planner.update([60, 31, 12])
+        self.assertTrue(planner.incremental)
+        planner.update([60, 31, 12])
+        self.assertTrue(planner.incremental)
+
+        planner.update([100, 100, 12])
+        self.assertFalse(planner.incremental)
+
 
 class CPTGeneratorTests(unittest.TestCase):
     def test_basic_cpt_generation(self):
@@ -86,5 +587,323 @@ class CPTGeneratorTests(unittest.TestCase):
         self.assertIn("CONFIGURACION DETALLADA POR SUBRED", output)
 
 
+class StreamingOutputTests(unittest.TestCase):
+    def test_report_chunks_match_formatted_strings(self):
+        network = ipaddress.IPv4Network("192.168.1.0/24")
+        details = network_calc.calculate_network_details("10.0.0.1/31")
+        subnet_info, _ = subnet_calc.calculate_subnets(network, 4)
+        results = subnet_calc.calculate_subnets_by_devices(network, [50, 20, 300])
+
+        self.assertEqual(
+            "".join(network_calc.iter_detailed_output(details)),
+            network_calc.format_detailed_output(details),
+        )
+        self.assertEqual(
+            "".join(subnet_calc.iter_subnets_output(network, 4, subnet_info)),
+            subnet_calc.format_subnets_output(network, 4, subnet_info),
+        )
+        self.assertEqual(
+            "".join(subnet_calc.iter_devices_output(network, [50, 20, 300], results)),
+            subnet_calc.format_devices_output(network, [50, 20, 300], results),
+        )
+
+    def test_cpt_streams_match_generated_reports(self):
+        network = ipaddress.IPv4Network("172.16.0.0/24")
+        for num_routers in (1, 3):
+            output, _ = cpt_generator.generate_cpt_topology(network, 3, num_routers, 2, [40, 20, 10])
+            chunks, error = cpt_generator.stream_cpt_topology(network, 3, num_routers, 2, [40, 20, 10])
+            self.assertIsNone(error)
+            self.assertEqual("".join(chunks), output)
+
+        subnet_configs = [{"routers": 2, "switches": 2, "hosts": 40}, {"routers": 0, "switches": 1, "hosts": 3}]
+        for routing in ("estatico", "rip", "OSPF"):
+            output, _ = cpt_advanced_generator.generate_advanced_cpt(network, subnet_configs, routing)
+            chunks, error = cpt_advanced_generator.stream_advanced_cpt(network, subnet_configs, routing)
+            self.assertIsNone(error)
+            self.assertEqual("".join(chunks), output)
+
+        chunks, error = cpt_generator.stream_cpt_topology(network, 1, 1, 0, [10])
+        self.assertIsNone(chunks)
+        self.assertIn("switches", error.lower())
+
+    def test_split_lines_matches_str_split(self):
+        for chunks in (["a\nb", "c", "\n", "\nd\n"], [""], [], ["x"]):
+            self.assertEqual(list(split_lines(chunks)), "".join(chunks).split("\n"))
+
+
+class ExportTests(unittest.TestCase):
+    def test_vlsm_plan_round_trips_through_every_format(self):
+        base_network = ipaddress.IPv4Network("10.0.0.0/16")
+        plan = subnet_calc.calculate_subnets_by_devices(base_network, [500, 60, 0, 1] * 500)
+        rows = list(export.vlsm_rows(plan))
+        self.assertEqual(rows[0]["network"], "10.0.0.0")
+        self.assertNotIn("first_host", rows[-1])
+        self.assertEqual(rows[-1]["error"], "El numero de dispositivos debe ser mayor a 0")
+
+        with mock.patch.object(export, "CHUNK_SIZE", 4096):
+            metadata = {"base_network": "10.0.0.0/16"}
+            chunks = list(export.iter_rows(export.vlsm_rows(plan), export.VLSM_FIELDS, "json", metadata))
+            jsonl = "".join(export.iter_rows(export.vlsm_rows(plan), export.VLSM_FIELDS, "jsonl"))
+            csv_text = "".join(export.iter_rows(export.vlsm_rows(plan), export.VLSM_FIELDS, "csv"))
+
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(json.loads("".join(chunks)), {"base_network": "10.0.0.0/16", "rows": rows})
+        self.assertEqual([json.loads(line) for line in jsonl.splitlines()], rows)
+        csv_lines = csv_text.splitlines()
+        self.assertEqual(csv_lines[0].split(","), list(export.VLSM_FIELDS))
+        self.assertEqual(len(csv_lines), len(rows) + 1)
+        self.assertEqual(json.loads("".join(export.iter_json([]))), [])
+        with self.assertRaises(ValueError):
+            export.iter_rows(rows, export.VLSM_FIELDS, "xml")
+
+    def test_details_and_subnet_rows(self):
+        row = export.details_row(network_calc.calculate_network_details("192.168.10.99/24"))
+        self.assertEqual(
+            (row["network"], row["wildcard"], row["last_host"]), ("192.168.10.0", "0.0.0.255", "192.168.10.254")
+        )
+        row = export.details_row(network_calc.calculate_network_details_v6("2001:db8::5/64"))
+        self.assertIsNone(row["wildcard"])
+        self.assertEqual(row["broadcast"], "2001:db8::ffff:ffff:ffff:ffff")
+
+        subnet_info, _ = subnet_calc.calculate_subnets(ipaddress.IPv4Network("10.0.0.0/24"), 4)
+        rows = list(export.subnet_rows(subnet_info))
+        self.assertEqual([row["network"] for row in rows], ["10.0.0.0", "10.0.0.64", "10.0.0.128", "10.0.0.192"])
+        self.assertEqual(rows[1]["broadcast"], "10.0.0.127")
+        self.assertEqual(rows[1]["total_hosts"], 62)
+
+    def test_cpt_exports_match_the_plans(self):
+        base_network = ipaddress.IPv4Network("172.16.0.0/16")
+        chunks, error = export.stream_cpt_export(base_network, 3, 2, 1, [100, 20, 50])
+        self.assertIsNone(error)
+        document = json.loads("".join(chunks))
+        topology, _ = cpt_generator.plan_cpt_topology(base_network, 3, 2, 1, [100, 20, 50])
+        self.assertEqual(document["num_routers"], 2)
+        self.assertEqual(
+            [row["network"] for row in document["rows"]],
+            [str(record["subnet"].network_address) for record in topology],
+        )
+        self.assertEqual(document["rows"][0]["gateway"], "172.16.0.1")
+        self.assertEqual(
+            export.stream_cpt_export(base_network, 2, 1, 1, [10]),
+            (None, "Debes especificar 2 valores de dispositivos. Ingresaste 1"),
+        )
+
+        configs = [{"routers": 2, "switches": 1, "hosts": 20}, {"routers": 1, "switches": 1, "hosts": 5}]
+        chunks, error = export.stream_advanced_cpt_export(base_network, configs, " OSPF ", "jsonl")
+        self.assertIsNone(error)
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual([(row["id"], row["is_main"], row["prefix"]) for row in rows], [(0, True, 27), (1, False, 28)])
+
+
+class SchemaCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tempdir.cleanup)
+        self.directory = self._tempdir.name
+
+    def test_repeat_requests_are_served_from_disk(self):
+        network = ipaddress.IPv4Network("172.16.0.0/24")
+        expected, _ = cpt_generator.generate_cpt_topology(network, 3, 2, 2, [40, 20, 10])
+
+        cache = SchemaCache(self.directory)
+        self.assertEqual(cache.generate_cpt_topology(network, 3, 2, 2, [40, 20, 10]), (expected, None))
+
+        reopened = SchemaCache(self.directory)
+        self.assertEqual(reopened.generate_cpt_topology(network, 3, 2, 2, [40, 20, 10]), (expected, None))
+        self.assertEqual(reopened.stats()["hits"], 1)
+        self.assertEqual(reopened.stats()["entries"], 1)
+
+        configs = [{"routers": 1, "switches": 1, "hosts": 20}]
+        expected, _ = cpt_advanced_generator.generate_advanced_cpt(network, configs, "ospf")
+        reopened.generate_advanced_cpt(network, configs, "ospf")
+        self.assertEqual(reopened.generate_advanced_cpt(network, configs, " OSPF "), (expected, None))
+        self.assertEqual(reopened.stats()["hits"], 2)
+
+    def test_errors_are_not_cached(self):
+        cache = SchemaCache(self.directory)
+        network = ipaddress.IPv4Network("172.16.0.0/24")
+
+        output, error = cache.generate_cpt_topology(network, 1, 1, 0, [10])
+
+        self.assertIsNone(output)
+        self.assertIn("switches", error.lower())
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = SchemaCache(self.directory, max_entries=2)
+        for offset, key in enumerate(("a", "b")):
+            cache.put(key, key)
+            os.utime(cache._path(key), ns=(offset, offset))
+        cache.get("a")
+        cache.put("c", "c")
+
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("a"), "a")
+        self.assertEqual(cache.get("c"), "c")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class MemoizationTests(unittest.TestCase):
+    def test_repeated_calls_hit_the_cache_and_results_are_frozen(self):
+        calculate = memo.MemoizedFunction(network_calc.calculate_network_details, maxsize=2)
+
+        first = calculate("192.168.1.10/24")
+        second = calculate("192.168.1.10/24")
+
+        self.assertIs(first, second)
+        self.assertEqual(first["mask_octets"], (255, 255, 255, 0))
+        self.assertEqual(first["network_addr"], "192.168.1.0")
+        with self.assertRaises(TypeError):
+            first["cidr"] = 8
+        self.assertEqual(calculate.cache_info(), memo.CacheInfo(1, 1, 0, 2, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        calculate = memo.MemoizedFunction(subnet_calc.calculate_subnets, maxsize=2)
+        network = ipaddress.IPv4Network("10.0.0.0/24")
+
+        calculate(network, 2)
+        calculate(network, 4)
+        calculate(network, 2)
+        calculate(network, 8)
+        calculate(network, 4)
+
+        info = calculate.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.currsize), (1, 4, 2, 2))
+        self.assertAlmostEqual(info.hit_rate, 0.2)
+
+        calculate.resize(0)
+        self.assertEqual(calculate.cache_info().currsize, 0)
+
+    def test_exceptions_are_not_cached(self):
+        calculate = memo.MemoizedFunction(network_calc.calculate_network_details)
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                calculate("999.1.1.1/24")
+        self.assertEqual(calculate.cache_info().currsize, 0)
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        tracing.reset()
+        self.addCleanup(tracing.reset)
+        self.addCleanup(tracing.disable)
+
+    def test_disabled_tracing_records_nothing(self):
+        with tracing.span("ignored"):
+            tracing.count("ignored")
+        subnet_calc.calculate_subnets_by_devices(ipaddress.IPv4Network("10.0.0.0/24"), [10])
+
+        self.assertEqual(tracing.snapshot(), {"spans": [], "counters": {}, "dropped_events": 0})
+
+    def test_spans_and_counters_from_core_hooks(self):
+        tracing.enable()
+        network = ipaddress.IPv4Network("10.0.0.0/24")
+        subnet_calc.calculate_subnets_by_devices(network, [100, 100, 100, 0])
+        cpt_generator.generate_cpt_topology(network, 2, 1, 1, [20, 10])
+
+        data = tracing.snapshot()
+        names = [span["name"] for span in data["spans"]]
+        self.assertIn("subnet_calc.calculate_subnets_by_devices", names)
+        self.assertIn("cpt_generator.plan", names)
+        self.assertIn("cpt_generator.render", names)
+        self.assertEqual(data["counters"], {"vlsm.requests": 4, "vlsm.errors": 2})
+        self.assertTrue(all(span["duration_us"] >= 0 for span in data["spans"]))
+
+    def test_chrome_trace_export(self):
+        tracing.enable()
+        with tracing.span("outer", "test", size=3):
+            tracing.count("items", 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            tracing.export_chrome_trace(path)
+            with open(path, encoding="utf-8") as handle:
+                events = json.load(handle)["traceEvents"]
+
+        self.assertEqual({event["ph"] for event in events}, {"X", "C"})
+        complete = next(event for event in events if event["ph"] == "X")
+        self.assertEqual((complete["name"], complete["cat"], complete["args"]), ("outer", "test", {"size": 3}))
+
+
+class LazyImportTests(unittest.TestCase):
+    def test_entry_point_imports_no_tab_or_calculation_module(self):
+        code = (
+            "import sys, main, core; core.subnet_calc; "
+            "print(sorted(name for name in sys.modules if name.startswith(('core.', 'gui.'))))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        loaded = result.stdout.strip()
+        self.assertNotIn("gui.tab_", loaded)
+        self.assertNotIn("core.cpt_generator", loaded)
+        self.assertIn("core.subnet_calc", loaded)
+
+
+class CommandLineTests(unittest.TestCase):
+    def test_details_csv_reports_rows_and_errors(self):
+        output = io.StringIO()
+        cli.run("details", [io.StringIO("192.168.10.99/24\n# comentario\n\nbad\n")], output, "csv")
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0].split(","), list(cli.DETAILS_FIELDS))
+        self.assertTrue(lines[1].startswith("192.168.10.99/24,192.168.10.0,24,255.255.255.0"))
+        self.assertIn("Formato invalido", lines[2])
+        self.assertEqual(len(lines), 3)
+
+    def test_details_accepts_netmask_notation(self):
+        output = io.StringIO()
+        cli.run("details", [io.StringIO("10.0.0.1/255.255.255.0\n10.0.0.1/24\n")], output, "csv")
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].startswith("10.0.0.1/255.255.255.0,10.0.0.0,24,255.255.255.0"))
+        self.assertEqual(lines[1].split(",")[1:], lines[2].split(",")[1:])
+
+    def test_vlsm_jsonl_emits_one_object_per_subnet(self):
+        output = io.StringIO()
+        cli.run("vlsm", [io.StringIO("192.168.1.0/24 60,30,12\n")], output, "jsonl")
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([row["network"] for row in rows], ["192.168.1.0", "192.168.1.64", "192.168.1.96"])
+        self.assertEqual(rows[0]["prefix"], 26)
+
+    def test_json_format_writes_one_document(self):
+        output = io.StringIO()
+        cli.run("details", [io.StringIO("10.0.0.1/31\nbad\n")], output, "json")
+
+        rows = json.loads(output.getvalue())
+        self.assertIsNone(rows[0]["first_host"])
+        self.assertEqual(rows[1]["input"], "bad")
+
+    def test_summarize_collapses_all_lines_and_reports_errors_first(self):
+        output = io.StringIO()
+        cli.run("summarize", [io.StringIO("10.0.1.0/24\nbad\n10.0.0.0/24\n10.0.0.9\n")], output, "jsonl")
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(rows[0]["input"], "bad")
+        self.assertEqual(rows[1], {"network": "10.0.0.0", "prefix": 23, "last": "10.0.1.255", "num_addresses": 512})
+        self.assertEqual(len(rows), 2)
+
+    def test_details_cache_size_keeps_output_identical(self):
+        text = "10.0.0.1/8\n192.168.1.7/30\n10.0.0.1/8\nbad\n10.0.0.1/8\n"
+        plain, cached = io.StringIO(), io.StringIO()
+        cli.run("details", [io.StringIO(text)], plain, "csv")
+        memo.calculate_network_details.cache_clear()
+        self.addCleanup(memo.calculate_network_details.cache_clear)
+        self.addCleanup(memo.calculate_network_details.resize, memo.DEFAULT_MAXSIZE)
+
+        cli.run("details", [io.StringIO(text)], cached, "csv", cache_size=16)
+
+        self.assertEqual(cached.getvalue(), plain.getvalue())
+        self.assertEqual(memo.calculate_network_details.cache_info().hits, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from utils import validators
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+class ValidatorsTests(unittest.TestCase):
+    def test_validate_ip_cidr(self):
+        valid, network, error = validators.validate_ip_cidr(" 192.168.0.11/24 ")
+
+        self.assertTrue(valid)
+        self.assertEqual(str(network), "192.168.0.0/24")
+        self.assertEqual(error, "")
+        self.assertFalse(validators.validate_ip_cidr("192.168.0.11")[0])
+
+    def test_validate_device_list(self):
+        self.assertEqual(validators.validate_device_list("10, 20,30", 3), (True, [10, 20, 30], ""))
+        self.assertFalse(validators.validate_device_list("10,0", 2)[0])
+
+    def test_dialog_helpers_are_still_reexported(self):
+        import utils
+        from utils import dialogs
+
+        for name in ("show_error", "show_warning", "show_info"):
+            self.assertIs(getattr(utils, name), getattr(dialogs, name))
+            self.assertIs(getattr(validators, name), getattr(dialogs, name))
+
+    def test_validation_import_does_not_load_tkinter(self):
+        code = "import sys, utils.validators, core.cli; print('tkinter' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,3 +2,15 @@
 Paquete de utilidades
 """
 from .validators import *
+
+_DIALOG_NAMES = {"show_error", "show_warning", "show_info"}
+
+
+def __getattr__(name):
+    # ``from .validators import *`` only covers ``__all__``; the dialog helpers
+    # are forwarded lazily so importing ``utils`` still does not load Tk.
+    if name in _DIALOG_NAMES:
+        from . import dialogs
+
+        return getattr(dialogs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,20 @@
+"""Tk message dialogs used by the GUI tabs."""
+
+from __future__ import annotations
+
+from tkinter import messagebox
+
+
+def show_error(message: str):
+    """Show an error dialog."""
+    messagebox.showerror("Error", message)
+
+
+def show_warning(message: str):
+    """Show a warning dialog."""
+    messagebox.showwarning("Aviso", message)
+
+
+def show_info(message: str):
+    """Show an informational dialog."""
+    messagebox.showinfo("Informacion", message)
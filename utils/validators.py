@@ -1,9 +1,20 @@
-"""Validation helpers used by the GUI and core entry points."""
+"""Validation helpers used by the GUI and core entry points.
+
+Pure Python on purpose: headless callers (CLI, workers) import this module
+without pulling in Tk. Message dialogs live in :mod:`utils.dialogs`.
+"""
 
 from __future__ import annotations
 
 import ipaddress
-from tkinter import messagebox
+
+__all__ = [
+    "validate_ip_cidr",
+    "validate_positive_int",
+    "validate_non_negative_int",
+    "parse_int_list",
+    "validate_device_list",
+]
 
 
 def validate_ip_cidr(ip_input: str):
@@ -78,16 +89,12 @@ def validate_device_list(devices_str: str, expected_count: int):
     return True, devices, ""
 
 
-def show_error(message: str):
-    """Show an error dialog."""
-    messagebox.showerror("Error", message)
-
-
-def show_warning(message: str):
-    """Show a warning dialog."""
-    messagebox.showwarning("Aviso", message)
-
+def __getattr__(name):
+    # Backwards compatibility: ``validators.show_error`` and friends used to
+    # live here. Resolve them lazily so Tk is only imported when a dialog is
+    # actually requested.
+    if name in {"show_error", "show_warning", "show_info"}:
+        from . import dialogs
 
-def show_info(message: str):
-    """Show an informational dialog."""
-    messagebox.showinfo("Informacion", message)
+        return getattr(dialogs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")